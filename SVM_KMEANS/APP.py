@@ -1,11 +1,10 @@
 import streamlit as st
 import pandas as pd
-from sklearn import svm
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, accuracy_score
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.cluster import KMeans
 import matplotlib.pyplot as plt
+from model_registry import get_registry
+from models import (train_regression, train_classifier, train_regression_sgd,
+                    train_classifier_sgd, predict_regression, compare_solvers, LARGE_DATA_ROWS)
+from clustering import train_clustering, sample_assignments, seed_state
 
 st.set_page_config(page_title="🧠 SVM & K-Means Demonstration", layout="wide")
 st.title("🧠 SVM & K-Means Demonstration")
@@ -24,6 +23,22 @@ st.dataframe(linear_data)
 st.subheader("🧩 Logistic Dataset (for Classification)")
 st.dataframe(logistic_data)
 
+# Fitted models are stored per (data, parameters) and only retrained when those change
+registry = get_registry()
+
+# Large-data mode: linear SVMs solved in the primal with SGD over chunks (see models.py)
+large_mode = st.toggle(
+    "⚡ Large-data mode (SGD solver, chunked training)",
+    value=max(len(linear_data), len(logistic_data)) > LARGE_DATA_ROWS
+)
+
+
+def trained(name, data, train, state=None, **params):
+    artifact, fresh = registry.get_or_train(name, data, params, train, state=state)
+    st.caption(f"{name}: {'trained now' if fresh else 'loaded from the model registry'}")
+    return artifact
+
+
 # -------------------------------
 # Step 2: SVM Regression
 # -------------------------------
@@ -32,13 +47,11 @@ st.header("📈 Step 2: SVM Regression (Supervised)")
 X = linear_data.iloc[:, :-1]
 y = linear_data.iloc[:, -1]
 
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
-
-svm_reg = svm.SVR(kernel='linear')
-svm_reg.fit(X_train, y_train)
-y_pred = svm_reg.predict(X_test)
-
-mse = mean_squared_error(y_test, y_pred)
+if large_mode:
+    reg = trained("svm_regression_sgd", linear_data, train_regression_sgd, epochs=5)
+else:
+    reg = trained("svm_regression", linear_data, train_regression, kernel='linear')
+mse = reg["mse"]
 st.success(f"✅ Mean Squared Error: {mse:.2f}")
 
 # ---- FIXED REGRESSION PLOT ----
@@ -46,13 +59,13 @@ fig, ax = plt.subplots()
 if X.shape[1] == 1:
     # Single feature → simple 2D scatter
     ax.scatter(X, y, color='blue', label='Actual')
-    ax.plot(X, svm_reg.predict(X), color='red', label='SVM Line')
+    ax.plot(X, predict_regression(reg, X), color='red', label='SVM Line')
     ax.set_xlabel(X.columns[0])
     ax.set_ylabel(y.name)
 else:
     # Multi-feature → show only first feature vs target for visualization
     ax.scatter(X.iloc[:, 0], y, color='blue', label='Actual')
-    ax.scatter(X.iloc[:, 0], svm_reg.predict(X), color='red', label='Predicted')
+    ax.scatter(X.iloc[:, 0], predict_regression(reg, X), color='red', label='Predicted')
     ax.set_xlabel(X.columns[0])
     ax.set_ylabel(y.name)
 ax.set_title("SVM Regression Visualization")
@@ -64,44 +77,41 @@ st.pyplot(fig)
 # -------------------------------
 st.header("🧩 Step 3: SVM Classification (Supervised)")
 
-X = logistic_data.iloc[:, :-1].copy()
-y = logistic_data.iloc[:, -1].copy()
-
-# Encode categorical columns
-for col in X.columns:
-    if X[col].dtype == 'object':
-        X[col] = LabelEncoder().fit_transform(X[col])
-if y.dtype == 'object':
-    y = LabelEncoder().fit_transform(y)
-
-# Scale features
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
-
-X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=0.3, random_state=42)
-
-svm_clf = svm.SVC(kernel='linear')
-svm_clf.fit(X_train, y_train)
-y_pred = svm_clf.predict(X_test)
-
-acc = accuracy_score(y_test, y_pred)
+if large_mode:
+    clf = trained("svm_classification_sgd", logistic_data, train_classifier_sgd, epochs=5)
+else:
+    clf = trained("svm_classification", logistic_data, train_classifier, kernel='linear')
+acc = clf["accuracy"]
 st.success(f"✅ SVM Classification Accuracy: {acc*100:.2f}%")
 
+with st.expander("⏱️ Solver parity: kernel SVM vs SGD"):
+    st.caption("Both solvers on the same rows (sampled to 20,000 for the kernel solver).")
+    if st.button("Run comparison"):
+        st.dataframe(compare_solvers(linear_data, "regression"))
+        st.dataframe(compare_solvers(logistic_data, "classification"))
+
 # -------------------------------
 # Step 4: K-Means Clustering
 # -------------------------------
 st.header("🎯 Step 4: K-Means Clustering (Unsupervised)")
 
-cluster_data = linear_data.copy()
-scaled_data = StandardScaler().fit_transform(cluster_data)
+# MiniBatchKMeans over chunks for every k in the range, scored on a sample (see clustering.py)
+# The warm-start centroids on disk are part of the registry key (seed_state)
+km = trained("kmeans_search", linear_data, train_clustering, state=seed_state, k_values=list(range(2, 9)), epochs=2)
+st.caption("Per-row inertia and silhouette for each k (computed on a sample of the rows).")
+st.dataframe(km["scores"])
+
+k_options = sorted(km["models"])
+k = st.select_slider("Number of clusters (k)", options=k_options, value=km["best_k"])
+st.info(f"Suggested k (highest silhouette): {km['best_k']}")
 
-kmeans = KMeans(n_clusters=2, random_state=42)
-kmeans.fit(scaled_data)
-cluster_data["Cluster"] = kmeans.labels_
+cluster_data = sample_assignments(km["models"][k], km["stats"])
 
 fig2, ax2 = plt.subplots()
 ax2.scatter(cluster_data.iloc[:, 0], cluster_data.iloc[:, 1], c=cluster_data["Cluster"], cmap="rainbow")
-ax2.set_title("K-Means Clustering Result")
+ax2.set_xlabel(cluster_data.columns[0])
+ax2.set_ylabel(cluster_data.columns[1])
+ax2.set_title(f"K-Means Clustering Result (k={k})")
 st.pyplot(fig2)
 
 st.success("🎉 Demonstration Complete — SVM Regression, Classification & K-Means Done!")
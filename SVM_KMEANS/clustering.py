@@ -0,0 +1,179 @@
+# clustering.py
+# Out-of-core K-Means for APP.py.
+# Input (DataFrame or CSV path) is read in chunks: one pass fits the StandardScaler
+# and keeps a uniform sample, then MiniBatchKMeans.partial_fit runs over mini-batches
+# of the scaled chunks. search_k() fits every k in a range in parallel (spawned worker
+# processes) and scores each on the sample (inertia, silhouette). Fitted centroids are saved per
+# column set and k, in original units, and seed the next fit (warm start) even after
+# the data changes. seed_state() fingerprints those seeds for the model registry key,
+# so a registry artifact is only reused with the seeds it was fitted from.
+import os
+import json
+import hashlib
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from models import iter_chunks, CHUNK_SIZE
+
+CENTROID_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'centroids')
+SAMPLE_SIZE = 10_000
+BATCH_SIZE = 4096
+# Below this many rows a process pool costs more than it saves
+PARALLEL_MIN_ROWS = 50_000
+
+
+def scan(source, chunksize=CHUNK_SIZE, sample_size=SAMPLE_SIZE, random_state=42):
+    # One pass: scaler statistics, row count and a uniform sample (smallest random keys)
+    rng = np.random.default_rng(random_state)
+    scaler = StandardScaler()
+    keys, sample, rows, columns = np.empty(0), None, 0, None
+    for chunk in iter_chunks(source, chunksize):
+        columns = list(chunk.columns)
+        values = chunk.to_numpy(dtype='float64')
+        scaler.partial_fit(values)
+        rows += len(values)
+        keys = np.concatenate([keys, rng.random(len(values))])
+        sample = values if sample is None else np.vstack([sample, values])
+        if len(keys) > sample_size:
+            keep = np.argpartition(keys, sample_size)[:sample_size]
+            keys, sample = keys[keep], sample[keep]
+    return {'scaler': scaler, 'sample': sample, 'rows': rows, 'columns': columns}
+
+
+def _centroid_path(columns, k):
+    signature = hashlib.sha1(json.dumps(columns).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(CENTROID_DIR, f'{signature}.k{k}.npy')
+
+
+def load_centroids(columns, k):
+    path = _centroid_path(columns, k)
+    try:
+        centroids = np.load(path)
+    except (OSError, ValueError):
+        return None
+    return centroids if centroids.shape == (k, len(columns)) else None
+
+
+def save_centroids(columns, k, centroids):
+    os.makedirs(CENTROID_DIR, exist_ok=True)
+    path = _centroid_path(columns, k)
+    tmp = path + '.tmp.npy'
+    np.save(tmp, centroids)
+    os.replace(tmp, path)
+
+
+def seed_state(data, k_values=range(2, 9), **_):
+    # Registry state for train_clustering: the saved centroids a warm start would read
+    columns = list(data.columns) if isinstance(data, pd.DataFrame) else list(pd.read_csv(data, nrows=0).columns)
+    h = hashlib.sha1()
+    for k in sorted(k_values):
+        try:
+            with open(_centroid_path(columns, k), 'rb') as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b'none')
+    return h.hexdigest()[:12]
+
+
+def _new_model(k, stats, batch_size, random_state, warm_start):
+    init = load_centroids(stats['columns'], k) if warm_start else None
+    model = MiniBatchKMeans(
+        n_clusters=k,
+        init=stats['scaler'].transform(init) if init is not None else 'k-means++',
+        n_init=1 if init is not None else 3,
+        batch_size=batch_size,
+        random_state=random_state,
+    )
+    return model, init is not None
+
+
+def fit_minibatch(source, k_values, stats, chunksize=CHUNK_SIZE, epochs=2, batch_size=BATCH_SIZE,
+                  random_state=42, warm_start=True):
+    # Fit one MiniBatchKMeans per k in the same pass over the data, so the input is
+    # read once per epoch however many k are tried. Returns {k: (model, warm_started)}.
+    scaler, columns = stats['scaler'], stats['columns']
+    fitted = {k: _new_model(k, stats, batch_size, random_state, warm_start) for k in k_values}
+    for _ in range(epochs):
+        for chunk in iter_chunks(source, chunksize):
+            X = scaler.transform(chunk.to_numpy(dtype='float64'))
+            for start in range(0, len(X), batch_size):
+                batch = X[start:start + batch_size]
+                for k, (model, _) in fitted.items():
+                    # The first partial_fit needs at least k rows
+                    if len(batch) >= k or hasattr(model, 'cluster_centers_'):
+                        model.partial_fit(batch)
+    for k, (model, _) in fitted.items():
+        save_centroids(columns, k, scaler.inverse_transform(model.cluster_centers_))
+    return fitted
+
+
+def evaluate(model, stats, random_state=42):
+    X = stats['scaler'].transform(stats['sample'])
+    labels = model.predict(X)
+    silhouette = np.nan
+    if 1 < len(np.unique(labels)) < len(X):
+        silhouette = float(silhouette_score(X, labels, random_state=random_state))
+    return {
+        'k': model.n_clusters,
+        # Sum of squared distances to the nearest centroid, per sampled row
+        'inertia': float(-model.score(X)) / len(X),
+        'silhouette': silhouette,
+    }
+
+
+def _fit_and_score(args):
+    source, k_values, stats, chunksize, epochs, random_state = args
+    fitted = fit_minibatch(source, k_values, stats, chunksize, epochs, random_state=random_state)
+    return [(dict(evaluate(model, stats, random_state), warm_start=warm), model)
+            for model, warm in fitted.values()]
+
+
+def search_k(source, k_values, stats=None, chunksize=CHUNK_SIZE, epochs=2, random_state=42, processes=None):
+    # Fit one model per k and score each on the sample. Large inputs are split over
+    # worker processes, each fitting its share of k in a single stream over the data.
+    # Returns (scores DataFrame, {k: model}).
+    stats = stats or scan(source, chunksize, random_state=random_state)
+    k_values = [k for k in k_values if 1 < k < len(stats['sample'])]
+    if processes is None:
+        processes = min(len(k_values), os.cpu_count() or 1) if stats['rows'] >= PARALLEL_MIN_ROWS else 1
+    processes = max(1, min(processes, len(k_values)))
+    jobs = [(source, k_values[i::processes], stats, chunksize, epochs, random_state) for i in range(processes)]
+    if processes > 1:
+        # spawn: workers must not inherit the server's threads (same as WK6's report queue)
+        with ProcessPoolExecutor(max_workers=processes, mp_context=mp.get_context('spawn')) as pool:
+            results = [pair for part in pool.map(_fit_and_score, jobs) for pair in part]
+    else:
+        results = _fit_and_score(jobs[0]) if k_values else []
+    scores = pd.DataFrame([score for score, _ in results]).sort_values('k').reset_index(drop=True)
+    models = {score['k']: model for score, model in results}
+    return scores, models
+
+
+def best_k(scores):
+    # Highest silhouette; ties (and NaN-only searches) fall back to the smallest k
+    ranked = scores.dropna(subset=['silhouette'])
+    if ranked.empty:
+        return int(scores['k'].min())
+    return int(ranked.sort_values(['silhouette', 'k'], ascending=[False, True]).iloc[0]['k'])
+
+
+def sample_assignments(model, stats, max_points=5000):
+    # Sampled rows (original units) with their cluster, for plotting
+    sample = stats['sample'][:max_points]
+    frame = pd.DataFrame(sample, columns=stats['columns'])
+    frame['Cluster'] = model.predict(stats['scaler'].transform(sample))
+    return frame
+
+
+def train_clustering(data, k_values=range(2, 9), epochs=2, random_state=42):
+    # Registry entry point: scan, k search, and the chosen model
+    stats = scan(data, random_state=random_state)
+    scores, models = search_k(data, k_values, stats, epochs=epochs, random_state=random_state)
+    k = best_k(scores)
+    return {'stats': stats, 'scores': scores, 'models': models, 'best_k': k}
@@ -0,0 +1,146 @@
+# model_registry.py
+# Train-once registry for the models in APP.py.
+# An artifact (fitted estimators + their preprocessing + metrics, as a dict) is keyed
+# by a fingerprint of the training data, the hyperparameters, the scikit-learn
+# version and the training code (a hash of the training function's module and of the
+# local modules it uses, e.g. models.py), so editing the code retrains. A training
+# function that also reads state of its own from disk (clustering's warm-start
+# centroids) passes state=fn(data, **params), a fingerprint of that state, which
+# goes into the key as well. It is written uncompressed with joblib under .cache/models/, so the NumPy
+# arrays inside can be memory-mapped when loaded. Later runs load the artifact and
+# only call the training function when one of those inputs changes.
+import os
+import sys
+import glob
+import json
+import inspect
+import hashlib
+import threading
+
+import joblib
+import pandas as pd
+import sklearn
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'models')
+# Artifacts kept per model name (different data/parameter combinations)
+MAX_ARTIFACTS = 8
+
+
+def fingerprint_frame(df):
+    # Content hash of a DataFrame: values, index, column names and dtypes
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _source_file(obj):
+    try:
+        return inspect.getsourcefile(obj)
+    except TypeError:
+        return None
+
+
+def code_version(func):
+    # Hash of the source of func's module plus the modules next to it that it uses
+    # (directly imported or through imported names)
+    module = sys.modules.get(func.__module__)
+    main = _source_file(module) if module is not None else None
+    if main is None:
+        return func.__qualname__
+    folder = os.path.dirname(os.path.abspath(main))
+    files = {os.path.abspath(main)}
+    for value in vars(module).values():
+        owner = value if inspect.ismodule(value) else sys.modules.get(getattr(value, '__module__', None) or '')
+        path = _source_file(owner) if owner is not None else None
+        if path and os.path.dirname(os.path.abspath(path)) == folder:
+            files.add(os.path.abspath(path))
+    h = hashlib.sha1(func.__qualname__.encode('utf-8'))
+    for path in sorted(files):
+        with open(path, 'rb') as f:
+            h.update(os.path.basename(path).encode('utf-8'))
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+def model_key(name, data_fingerprint, params, code=None, state=None):
+    payload = json.dumps({'name': name, 'data': data_fingerprint, 'params': params,
+                          'sklearn': sklearn.__version__, 'code': code, 'state': state},
+                         sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class ModelRegistry:
+    def __init__(self, root=CACHE_DIR, mmap_mode='r'):
+        self.root = root
+        self.mmap_mode = mmap_mode
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def path(self, name, key):
+        return os.path.join(self.root, f'{name}.{key}.joblib')
+
+    def load(self, name, key):
+        with self._lock:
+            if (name, key) in self._memo:
+                return self._memo[(name, key)]
+        path = self.path(name, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            artifact = joblib.load(path, mmap_mode=self.mmap_mode)
+        except Exception:
+            return None  # corrupt or written by an incompatible version: train again
+        with self._lock:
+            self._memo[(name, key)] = artifact
+        return artifact
+
+    def save(self, name, key, artifact):
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(name, key)
+        tmp = path + '.tmp'
+        joblib.dump(artifact, tmp, compress=0)
+        os.replace(tmp, path)
+        self._prune(name)
+        with self._lock:
+            self._memo[(name, key)] = artifact
+
+    def _prune(self, name):
+        paths = sorted(glob.glob(os.path.join(self.root, f'{name}.{"?" * 16}.joblib')),
+                       key=os.path.getmtime, reverse=True)
+        for old in paths[MAX_ARTIFACTS:]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def get_or_train(self, name, data, params, train, fingerprint=None, state=None):
+        # train(data, **params) -> artifact dict. fingerprint defaults to a content hash
+        # of data; state(data, **params) fingerprints any other input train reads.
+        # Returns (artifact, trained); trained is False when it was loaded.
+        fingerprint = fingerprint or fingerprint_frame(data)
+        code = code_version(train)
+        before = state(data, **params) if state is not None else None
+        key = model_key(name, fingerprint, params, code, before)
+        artifact = self.load(name, key)
+        if artifact is not None:
+            return artifact, False
+        artifact = train(data, **params)
+        self.save(name, key, artifact)
+        after = state(data, **params) if state is not None else None
+        if after != before:
+            # train updated its own state (warm-start seeds now hold this fit's result):
+            # file the artifact under that state too, so a rerun on the same data loads
+            # it instead of refitting from its own output
+            self.save(name, model_key(name, fingerprint, params, code, after), artifact)
+        return artifact, True
+
+
+_registry = None
+
+
+def get_registry():
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
@@ -0,0 +1,207 @@
+# models.py
+# Training functions for APP.py. Each returns an artifact dict holding the fitted
+# estimator, its preprocessing and its test metrics, ready for the model registry.
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from sklearn import svm
+from sklearn.linear_model import SGDRegressor, SGDClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import mean_squared_error, accuracy_score
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+
+def train_regression(data, kernel='linear', test_size=0.3, random_state=42):
+    X = data.iloc[:, :-1]
+    y = data.iloc[:, -1]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+    model = svm.SVR(kernel=kernel)
+    model.fit(X_train, y_train)
+    return {
+        'model': model,
+        'features': list(X.columns),
+        'target': y.name,
+        'mse': mean_squared_error(y_test, model.predict(X_test)),
+    }
+
+
+def encode_features(X, encoders):
+    # Same codes as encoder.transform (position in classes_), via a categorical lookup
+    X = X.copy()
+    for col, encoder in encoders.items():
+        X[col] = pd.Categorical(X[col], categories=encoder.classes_).codes
+    return X
+
+
+def train_classifier(data, kernel='linear', test_size=0.3, random_state=42):
+    X = data.iloc[:, :-1].copy()
+    y = data.iloc[:, -1].copy()
+
+    # Encode categorical columns
+    encoders = {col: LabelEncoder().fit(X[col]) for col in X.columns if not is_numeric_dtype(X[col])}
+    X = encode_features(X, encoders)
+    target_encoder = None
+    if not is_numeric_dtype(y):
+        target_encoder = LabelEncoder().fit(y)
+        y = target_encoder.transform(y)
+
+    # Scale features
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=test_size, random_state=random_state)
+    model = svm.SVC(kernel=kernel)
+    model.fit(X_train, y_train)
+    return {
+        'model': model,
+        'encoders': encoders,
+        'target_encoder': target_encoder,
+        'scaler': scaler,
+        'accuracy': accuracy_score(y_test, model.predict(X_test)),
+    }
+
+
+# --- Large-data mode ---
+# Linear-kernel SVMs solved in the primal with SGD (epsilon-insensitive loss for
+# regression, hinge for classification). Data is streamed in chunks through
+# partial_fit, so memory is bounded by the chunk size and the cost is linear in rows.
+CHUNK_SIZE = 100_000
+LARGE_DATA_ROWS = 200_000
+
+
+def iter_chunks(source, chunksize=CHUNK_SIZE):
+    # source: DataFrame or CSV path
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start:start + chunksize]
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize)
+
+
+def _split(chunk, index, test_size, random_state):
+    # Reproducible per-chunk holdout, the same on every pass
+    test = np.random.default_rng([random_state, index]).random(len(chunk)) < test_size
+    return chunk[~test], chunk[test]
+
+
+def _train_parts(source, chunksize, test_size, random_state):
+    for i, chunk in enumerate(iter_chunks(source, chunksize)):
+        yield _split(chunk, i, test_size, random_state)
+
+
+def train_regression_sgd(source, alpha=1e-4, epochs=5, chunksize=CHUNK_SIZE, test_size=0.3,
+                         random_state=42, time_budget=None):
+    start = time.perf_counter()
+    x_scaler, y_scaler = StandardScaler(), StandardScaler()
+    features = target = None
+    for train, _ in _train_parts(source, chunksize, test_size, random_state):
+        features, target = list(train.columns[:-1]), train.columns[-1]
+        if len(train):
+            x_scaler.partial_fit(train[features])
+            y_scaler.partial_fit(train[[target]])
+
+    model = SGDRegressor(loss='epsilon_insensitive', epsilon=0.0, alpha=alpha,
+                         learning_rate='invscaling', random_state=random_state)
+    done = 0
+    for _ in range(epochs):
+        for train, _ in _train_parts(source, chunksize, test_size, random_state):
+            if len(train):
+                model.partial_fit(x_scaler.transform(train[features]),
+                                  y_scaler.transform(train[[target]]).ravel())
+        done += 1
+        if time_budget is not None and time.perf_counter() - start > time_budget:
+            break
+
+    artifact = {'model': model, 'x_scaler': x_scaler, 'y_scaler': y_scaler,
+                'features': features, 'target': target, 'solver': 'sgd', 'epochs': done}
+    sq_err, n = 0.0, 0
+    for _, test in _train_parts(source, chunksize, test_size, random_state):
+        if len(test):
+            sq_err += float(((test[target].to_numpy() - predict_regression(artifact, test[features])) ** 2).sum())
+            n += len(test)
+    artifact['mse'] = sq_err / n if n else float('nan')
+    artifact['train_seconds'] = time.perf_counter() - start
+    return artifact
+
+
+def predict_regression(artifact, X):
+    if artifact.get('solver') != 'sgd':
+        return artifact['model'].predict(X)
+    scaled = artifact['model'].predict(artifact['x_scaler'].transform(X))
+    return artifact['y_scaler'].inverse_transform(scaled.reshape(-1, 1)).ravel()
+
+
+def train_classifier_sgd(source, alpha=1e-4, epochs=5, chunksize=CHUNK_SIZE, test_size=0.3,
+                         random_state=42, time_budget=None):
+    start = time.perf_counter()
+    # Pass 1: category vocabularies (features and target), so codes match LabelEncoder's
+    vocab, classes, features = {}, set(), None
+    for chunk in iter_chunks(source, chunksize):
+        features, target = chunk.columns[:-1], chunk.columns[-1]
+        for col in features:
+            if not is_numeric_dtype(chunk[col]):
+                vocab.setdefault(col, set()).update(chunk[col].dropna().unique().tolist())
+        classes.update(chunk[target].dropna().unique().tolist())
+    encoders = {col: LabelEncoder().fit(sorted(values)) for col, values in vocab.items()}
+    target_encoder = None
+    if not all(isinstance(c, (int, np.integer)) for c in classes):
+        target_encoder = LabelEncoder().fit(sorted(classes, key=str))
+
+    def encode(part):
+        X = encode_features(part[features], encoders)
+        y = part[target]
+        return X, (target_encoder.transform(y) if target_encoder is not None else y.to_numpy())
+
+    # Pass 2: scaler statistics on the training rows
+    scaler = StandardScaler()
+    for train, _ in _train_parts(source, chunksize, test_size, random_state):
+        if len(train):
+            scaler.partial_fit(encode(train)[0])
+
+    model = SGDClassifier(loss='hinge', alpha=alpha, random_state=random_state)
+    all_classes = np.arange(len(target_encoder.classes_)) if target_encoder is not None else np.array(sorted(classes))
+    done = 0
+    for _ in range(epochs):
+        for train, _ in _train_parts(source, chunksize, test_size, random_state):
+            if len(train):
+                X, y = encode(train)
+                model.partial_fit(scaler.transform(X), y, classes=all_classes)
+        done += 1
+        if time_budget is not None and time.perf_counter() - start > time_budget:
+            break
+
+    correct, n = 0, 0
+    for _, test in _train_parts(source, chunksize, test_size, random_state):
+        if len(test):
+            X, y = encode(test)
+            correct += int((model.predict(scaler.transform(X)) == y).sum())
+            n += len(test)
+    return {
+        'model': model,
+        'encoders': encoders,
+        'target_encoder': target_encoder,
+        'scaler': scaler,
+        'accuracy': correct / n if n else float('nan'),
+        'solver': 'sgd',
+        'epochs': done,
+        'train_seconds': time.perf_counter() - start,
+    }
+
+
+def compare_solvers(data, kind, max_kernel_rows=20_000, random_state=42, **sgd_params):
+    # Timing and holdout metric of the kernel (libsvm) and SGD paths on the same rows.
+    # libsvm is quadratic or worse in rows, so both run on a sample of max_kernel_rows.
+    sample = data.sample(max_kernel_rows, random_state=random_state) if len(data) > max_kernel_rows else data
+    if kind == 'regression':
+        kernel, sgd, metric = train_regression, train_regression_sgd, 'mse'
+    else:
+        kernel, sgd, metric = train_classifier, train_classifier_sgd, 'accuracy'
+    rows = []
+    for solver, train in (('kernel (libsvm)', kernel), ('sgd (primal, chunked)', sgd)):
+        start = time.perf_counter()
+        artifact = train(sample, random_state=random_state, **(sgd_params if train is sgd else {}))
+        rows.append({'solver': solver, 'rows': len(sample),
+                     'seconds': time.perf_counter() - start, metric: artifact[metric]})
+    return pd.DataFrame(rows)
@@ -0,0 +1,76 @@
+import importlib
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+import model_registry
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def training_modules(tmp_path, monkeypatch):
+    # train.py uses a helper from helpers.py next to it, as clustering.py uses models.py
+    (tmp_path / 'helpers.py').write_text('def scale(x):\n    return x * 2\n')
+    (tmp_path / 'train.py').write_text(
+        'from helpers import scale\n\n\ndef train(data, factor=1):\n'
+        '    return {"value": scale(float(data["x"].sum())) * factor}\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # No .pyc: an edit of the same size within a second must not load stale bytecode
+    monkeypatch.setattr(sys, 'dont_write_bytecode', True)
+    yield tmp_path
+    for name in ('train', 'helpers'):
+        sys.modules.pop(name, None)
+
+
+def load_train():
+    for name in ('train', 'helpers'):
+        sys.modules.pop(name, None)
+    importlib.invalidate_caches()
+    return importlib.import_module('train').train
+
+
+def test_editing_a_helper_module_retrains(training_modules, tmp_path):
+    registry = model_registry.ModelRegistry(str(tmp_path / 'models'), mmap_mode=None)
+    data = pd.DataFrame({'x': [1.0, 2.0]})
+    train = load_train()
+    artifact, trained = registry.get_or_train('demo', data, {'factor': 1}, train)
+    assert trained and artifact['value'] == 6.0
+    assert registry.get_or_train('demo', data, {'factor': 1}, train) == (artifact, False)
+
+    (training_modules / 'helpers.py').write_text('def scale(x):\n    return x * 3\n')
+    train = load_train()
+    artifact, trained = registry.get_or_train('demo', data, {'factor': 1}, train)
+    assert trained and artifact['value'] == 9.0
+
+
+def test_code_version_covers_local_imports():
+    import clustering
+    import models
+    version = model_registry.code_version(clustering.train_clustering)
+    assert version != model_registry.code_version(models.train_regression)
+    assert version == model_registry.code_version(clustering.train_clustering)
+
+
+def test_warm_start_seeds_are_part_of_the_key(tmp_path, monkeypatch):
+    import clustering
+    monkeypatch.setattr(clustering, 'CENTROID_DIR', str(tmp_path / 'centroids'))
+    registry = model_registry.ModelRegistry(str(tmp_path / 'models'), mmap_mode=None)
+    data = pd.read_csv(os.path.join(HERE, 'linear.csv'))
+    params = {'k_values': [2, 3], 'epochs': 1}
+
+    def run():
+        return registry.get_or_train('kmeans', data, params, clustering.train_clustering,
+                                     state=clustering.seed_state)
+
+    first, trained = run()
+    assert trained
+    # The fit saved its centroids as seeds; a rerun on the same data still loads
+    assert run() == (first, False)
+
+    # Different seeds on disk: the cached result no longer applies
+    columns = list(data.columns)
+    clustering.save_centroids(columns, 2, clustering.load_centroids(columns, 2) + 1.0)
+    assert run()[1]
@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import io
+from cleaning import get_pipeline
+from playstore_schema import load_playstore
+from eda_core import DataSource, load_dataset, run_dashboard, cleaning_section
+from lod_scatter import lod_figure, prepare as prepare_scatter, POINT_THRESHOLD as LOD_POINT_THRESHOLD
 
 # --- Streamlit Page Config ---
 st.set_page_config(page_title="📱 Google Play Store EDA", layout="wide", initial_sidebar_state="expanded")
@@ -33,86 +36,26 @@ st.title("📱 Google Play Store Apps EDA Dashboard")
 st.markdown("Explore, clean, and visualize Google Play Store data with a **professional, modern dashboard**.")
 
 # --- Load Dataset ---
-df = pd.read_csv("WK4/googleplaystore.csv")
-df.columns = df.columns.str.strip()
-
-# --- Data Cleaning ---
-df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
-df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce')
-df['Installs'] = df['Installs'].str.replace('[+,]', '', regex=True)
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
-df['Price'] = df['Price'].str.replace('$', '', regex=False)
-df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-
-# --- Sidebar ---
-st.sidebar.header("📊 Navigation Panel")
-option = st.sidebar.radio(
-    "Choose Analysis Section:",
-    (
-        "📂 Dataset Preview",
-        "ℹ️ Info",
-        "📊 Describe",
-        "🚨 Missing Values",
-        "📑 Duplicates",
-        "📊 Value Counts",
-        "🔢 Unique Values Count",
-        "🧹 Data Cleaning",
-        "📈 Visualizations",
-        "📊 Stats & Insights"
-    )
-)
-
-# --- Section Rendering ---
-if option == "📂 Dataset Preview":
-    st.subheader("🔍 Dataset Preview")
-    st.dataframe(df.head(10), use_container_width=True)
-
-elif option == "ℹ️ Info":
-    st.subheader("📄 Dataset Info")
-    buffer = io.StringIO()
-    df.info(buf=buffer)
-    st.code(buffer.getvalue(), language="text")
-
-elif option == "📊 Describe":
-    st.subheader("📊 Summary Statistics")
-    st.dataframe(df.describe(include="all"), use_container_width=True)
-
-elif option == "🚨 Missing Values":
-    st.subheader("🚨 Missing Values per Column")
-    st.bar_chart(df.isnull().sum())
-
-elif option == "📑 Duplicates":
-    st.subheader("📑 Duplicate Rows")
-    st.metric("Duplicate Rows Found", df.duplicated().sum())
-
-elif option == "📊 Value Counts":
-    st.subheader("📊 Value Counts by Column")
-    col = st.selectbox("Select Column", df.columns)
-    st.dataframe(df[col].value_counts(), use_container_width=True)
-
-elif option == "🔢 Unique Values Count":
-    st.subheader("🔢 Unique Values Count")
-    unique_counts = df.nunique().reset_index()
-    unique_counts.columns = ["Column", "Unique Count"]
-    st.dataframe(unique_counts, use_container_width=True)
-
-elif option == "🧹 Data Cleaning":
-    st.subheader("🧹 Data Cleaning Actions")
-    col1, col2 = st.columns(2)
-    with col1:
-        if st.button("🗑️ Drop Duplicates"):
-            df.drop_duplicates(inplace=True)
-            st.success("✅ Duplicates removed successfully!")
-    with col2:
-        if st.button("🛠️ Fill Missing Values"):
-            df['Rating'].fillna(df['Rating'].median(), inplace=True)
-            df.fillna("Unknown", inplace=True)
-            st.success("✅ Missing values filled successfully!")
-
-    st.write("Preview After Cleaning:")
-    st.dataframe(df.head(), use_container_width=True)
-
-elif option == "📈 Visualizations":
+# Typed once (int installs/reviews, float32 price/rating, Size in bytes, categoricals,
+# dates) and cached as a binary artifact; see playstore_schema.py. The frame and every
+# section result are shared across sessions by file fingerprint (eda_core.py).
+raw = load_dataset(DataSource("WK4/googleplaystore.csv", name="Google Play Store", loader=load_playstore))
+
+# --- Cleaning pipeline (per session, applied to every section) ---
+pipeline = get_pipeline(st.session_state)
+data = raw.cleaned(pipeline)
+
+
+def cleaning(ds):
+    cleaning_section(raw, pipeline, [
+        ("🗑️ Drop Duplicates", [("drop_duplicates", {})]),
+        ("🛠️ Fill Missing Values", [("fillna_median", dict(column="Rating")),
+                                    ("fillna", dict(value="Unknown", text_only=True))]),
+    ])
+
+
+def visualizations(ds):
+    df = ds.df
     st.subheader("📊 Interactive Visualizations")
     chart_type = st.selectbox(
         "Select Chart",
@@ -152,7 +95,7 @@ elif option == "📈 Visualizations":
         st.plotly_chart(fig, use_container_width=True)
 
     elif chart_type == "🏆 Top 10 Categories by Average Rating":
-        avg_rating = df.groupby("Category")['Rating'].mean().sort_values(ascending=False).head(10)
+        avg_rating = df.groupby("Category", observed=True)['Rating'].mean().sort_values(ascending=False).head(10)
         fig = px.bar(x=avg_rating.index, y=avg_rating.values,
                      title="Top 10 Categories by Average Rating",
                      color=avg_rating.values,
@@ -161,7 +104,7 @@ elif option == "📈 Visualizations":
         st.plotly_chart(fig, use_container_width=True)
 
     elif chart_type == "📥 Installs by Category (Bar)":
-        installs = df.groupby("Category")['Installs'].sum().sort_values(ascending=False).head(10)
+        installs = df.groupby("Category", observed=True)['Installs'].sum().sort_values(ascending=False).head(10)
         fig = px.bar(x=installs.index, y=installs.values,
                      title="Top 10 Categories by Total Installs",
                      color=installs.values,
@@ -170,34 +113,44 @@ elif option == "📈 Visualizations":
         st.plotly_chart(fig, use_container_width=True)
 
     elif chart_type == "📉 Reviews vs Rating (Scatter)":
-        scatter_df = df.dropna(subset=["Reviews", "Rating", "Installs"])
-        scatter_df = scatter_df[scatter_df["Installs"] > 0]
-        scatter_df = scatter_df[scatter_df["Reviews"] < scatter_df["Reviews"].quantile(0.99)]
-
-        fig = px.scatter(
-            scatter_df,
-            x="Reviews", y="Rating",
-            size="Installs",
-            size_max=60,
-            color="Category",
-            title="Reviews vs Rating (Bubble Size = Installs)",
-            hover_data=['App'],
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
+        scatter_df = prepare_scatter(df)
+
+        # Zoom: narrowing the ranges re-bins only the visible apps
+        max_reviews = int(scatter_df["Reviews"].max()) if len(scatter_df) else 0
+        zoom1, zoom2 = st.columns(2)
+        reviews_range = zoom1.slider("Reviews range", 0, max(max_reviews, 1), (0, max(max_reviews, 1)))
+        rating_range = zoom2.slider("Rating range", 0.0, 5.0, (0.0, 5.0), step=0.1)
+
+        # Density + sampled hover layer above LOD_POINT_THRESHOLD apps, so the payload stays bounded
+        fig, mode = lod_figure(scatter_df, x_range=reviews_range, y_range=rating_range)
+        if mode == "density":
+            st.caption(f"Too many apps to draw individually: showing density with a stratified sample. "
+                       f"Zoom below {LOD_POINT_THRESHOLD:,} apps to see every bubble.")
         st.plotly_chart(fig, use_container_width=True)
 
-elif option == "📊 Stats & Insights":
-    st.subheader("📈 Key Stats & Insights")
-    stats = df.groupby("Category").agg({
+
+def _insight_tables(df):
+    stats = df.groupby("Category", observed=True).agg({
         "Rating": "mean",
         "Installs": "sum",
         "App": "count"
     }).reset_index().sort_values("Installs", ascending=False)
     stats.rename(columns={"App": "App Count"}, inplace=True)
+    paid_free_stats = df.groupby("Type", observed=True)["Rating"].mean().reset_index()
+    cross = pd.crosstab(df['Category'], df['Content Rating'])
+    multi = df.groupby(["Category", "Type"], observed=True).agg({
+        "Rating": "mean",
+        "Installs": "sum"
+    }).reset_index()
+    return stats, paid_free_stats, cross, multi
+
+
+def stats_insights(ds):
+    stats, paid_free_stats, cross, multi = ds.result("insights", _insight_tables)
+    st.subheader("📈 Key Stats & Insights")
     st.dataframe(stats, use_container_width=True)
 
     st.subheader("💰 Free vs Paid: Average Rating")
-    paid_free_stats = df.groupby("Type")["Rating"].mean().reset_index()
     fig = px.bar(paid_free_stats, x="Type", y="Rating",
                  title="Average Rating: Free vs Paid",
                  color="Rating", text_auto=True,
@@ -205,12 +158,25 @@ elif option == "📊 Stats & Insights":
     st.plotly_chart(fig, use_container_width=True)
 
     st.subheader("📊 Category vs Content Rating Crosstab")
-    cross = pd.crosstab(df['Category'], df['Content Rating'])
     st.dataframe(cross, use_container_width=True)
 
     st.subheader("📆 Category + Type Aggregation")
-    multi = df.groupby(["Category", "Type"]).agg({
-        "Rating": "mean",
-        "Installs": "sum"
-    }).reset_index()
     st.dataframe(multi, use_container_width=True)
+
+
+run_dashboard(data, {
+    "Data Cleaning": cleaning,
+    "Visualizations": visualizations,
+    "Stats & Insights": stats_insights,
+}, labels={
+    "Dataset Preview": "📂 Dataset Preview",
+    "Info": "ℹ️ Info",
+    "Describe": "📊 Describe",
+    "Missing Values": "🚨 Missing Values",
+    "Duplicates": "📑 Duplicates",
+    "Value Counts": "📊 Value Counts",
+    "Unique Values Count": "🔢 Unique Values Count",
+    "Data Cleaning": "🧹 Data Cleaning",
+    "Visualizations": "📈 Visualizations",
+    "Stats & Insights": "📊 Stats & Insights",
+}, header="📊 Navigation Panel", prompt="Choose Analysis Section:")
@@ -0,0 +1,137 @@
+# cleaning.py
+# Declarative, undoable data-cleaning pipeline for the WK4 dashboards.
+# The pipeline is an ordered list of steps kept in st.session_state, so cleaning
+# survives reruns and applies to every sidebar section. Results are cached per
+# step prefix (hash of the dataset key and steps[:i]), so adding a step only runs
+# that step on the cached result of the previous ones, and undo is a cache hit.
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+MAX_CACHED_FRAMES = 16
+
+
+def _drop_duplicates(df, step):
+    return df.drop_duplicates()
+
+
+def _fillna(df, step):
+    # text_only: leave numeric columns numeric so charts and sums keep working
+    value = step['value']
+    columns = df.columns
+    if step.get('text_only'):
+        columns = [c for c in df.columns
+                   if not pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_datetime64_any_dtype(df[c])]
+    filled = {}
+    for col in columns:
+        if not df[col].isna().any():
+            continue
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+            series = series.cat.add_categories([value])
+        filled[col] = series.fillna(value)
+    return df.assign(**filled) if filled else df
+
+
+def _fillna_median(df, step):
+    col = step['column']
+    return df.assign(**{col: df[col].fillna(df[col].median())})
+
+
+def _to_datetime(df, step):
+    col = step['column']
+    return df.assign(**{col: pd.to_datetime(df[col], errors='coerce')})
+
+
+OPERATIONS = {
+    'drop_duplicates': _drop_duplicates,
+    'fillna': _fillna,
+    'fillna_median': _fillna_median,
+    'to_datetime': _to_datetime,
+}
+
+
+def describe_step(step):
+    args = ', '.join(f'{k}={v!r}' for k, v in step.items() if k != 'op')
+    return f"{step['op']}({args})"
+
+
+def _chain_hash(previous, step):
+    payload = previous + json.dumps(step, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+# prefix hash -> cleaned DataFrame, shared by all sessions of the server process.
+# Cached frames are shared: callers must not modify them in place.
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    return None
+
+
+def _cache_put(key, df):
+    with _cache_lock:
+        _cache[key] = df
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_FRAMES:
+            _cache.popitem(last=False)
+
+
+class CleaningPipeline:
+    def __init__(self, steps=None):
+        self.steps = list(steps or [])
+
+    def add(self, op, **params):
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown cleaning operation: {op}")
+        self.steps.append(dict(op=op, **params))
+
+    def undo(self):
+        if self.steps:
+            self.steps.pop()
+
+    def reset(self):
+        self.steps = []
+
+    def prefix_keys(self, base_key):
+        keys = []
+        h = str(base_key)
+        for step in self.steps:
+            h = _chain_hash(h, step)
+            keys.append(h)
+        return keys
+
+    def key(self, base_key):
+        keys = self.prefix_keys(base_key)
+        return keys[-1] if keys else str(base_key)
+
+    def apply(self, df, base_key):
+        # Start from the longest cached prefix and run only the steps after it
+        keys = self.prefix_keys(base_key)
+        start, out = 0, df
+        for i in range(len(keys), 0, -1):
+            cached = _cache_get(keys[i - 1])
+            if cached is not None:
+                start, out = i, cached
+                break
+        for i in range(start, len(self.steps)):
+            step = self.steps[i]
+            out = OPERATIONS[step['op']](out, step)
+            _cache_put(keys[i], out)
+        return out
+
+
+def get_pipeline(session_state, name='cleaning_pipeline'):
+    # One pipeline per browser session
+    if name not in session_state:
+        session_state[name] = CleaningPipeline()
+    return session_state[name]
@@ -0,0 +1,46 @@
+import streamlit as st
+from cleaning import get_pipeline
+from playstore_schema import load_playstore
+from eda_core import DataSource, load_dataset, run_dashboard, cleaning_section
+
+# One server for every dataset: frames and section results are shared by all sessions
+# through eda_core's caches, keyed by each file's fingerprint.
+# Run from the repository root: streamlit run WK4/eda_app.py
+DATASETS = [
+    DataSource("WK4/ODI_Match_info.csv", name="ODI matches"),
+    DataSource("WK4/googleplaystore.csv", name="Google Play Store", loader=load_playstore),
+    DataSource("WK6/Churn_Modelling.csv", name="Bank churn"),
+    DataSource("Wk3/titanic_data.csv", name="Titanic"),
+    DataSource("SVM_KMEANS/linear.csv", name="Linear regression sample"),
+    DataSource("SVM_KMEANS/logistic.csv", name="Logistic regression sample"),
+    DataSource("Wk3/First.db", table="FianacialData", name="Financial data (First.db)"),
+    DataSource("Wk3/second.db", table="F_Data", name="Financial data (second.db)"),
+    DataSource("Wk3/Quizprep.db", table="quizpre", name="Quiz prep"),
+    DataSource("Aqib.db", table="tech_ninjas", name="Tech ninjas"),
+    DataSource("practise.db", table="Students", name="Practice students"),
+    DataSource("WK1&2asgs/wk2/students.db", table="Students", name="Students"),
+    DataSource("WK1&2asgs/wk2/students.db", table="Enrollments", name="Enrollments"),
+    DataSource("WK1&2asgs/wk2/sales_data.db", table="sales", name="Sales"),
+    DataSource("WK1&2asgs/wk2/example.db", table="employees", name="Employees"),
+]
+
+st.set_page_config(page_title="📊 EDA Dashboard", layout="wide")
+st.title("📊 EDA Dashboard")
+
+sources = {source.name: source for source in DATASETS}
+choice = st.sidebar.selectbox("Dataset", list(sources))
+raw = load_dataset(sources[choice])
+st.caption(f"{choice}: {len(raw.df):,} rows × {raw.df.shape[1]} columns")
+
+# One cleaning pipeline per session and dataset
+pipeline = get_pipeline(st.session_state, name=f"cleaning_pipeline:{choice}")
+
+
+def cleaning(ds):
+    cleaning_section(raw, pipeline, [
+        ("Drop Duplicates", [("drop_duplicates", {})]),
+        ("Fill Missing Values with 'Unknown'", [("fillna", dict(value="Unknown", text_only=True))]),
+    ])
+
+
+run_dashboard(raw.cleaned(pipeline), {"Data Cleaning": cleaning})
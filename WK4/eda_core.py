@@ -0,0 +1,221 @@
+# eda_core.py
+# Dataset-agnostic EDA dashboard engine shared by the WK4 apps and eda_app.py.
+# A DataSource (CSV, Parquet or SQLite table) is identified by a fingerprint of its
+# path, table and file mtime/size. Loaded frames and section results live in
+# process-wide LRU caches keyed by that fingerprint, so all sessions of a server share
+# them, and a section is only computed when it is selected.
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import streamlit as st
+
+from cleaning import describe_step
+from profiler import profile_csv, profile_frame
+
+MAX_FRAMES = 8
+MAX_RESULTS = 64
+
+
+class SharedCache:
+    # Thread-safe LRU shared by every session of the server process.
+    # Cached values are shared: callers must not modify them in place.
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Concurrent sessions asking for the same key wait for one computation
+        with key_lock:
+            with self._lock:
+                if key in self._data:
+                    return self._data[key]
+            value = compute()
+            with self._lock:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+                self._key_locks.pop(key, None)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_frames = SharedCache(MAX_FRAMES)
+_results = SharedCache(MAX_RESULTS)
+
+
+class DataSource:
+    # kind is taken from the extension: .csv, .parquet/.pq, or .db/.sqlite (needs table)
+    KINDS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet',
+             '.db': 'sqlite', '.sqlite': 'sqlite', '.sqlite3': 'sqlite'}
+
+    def __init__(self, path, table=None, name=None, loader=None, **read_kwargs):
+        self.path = path
+        self.table = table
+        self.loader = loader
+        self.read_kwargs = read_kwargs
+        ext = os.path.splitext(path)[1].lower()
+        self.kind = 'custom' if loader is not None else self.KINDS.get(ext)
+        if self.kind is None:
+            raise ValueError(f"Unsupported data source: {path}")
+        if self.kind == 'sqlite' and not table:
+            raise ValueError(f"A table name is required for SQLite source {path}")
+        self.name = name or (f"{os.path.basename(path)}:{table}" if table else os.path.basename(path))
+
+    def fingerprint(self):
+        st_ = os.stat(self.path)
+        return f"{os.path.abspath(self.path)}:{self.table or ''}:{st_.st_mtime_ns}:{st_.st_size}"
+
+    def load(self):
+        if self.loader is not None:
+            return self.loader(self.path)
+        if self.kind == 'csv':
+            df = pd.read_csv(self.path, **self.read_kwargs)
+        elif self.kind == 'parquet':
+            df = pd.read_parquet(self.path, **self.read_kwargs)
+        else:
+            with sqlite3.connect(f"file:{self.path}?mode=ro", uri=True) as con:
+                df = pd.read_sql_query(f'SELECT * FROM "{self.table}"', con, **self.read_kwargs)
+        df.columns = df.columns.str.strip()
+        return df
+
+
+class Dataset:
+    # A frame plus its cache key; section results are computed lazily and shared.
+    # source: the DataSource the frame was loaded from as is, None once transformed.
+    def __init__(self, key, df, name=None, source=None):
+        self.key = key
+        self.df = df
+        self.name = name
+        self.source = source
+
+    def result(self, name, compute):
+        return _results.get_or_compute((self.key, name), lambda: compute(self.df))
+
+    @property
+    def profile(self):
+        # An untransformed CSV is profiled out of core, chunk by chunk from the file;
+        # anything else (SQLite, custom loaders, cleaned frames) from the frame
+        source = self.source
+        if source is not None and source.kind == 'csv':
+            return self.result('profile', lambda df: profile_csv(source.path, **source.read_kwargs))
+        return self.result('profile', profile_frame)
+
+    def cleaned(self, pipeline):
+        if not pipeline.steps:
+            return self
+        return Dataset(pipeline.key(self.key), pipeline.apply(self.df, self.key), self.name)
+
+
+def load_dataset(source):
+    key = source.fingerprint()
+    df = _frames.get_or_compute(key, source.load)
+    return Dataset(key, df, source.name, source)
+
+
+# --- Common sections: fn(dataset) ---
+def _preview(ds):
+    st.subheader("🔍 Dataset Preview")
+    st.dataframe(ds.df.head(10), use_container_width=True)
+
+
+def _info(ds):
+    st.subheader("ℹ️ Dataset Info")
+    st.code(ds.profile.info_text(), language="text")
+
+
+def _describe(ds):
+    st.subheader("📊 Summary Statistics")
+    st.dataframe(ds.profile.describe(), use_container_width=True)
+
+
+def _missing(ds):
+    st.subheader("🚨 Missing Values per Column")
+    missing = ds.profile.missing()
+    st.bar_chart(missing)
+    st.dataframe(missing.rename("Missing"), use_container_width=True)
+
+
+def _duplicates(ds):
+    st.subheader("📑 Duplicate Rows")
+    st.metric("Duplicate Rows Found", ds.profile.duplicates())
+    if not ds.profile.duplicates_is_exact():
+        st.caption("Approximate: too many distinct rows to compare exactly (HyperLogLog estimate).")
+
+
+def _value_counts(ds):
+    st.subheader("📊 Value Counts by Column")
+    col = st.selectbox("Select Column", ds.df.columns)
+    st.dataframe(ds.profile.value_counts(col), use_container_width=True)
+    if not ds.profile.value_counts_is_exact(col):
+        st.caption("Approximate: only the most frequent values are tracked for this column.")
+
+
+def _unique_counts(ds):
+    st.subheader("🔢 Unique Values Count")
+    unique_counts = ds.profile.nunique().reset_index()
+    unique_counts.columns = ["Column", "Unique Count"]
+    st.dataframe(unique_counts, use_container_width=True)
+    if not ds.profile.nunique_is_exact():
+        st.caption("Approximate for high-cardinality columns (HyperLogLog estimate).")
+
+
+SECTIONS = OrderedDict([
+    ("Dataset Preview", _preview),
+    ("Info", _info),
+    ("Describe", _describe),
+    ("Missing Values", _missing),
+    ("Duplicates", _duplicates),
+    ("Value Counts", _value_counts),
+    ("Unique Values Count", _unique_counts),
+])
+
+
+def cleaning_section(raw, pipeline, actions):
+    # actions: [(button label, [(op, params), ...]), ...]; steps are recorded in the
+    # session's pipeline, so they carry over to every section and can be undone
+    st.subheader("🧹 Data Cleaning")
+    for label, steps in actions:
+        if st.button(label):
+            for op, params in steps:
+                pipeline.add(op, **params)
+            st.success(f"✅ {label}: done!")
+
+    col1, col2 = st.columns(2)
+    if col1.button("↩️ Undo Last Step", disabled=not pipeline.steps):
+        pipeline.undo()
+    if col2.button("🔄 Reset Cleaning", disabled=not pipeline.steps):
+        pipeline.reset()
+
+    cleaned = raw.cleaned(pipeline)
+    st.write("Applied steps:", [describe_step(step) for step in pipeline.steps] or "none")
+    st.write("Cleaned Dataset Preview:")
+    st.dataframe(cleaned.df.head(), use_container_width=True)
+    return cleaned
+
+
+def run_dashboard(dataset, extra_sections=None, labels=None,
+                  header="📊 EDA & Analysis", prompt="Select what to view:"):
+    # extra_sections: {name: fn(dataset)}, added after (or replacing) the common ones.
+    # labels: {name: sidebar label}. Only the selected section runs.
+    sections = OrderedDict(SECTIONS)
+    sections.update(extra_sections or {})
+    labels = labels or {}
+    st.sidebar.header(header)
+    names = list(sections)
+    option = st.sidebar.radio(prompt, names, format_func=lambda n: labels.get(n, n))
+    sections[option](dataset)
+    return option
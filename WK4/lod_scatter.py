@@ -0,0 +1,104 @@
+# lod_scatter.py
+# Level-of-detail rendering for the "Reviews vs Rating" bubble chart.
+# Up to POINT_THRESHOLD rows the original per-app bubble chart is drawn. Above it,
+# the chart becomes a 2D density (np.histogram2d on a fixed grid) with a hover
+# layer of at most MAX_HOVER_POINTS apps sampled evenly across categories. The
+# payload then depends on the grid and the sample size, not on the row count.
+# Zooming (narrowing the x/y ranges) re-bins only the visible rows, so the same
+# grid shows finer detail.
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+POINT_THRESHOLD = 5000
+MAX_HOVER_POINTS = 600
+GRID = (120, 60)
+
+
+def prepare(df, x='Reviews', y='Rating', size='Installs'):
+    # Same row selection as the original chart
+    out = df.dropna(subset=[x, y, size])
+    out = out[out[size] > 0]
+    return out[out[x] < out[x].quantile(0.99)]
+
+
+def clip(df, x, y, x_range=None, y_range=None):
+    mask = np.ones(len(df), dtype=bool)
+    if x_range is not None:
+        xs = df[x].to_numpy(dtype='float64')
+        mask &= (xs >= x_range[0]) & (xs <= x_range[1])
+    if y_range is not None:
+        ys = df[y].to_numpy(dtype='float64')
+        mask &= (ys >= y_range[0]) & (ys <= y_range[1])
+    return df[mask]
+
+
+def stratified_sample(df, by, n, seed=42):
+    # Up to n rows overall, spread evenly over the groups in `by`
+    if len(df) <= n:
+        return df
+    groups = max(1, df[by].nunique())
+    per_group = max(1, n // groups)
+    order = np.random.default_rng(seed).permutation(len(df))
+    shuffled = df.iloc[order]
+    rank = shuffled.groupby(by, observed=True).cumcount().to_numpy()
+    return shuffled[rank < per_group].head(n)
+
+
+def density(df, x, y, bins=GRID, x_range=None, y_range=None):
+    xs = df[x].to_numpy(dtype='float64')
+    ys = df[y].to_numpy(dtype='float64')
+    value_range = None
+    if x_range is not None and y_range is not None:
+        value_range = [list(x_range), list(y_range)]
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=bins, range=value_range)
+    return counts, x_edges, y_edges
+
+
+def bubble_figure(df, x='Reviews', y='Rating', size='Installs', color='Category', hover='App'):
+    return px.scatter(
+        df,
+        x=x, y=y,
+        size=df[size].astype('float64'),
+        size_max=60,
+        color=color,
+        title="Reviews vs Rating (Bubble Size = Installs)",
+        hover_data=[hover],
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+
+
+def lod_figure(df, x='Reviews', y='Rating', size='Installs', color='Category', hover='App',
+               x_range=None, y_range=None, threshold=POINT_THRESHOLD, max_points=MAX_HOVER_POINTS):
+    # Returns (figure, mode) where mode is "points" or "density"
+    view = clip(df, x, y, x_range, y_range)
+    if len(view) <= threshold:
+        fig = bubble_figure(view, x, y, size, color, hover)
+        return fig, 'points'
+
+    counts, x_edges, y_edges = density(view, x, y, x_range=x_range, y_range=y_range)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    # Empty cells are left transparent; log scale keeps sparse areas visible
+    z = np.where(counts.T > 0, np.log10(counts.T + 1), np.nan)
+    fig = go.Figure(go.Heatmap(
+        x=np.round(x_centers, 2), y=np.round(y_centers, 3), z=np.round(z, 3),
+        colorscale='Greens', colorbar=dict(title='log10(apps)'),
+        customdata=counts.T.astype(int),
+        hovertemplate='Reviews %{x}<br>Rating %{y}<br>%{customdata} apps<extra></extra>'
+    ))
+
+    sample = stratified_sample(view, color, max_points)
+    sizes = sample[size].astype('float64').to_numpy()
+    fig.add_trace(go.Scatter(
+        x=sample[x], y=sample[y], mode='markers',
+        marker=dict(size=np.clip(np.log10(sizes) * 2, 3, 20), color='rgba(30,30,30,0.35)'),
+        text=sample[hover].astype(str) + ' (' + sample[color].astype(str) + ')',
+        hovertemplate='%{text}<br>Reviews %{x}<br>Rating %{y}<extra></extra>',
+        name=f'{len(sample)} sampled apps'
+    ))
+    fig.update_layout(
+        title=f"Reviews vs Rating — density of {len(view):,} apps (marker size = log installs)",
+        xaxis_title=x, yaxis_title=y
+    )
+    return fig, 'density'
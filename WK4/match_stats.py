@@ -0,0 +1,140 @@
+# match_stats.py
+# Single-pass aggregation engine and materialized store for the cricket dashboard.
+# Every key column is factorized once; each count table is then one np.bincount over
+# the encoded keys (a * n_b + b for pairs). Tables from new rows are added into the
+# store, whose version goes up on every change, and every sidebar section reads from
+# it instead of running its own groupby/merge/value_counts.
+# MatchStats continues odi_ingest's MatchAggregates: the same add()/rows/version and
+# toss_wins/toss_decisions/season_matches/season_venue API, with every table now
+# coming from the one bincount pass. MatchAggregates remains its name on the ingest side.
+import numpy as np
+import pandas as pd
+
+# Columns holding team names share one vocabulary so their tables line up
+TEAM_COLUMNS = ['team1', 'team2', 'toss_winner', 'winner']
+OTHER_COLUMNS = ['toss_decision', 'result', 'season', 'venue']
+
+# name -> (row column, column column)
+PAIR_TABLES = {
+    'decision_winner': ('toss_decision', 'winner'),
+    'decision_result': ('toss_decision', 'result'),
+    'season_toss_winner': ('season', 'toss_winner'),
+    'venue_season': ('venue', 'season'),
+}
+
+
+def _encode(rows):
+    # column -> (codes, labels); -1 marks missing values
+    encoded = {}
+    teams = [c for c in TEAM_COLUMNS if c in rows.columns]
+    if teams:
+        codes, labels = pd.factorize(pd.concat([rows[c] for c in teams], ignore_index=True))
+        n = len(rows)
+        for i, col in enumerate(teams):
+            encoded[col] = (codes[i * n:(i + 1) * n], labels)
+    for col in OTHER_COLUMNS:
+        if col in rows.columns:
+            encoded[col] = pd.factorize(rows[col])
+    return encoded
+
+
+def _count(codes, labels):
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    return pd.Series(counts, index=pd.Index(labels), dtype='int64')
+
+
+def _count_pairs(a, b):
+    (a_codes, a_labels), (b_codes, b_labels) = a, b
+    valid = (a_codes >= 0) & (b_codes >= 0)
+    keys = a_codes[valid].astype(np.int64) * len(b_labels) + b_codes[valid]
+    counts = np.bincount(keys, minlength=len(a_labels) * len(b_labels))
+    return pd.DataFrame(counts.reshape(len(a_labels), len(b_labels)),
+                        index=pd.Index(a_labels), columns=pd.Index(b_labels), dtype='int64')
+
+
+def count_tables(rows):
+    enc = _encode(rows)
+    tables = {}
+    if 'team1' in enc and 'team2' in enc:
+        codes = np.concatenate([enc['team1'][0], enc['team2'][0]])
+        tables['matches_played'] = _count(codes, enc['team1'][1])
+    if 'toss_winner' in enc:
+        tables['toss_wins'] = _count(*enc['toss_winner'])
+    if 'toss_decision' in enc:
+        tables['toss_decisions'] = _count(*enc['toss_decision'])
+    if 'season' in enc:
+        tables['season_matches'] = _count(*enc['season'])
+    for name, (a, b) in PAIR_TABLES.items():
+        if a in enc and b in enc:
+            tables[name] = _count_pairs(enc[a], enc[b])
+    return tables
+
+
+def _add(total, table):
+    if total is None:
+        return table
+    out = total.add(table, fill_value=0)
+    return out.fillna(0).astype('int64')
+
+
+class MatchStats:
+    # Versioned materialized store of count tables
+    def __init__(self):
+        self.rows = 0
+        self.version = 0
+        self.tables = {}
+
+    def add(self, rows):
+        if not len(rows):
+            return
+        for name, table in count_tables(rows).items():
+            self.tables[name] = _add(self.tables.get(name), table)
+        self.rows += len(rows)
+        self.version += 1
+
+    def get(self, name):
+        return self.tables.get(name)
+
+    def _counts(self, name):
+        # value_counts() layout, as MatchAggregates kept them; None before any rows
+        table = self.tables.get(name)
+        return None if table is None else table[table > 0].sort_values(ascending=False, kind='stable')
+
+    # MatchAggregates accessors, used by the dashboard
+    @property
+    def toss_wins(self):
+        return self._counts('toss_wins')
+
+    @property
+    def toss_decisions(self):
+        return self._counts('toss_decisions')
+
+    @property
+    def season_matches(self):
+        return self._counts('season_matches')
+
+    @property
+    def season_venue(self):
+        table = self.tables.get('venue_season')
+        return None if table is None else table.sort_index().sort_index(axis=1)
+
+    def toss_win_pct(self):
+        played = self.tables['matches_played']
+        played = played[played > 0]
+        wins = self.tables['toss_wins'].reindex(played.index, fill_value=0)
+        return pd.DataFrame({
+            'Team': played.index,
+            'Toss Wins': wins.values,
+            'Matches Played': played.values,
+            'Toss Win %': wins.values / played.values * 100,
+        })
+
+    def long_table(self, name, row_name, col_name):
+        # Pair table in groupby(...).size() layout, without empty combinations
+        table = self.tables[name]
+        out = table.rename_axis(index=row_name, columns=col_name).stack().reset_index(name='Matches')
+        return out[out['Matches'] > 0].sort_values([row_name, col_name]).reset_index(drop=True)
+
+
+# The ingestor's store keeps the name it was introduced under
+MatchAggregates = MatchStats
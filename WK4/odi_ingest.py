@@ -0,0 +1,134 @@
+# odi_ingest.py
+# Append-only ingestion for ODI_Match_info.csv.
+# New matches are appended to the end of the CSV, so after the first load only the
+# bytes past the last read offset are parsed. Rows whose id was already seen are
+# skipped. A running SHA-1 of the bytes read so far (digest) identifies the content
+# without re-reading it. A refresh reads O(new bytes): when the file grew, only the
+# last BOUNDARY_SIZE bytes before the old offset are compared. When it changed without
+# growing, no append explains it, so the whole prefix is hashed against the digest.
+# A change or shrink resets the ingestor and reads the file again. The tail is parsed
+# with the column types the frame already has, so numeric-looking seasons stay text.
+# The count tables used by the dashboard (MatchAggregates, see match_stats.py) are
+# updated from the new rows only.
+import os
+import hashlib
+import threading
+from io import BytesIO
+
+import pandas as pd
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+from match_stats import MatchAggregates
+
+HASH_CHUNK = 1 << 20
+# Bytes before the read offset compared on an append
+BOUNDARY_SIZE = 64 * 1024
+
+
+def _is_text(dtype):
+    return is_object_dtype(dtype) or is_string_dtype(dtype)
+
+
+class MatchIngestor:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.header = None
+        # SHA-1 of bytes [0, offset), the last bytes before offset and the file's mtime
+        self.digest = hashlib.sha1()
+        self.boundary = b''
+        self.mtime_ns = None
+        self.ids = set()
+        self._chunks = []
+        self._frame = None
+        self.aggregates = MatchAggregates()
+
+    def _prefix_changed(self, f, size):
+        # True when the file shrank or the bytes already read were changed
+        if size < self.offset:
+            return True
+        if size > self.offset:
+            f.seek(self.offset - len(self.boundary))
+            return f.read(len(self.boundary)) != self.boundary
+        h = hashlib.sha1()
+        remaining = self.offset
+        f.seek(0)
+        while remaining > 0:
+            chunk = f.read(min(HASH_CHUNK, remaining))
+            if not chunk:
+                return True
+            h.update(chunk)
+            remaining -= len(chunk)
+        return h.hexdigest() != self.digest.hexdigest()
+
+    def refresh(self):
+        # Parse whatever was appended since the last call; returns the new rows
+        with self._lock:
+            st = os.stat(self.path)
+            if self.header is not None and st.st_size == self.offset and st.st_mtime_ns == self.mtime_ns:
+                return self._empty()
+            with open(self.path, 'rb') as f:
+                if self.header is not None and self._prefix_changed(f, st.st_size):
+                    self._reset()
+                if self.header is None:
+                    f.seek(0)
+                    self.header = f.readline()
+                    self.offset = len(self.header)
+                    self.digest.update(self.header)
+                    self.boundary = self.header[-BOUNDARY_SIZE:]
+                self.mtime_ns = st.st_mtime_ns
+                if st.st_size == self.offset:
+                    return self._empty()
+                f.seek(self.offset)
+                data = f.read(st.st_size - self.offset)
+
+            # Only complete lines; a row still being written is picked up next time
+            cut = data.rfind(b'\n') + 1
+            if cut == 0:
+                return self._empty()
+            data = data[:cut]
+            rows = pd.read_csv(BytesIO(self.header + data), dtype=self._text_columns())
+            rows.columns = [c.strip() for c in rows.columns]
+            rows = rows[~rows['id'].isin(self.ids)].drop_duplicates('id').reset_index(drop=True)
+
+            self.offset += cut
+            self.digest.update(data)
+            self.boundary = data[-BOUNDARY_SIZE:] if cut >= BOUNDARY_SIZE else (self.boundary + data)[-BOUNDARY_SIZE:]
+            self.ids.update(rows['id'].tolist())
+            if len(rows):
+                self._chunks.append(rows)
+                self._frame = None
+                self.aggregates.add(rows)
+            return rows
+
+    def _text_columns(self):
+        # Raw header name -> str for the columns read so far as text, like
+        # WK6/loader.py's read_appended(like=...)
+        if not self._chunks:
+            return None
+        first = self._chunks[0]
+        raw = pd.read_csv(BytesIO(self.header), nrows=0).columns
+        return {name: str for name in raw
+                if name.strip() in first.columns and _is_text(first[name.strip()].dtype)}
+
+    def _empty(self):
+        return pd.DataFrame(columns=[c.strip() for c in self.header.decode('utf-8').strip().split(',')])
+
+    def snapshot(self):
+        # (content key, frame) read together, so a concurrent refresh can't pair a key
+        # with another version's rows. The key changes on any edit, not just on growth.
+        with self._lock:
+            return f"{self.path}:{self.digest.hexdigest()}", self.frame
+
+    @property
+    def frame(self):
+        # Full table, concatenated lazily only when a section needs raw rows
+        if self._frame is None:
+            if len(self._chunks) > 1:
+                self._chunks = [pd.concat(self._chunks, ignore_index=True)]
+            self._frame = self._chunks[0] if self._chunks else self._empty()
+        return self._frame
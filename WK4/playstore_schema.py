@@ -0,0 +1,146 @@
+# playstore_schema.py
+# Schema-driven, vectorized parsing of googleplaystore.csv into compact dtypes.
+# The file is parsed once per (mtime, size, schema version) and the typed frame is
+# kept as a binary artifact in .cache/ (Feather when pyarrow is available, pickle
+# otherwise). Later reruns read the artifact instead of re-running the string cleanup.
+import os
+import glob
+import hashlib
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+SCHEMA_VERSION = 1
+CACHE_DIR = '.cache'
+
+# column -> parser name (see PARSERS)
+SCHEMA = {
+    'App': 'text',
+    'Category': 'category',
+    'Rating': 'float32',
+    'Reviews': 'count',
+    'Size': 'size_bytes',
+    'Installs': 'installs',
+    'Type': 'category',
+    'Price': 'price',
+    'Content Rating': 'category',
+    'Genres': 'category',
+    'Last Updated': 'date',
+    'Current Ver': 'category',
+    'Android Ver': 'category',
+}
+
+DATE_FORMAT = '%B %d, %Y'
+SIZE_UNITS = {'k': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def _text(s):
+    return s
+
+
+def _category(s):
+    return s.astype('category')
+
+
+def _float32(s):
+    return pd.to_numeric(s, errors='coerce').astype('float32')
+
+
+def _count(s):
+    return pd.to_numeric(s, errors='coerce').astype('Int64')
+
+
+def _installs(s):
+    # "10,000+" -> 10000; plain str methods, no regex
+    s = s.astype('string').str.replace(',', '', regex=False).str.rstrip('+')
+    return pd.to_numeric(s, errors='coerce').astype('Int64')
+
+
+def _price(s):
+    s = s.astype('string').str.lstrip('$')
+    return pd.to_numeric(s, errors='coerce').astype('float32')
+
+
+def _size_bytes(s):
+    # "19M" / "201k" -> bytes; "Varies with device" -> <NA>
+    s = s.astype('string')
+    unit = s.str[-1]
+    number = pd.to_numeric(s.str[:-1], errors='coerce')
+    factor = unit.map(SIZE_UNITS).astype('float64')
+    return (number * factor).round().astype('Int64')
+
+
+def _date(s):
+    return pd.to_datetime(s, format=DATE_FORMAT, errors='coerce')
+
+
+PARSERS = {
+    'text': _text,
+    'category': _category,
+    'float32': _float32,
+    'count': _count,
+    'installs': _installs,
+    'price': _price,
+    'size_bytes': _size_bytes,
+    'date': _date,
+}
+
+
+def parse(path, schema=SCHEMA):
+    # Read everything as strings once, then convert each column by its schema entry
+    df = pd.read_csv(path, dtype=str, keep_default_na=True)
+    df.columns = df.columns.str.strip()
+    for col, kind in schema.items():
+        if col in df.columns:
+            df[col] = PARSERS[kind](df[col])
+    return df
+
+
+def _artifact_path(path):
+    st = os.stat(path)
+    key = f'{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}:{SCHEMA_VERSION}'
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    ext = '.feather' if feather is not None else '.pkl'
+    return folder, stem, os.path.join(folder, f'{stem}.{digest}{ext}')
+
+
+def _read_artifact(artifact):
+    if artifact.endswith('.feather'):
+        return feather.read_feather(artifact, memory_map=True)
+    return pd.read_pickle(artifact)
+
+
+def _write_artifact(df, artifact):
+    tmp = artifact + '.tmp'
+    if artifact.endswith('.feather'):
+        feather.write_feather(df, tmp, compression='uncompressed')
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, artifact)
+
+
+def load_playstore(path):
+    folder, stem, artifact = _artifact_path(path)
+    if os.path.exists(artifact):
+        try:
+            return _read_artifact(artifact)
+        except Exception:
+            pass  # corrupt or unreadable artifact: parse again
+    df = parse(path)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        # Artifacts of older versions of the file are no longer needed
+        ext = os.path.splitext(artifact)[1]
+        for old in glob.glob(os.path.join(folder, f'{stem}.{"?" * 16}{ext}')):
+            if old != artifact:
+                os.remove(old)
+        _write_artifact(df, artifact)
+    except OSError:
+        pass
+    return df
@@ -0,0 +1,417 @@
+# profiler.py
+# Out-of-core EDA engine for the WK4 dashboards.
+# One chunked pass over a CSV (or an in-memory frame) produces a ProfileReport that
+# feeds the Info, Describe, Missing Values, Duplicates, Value Counts and Unique Values
+# sections. Every statistic is kept in a mergeable, bounded-size form:
+#   - describe: running moments (Chan et al. merge) + bottom-k sample for quartiles
+#   - nunique: exact set up to EXACT_DISTINCT values, HyperLogLog beyond that
+#   - duplicates: two independent 64-bit row hashes; a row is a duplicate only if
+#     both hashes match an earlier row. Only distinct row hashes are kept (16 bytes
+#     each), up to EXACT_ROWS of them; past that the count becomes a HyperLogLog
+#     estimate (rows - distinct rows) and memory stops growing
+#   - value counts: exact up to TOP_K_CAPACITY values, then heavy hitters with an
+#     error bound (space-saving style pruning)
+# profile_csv reads every chunk as text, so a value has the same key in every chunk
+# (typed one by one, Reviews would be int64 in most chunks and text in the one with
+# '3.0M'). Each chunk is also parsed to numbers where it can be, for describe, and
+# the dtype is decided over all chunks the way read_csv decides it for the whole
+# file. Counted values are shown in that final dtype.
+import numpy as np
+import pandas as pd
+
+CHUNK_SIZE = 100_000
+EXACT_DISTINCT = 50_000
+TOP_K_CAPACITY = 2_000
+SAMPLE_SIZE = 20_000
+# Distinct rows tracked exactly for the duplicate count (16 bytes each)
+EXACT_ROWS = 5_000_000
+BOOL_TEXT = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+HLL_PRECISION = 14
+# Second hash key for duplicate verification (pandas' default key is '0123456789123456')
+VERIFY_HASH_KEY = 'fedcba9876543210'
+
+
+def _hash(values, hash_key=None):
+    if hash_key is None:
+        return pd.util.hash_pandas_object(values, index=False).to_numpy()
+    return pd.util.hash_pandas_object(values, index=False, hash_key=hash_key).to_numpy()
+
+
+def _is_text(dtype):
+    return (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)) \
+        and not isinstance(dtype, pd.CategoricalDtype)
+
+
+def parse_text(text):
+    # A column chunk read as text, typed as read_csv would type it on its own:
+    # int64, float64, bool, or left as text
+    present = text.dropna()
+    if not len(present):
+        return pd.Series(np.nan, index=text.index, dtype='float64')
+    numbers = pd.to_numeric(present, errors='coerce')
+    if numbers.notna().all() and pd.api.types.is_numeric_dtype(numbers.dtype):
+        if pd.api.types.is_integer_dtype(numbers.dtype) and len(present) == len(text):
+            return numbers.astype('int64')
+        return numbers.astype('float64').reindex(text.index)
+    if present.isin(list(BOOL_TEXT)).all():
+        flags = present.map(BOOL_TEXT)
+        return flags.astype(bool) if len(present) == len(text) else flags.reindex(text.index).astype(object)
+    return text
+
+
+class RunningMoments:
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        n_b = len(values)
+        if not n_b:
+            return
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def std(self):
+        # Sample standard deviation, like DataFrame.describe
+        return (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else np.nan
+
+
+class BottomKSample:
+    # Uniform sample of size k: keep the values with the k smallest random keys
+    def __init__(self, k=SAMPLE_SIZE, seed=0):
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.values = np.empty(0)
+
+    def update(self, values):
+        keys = np.concatenate([self.keys, self.rng.random(len(values))])
+        values = np.concatenate([self.values, values])
+        if len(keys) > self.k:
+            keep = np.argpartition(keys, self.k)[:self.k]
+            keys, values = keys[keep], values[keep]
+        self.keys, self.values = keys, values
+
+    def quantiles(self, qs):
+        if not len(self.values):
+            return [np.nan] * len(qs)
+        return np.quantile(self.values, qs).tolist()
+
+
+class HyperLogLog:
+    def __init__(self, p=HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, hashes):
+        if not len(hashes):
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # rank = position of the leftmost 1-bit in the remaining 64-p bits
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = np.where(rest == 0, 64 - self.p + 1, 64 - self.p - exponent + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+
+class DistinctCounter:
+    def __init__(self):
+        self.exact = set()
+        self.hll = HyperLogLog()
+
+    def update(self, values):
+        self.hll.update(_hash(values))
+        if self.exact is not None:
+            self.exact.update(values.unique().tolist())
+            if len(self.exact) > EXACT_DISTINCT:
+                self.exact = None
+
+    @property
+    def is_exact(self):
+        return self.exact is not None
+
+    def count(self, dtype=None):
+        # dtype: the column's final dtype, when the values were counted as text
+        if self.exact is None:
+            return self.hll.estimate()
+        if dtype is not None and not _is_text(dtype):
+            return len(set(_typed_keys(list(self.exact), dtype)))
+        return len(self.exact)
+
+
+class HeavyHitters:
+    def __init__(self, capacity=TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')
+        # Upper bound on how much any dropped value could have been undercounted
+        self.error = 0
+
+    def update(self, values):
+        counts = values.value_counts(dropna=True)
+        counts = counts[counts > 0]
+        if isinstance(counts.index, pd.CategoricalIndex):
+            counts.index = counts.index.astype(object)
+        self.counts = self.counts.add(counts, fill_value=0).astype('int64')
+        if len(self.counts) > 2 * self.capacity:
+            self.counts = self.counts.sort_values(ascending=False, kind='stable')
+            self.error = max(self.error, int(self.counts.iloc[self.capacity]))
+            self.counts = self.counts.iloc[:self.capacity]
+
+    @property
+    def is_exact(self):
+        return self.error == 0
+
+    def top(self, n=None, dtype=None):
+        # dtype: the column's final dtype, when the keys were counted as text
+        out = self.counts
+        if dtype is not None and len(out) and not _is_text(dtype):
+            out = out.groupby(_typed_keys(out.index, dtype)).sum()
+        out = out.sort_values(ascending=False, kind='stable')
+        return out if n is None else out.head(n)
+
+
+def _typed_keys(keys, dtype):
+    # Text keys converted to a numeric or bool dtype ('4.0' and '4' become one key)
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_object_dtype(dtype):
+        return pd.Index([BOOL_TEXT.get(k, k) for k in keys])
+    return pd.Index(pd.to_numeric(pd.Index(keys, dtype=object), errors='coerce')).astype(dtype)
+
+
+class ColumnProfile:
+    def __init__(self, name):
+        self.name = name
+        self.dtype = None
+        self.count = 0
+        self.missing = 0
+        self.moments = None
+        self.sample = None
+        self.distinct = DistinctCounter()
+        self.values = HeavyHitters()
+        # Whether the keys are the text of the values (profile_csv)
+        self.text_keys = False
+
+    def _merge_dtype(self, series):
+        dtype = series.dtype
+        if self.dtype is None:
+            self.dtype = dtype
+        elif self.dtype != dtype:
+            numeric = [pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d)
+                       for d in (self.dtype, dtype)]
+            text = [d for d in (self.dtype, dtype) if _is_text(d) and d != object]
+            if all(numeric):
+                self.dtype = np.dtype('float64')
+            elif isinstance(self.dtype, pd.CategoricalDtype) and isinstance(dtype, pd.CategoricalDtype):
+                pass
+            elif text:
+                # read_csv's dtype for a column mixing numbers and text (pandas >= 3)
+                self.dtype = text[0]
+            else:
+                self.dtype = np.dtype(object)
+
+    @property
+    def key_dtype(self):
+        return self.dtype if self.text_keys else None
+
+    @property
+    def is_numeric(self):
+        return (pd.api.types.is_numeric_dtype(self.dtype)
+                and not pd.api.types.is_bool_dtype(self.dtype)
+                and not isinstance(self.dtype, pd.CategoricalDtype))
+
+    @property
+    def is_datetime(self):
+        return pd.api.types.is_datetime64_any_dtype(self.dtype)
+
+    def update(self, series, keys=None):
+        # keys: the same rows as text (profile_csv), hashed and counted instead of series
+        self._merge_dtype(series)
+        self.text_keys = keys is not None
+        present = series.dropna()
+        self.count += len(present)
+        self.missing += len(series) - len(present)
+        if not len(present):
+            return
+        keys = present if keys is None else keys[present.index]
+        self.distinct.update(keys)
+        self.values.update(keys)
+        if not (self.is_numeric or self.is_datetime):
+            return
+        if pd.api.types.is_numeric_dtype(present.dtype) and not pd.api.types.is_bool_dtype(present.dtype) \
+                or pd.api.types.is_datetime64_any_dtype(present.dtype):
+            if self.moments is None:
+                self.moments = RunningMoments()
+                self.sample = BottomKSample(seed=len(self.name))
+            if pd.api.types.is_datetime64_any_dtype(present.dtype):
+                # Nanoseconds since the epoch, whatever the column's resolution
+                numbers = present.to_numpy(dtype='datetime64[ns]').view('int64').astype('float64')
+            else:
+                numbers = present.to_numpy(dtype='float64')
+            self.moments.update(numbers)
+            self.sample.update(numbers)
+
+
+class ProfileReport:
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+        # Distinct (hash, verify hash) row pairs seen so far, plus pairs not merged in yet
+        self._seen = np.empty(0, dtype=[('h', 'u8'), ('v', 'u8')])
+        self._pending = []
+        self._pending_rows = 0
+        self._row_hll = HyperLogLog()
+        self._dup_count = 0
+        self.head = None
+
+    def update(self, chunk, keys=None):
+        # keys: the chunk as read (text) when chunk holds its parsed values
+        if self.head is None:
+            self.head = chunk.head(10)
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnProfile(col)
+            self.columns[col].update(chunk[col], None if keys is None else keys[col])
+        rows = chunk if keys is None else keys
+        hashes = _hash(rows)
+        self._row_hll.update(hashes)
+        if self._seen is not None:
+            pairs = np.empty(len(rows), dtype=self._seen.dtype)
+            pairs['h'], pairs['v'] = hashes, _hash(rows, VERIFY_HASH_KEY)
+            self._pending.append(pairs)
+            self._pending_rows += len(pairs)
+            if self._pending_rows >= max(len(self._seen), CHUNK_SIZE):
+                self._compact()
+        self.rows += len(chunk)
+
+    def _compact(self):
+        # Merge the pending pairs into the distinct set, counting repeats on the way
+        if self._seen is None or not self._pending:
+            return
+        pairs = np.concatenate([self._seen] + self._pending)
+        self._pending, self._pending_rows = [], 0
+        distinct = np.unique(pairs)
+        self._dup_count += len(pairs) - len(distinct)
+        # Past EXACT_ROWS distinct rows stop storing them; duplicates() estimates instead
+        self._seen = distinct if len(distinct) <= EXACT_ROWS else None
+
+    # --- Sections ---
+    def duplicates(self):
+        # Rows identical to an earlier row: exact while at most EXACT_ROWS distinct rows
+        # were seen, else rows minus the HyperLogLog estimate of distinct rows
+        self._compact()
+        if self._seen is None:
+            return max(self.rows - self._row_hll.estimate(), 0)
+        return self._dup_count
+
+    def duplicates_is_exact(self):
+        self._compact()
+        return self._seen is not None
+
+    def missing(self):
+        return pd.Series({c: p.missing for c, p in self.columns.items()}, dtype='int64')
+
+    def nunique(self):
+        return pd.Series({c: p.distinct.count(p.key_dtype) for c, p in self.columns.items()}, dtype='int64')
+
+    def nunique_is_exact(self):
+        return all(p.distinct.is_exact for p in self.columns.values())
+
+    def value_counts(self, col, n=None):
+        p = self.columns[col]
+        return p.values.top(n, p.key_dtype).rename('count').rename_axis(col)
+
+    def value_counts_is_exact(self, col):
+        return self.columns[col].values.is_exact
+
+    def dtypes(self):
+        return pd.Series({c: p.dtype for c, p in self.columns.items()})
+
+    def describe(self):
+        stats = {}
+        for col, p in self.columns.items():
+            row = {'count': p.count}
+            if p.is_datetime and p.moments is not None:
+                to_ts = lambda v: pd.Timestamp(int(v)) if np.isfinite(v) else pd.NaT
+                q25, q50, q75 = p.sample.quantiles([0.25, 0.5, 0.75])
+                row.update({'mean': to_ts(p.moments.mean), 'min': to_ts(p.moments.min), '25%': to_ts(q25),
+                            '50%': to_ts(q50), '75%': to_ts(q75), 'max': to_ts(p.moments.max)})
+            elif p.is_numeric and p.moments is not None:
+                q25, q50, q75 = p.sample.quantiles([0.25, 0.5, 0.75])
+                row.update({'mean': p.moments.mean, 'std': p.moments.std, 'min': p.moments.min,
+                            '25%': q25, '50%': q50, '75%': q75, 'max': p.moments.max})
+            else:
+                top = p.values.top(1, p.key_dtype)
+                row.update({'unique': p.distinct.count(p.key_dtype),
+                            'top': top.index[0] if len(top) else np.nan,
+                            'freq': int(top.iloc[0]) if len(top) else np.nan})
+            stats[col] = row
+        order = ['count', 'unique', 'top', 'freq', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        out = pd.DataFrame(stats)
+        return out.reindex([r for r in order if r in out.index])
+
+    def info_text(self):
+        lines = ["<class 'pandas.core.frame.DataFrame'>",
+                 f"RangeIndex: {self.rows} entries, 0 to {max(self.rows - 1, 0)}",
+                 f"Data columns (total {len(self.columns)} columns):",
+                 " #   Column            Non-Null Count   Dtype",
+                 "---  ------            --------------   -----"]
+        for i, (col, p) in enumerate(self.columns.items()):
+            lines.append(f" {i:<3} {col:<17} {p.count:>7} non-null   {p.dtype}")
+        counts = self.dtypes().astype(str).value_counts()
+        lines.append("dtypes: " + ", ".join(f"{k}({v})" for k, v in sorted(counts.items())))
+        return "\n".join(lines)
+
+
+def profile_chunks(chunks, transform=None, text=False):
+    # text: the chunks were read as text (dtype=str); each is parsed column by column
+    # and profiled with its text as the keys
+    report = ProfileReport()
+    for chunk in chunks:
+        chunk.columns = [str(c).strip() for c in chunk.columns]
+        if transform is not None:
+            chunk = transform(chunk)
+        if text:
+            # Columns already known to be text are not parsed again
+            typed = pd.DataFrame({col: values if col in report.columns and _is_text(report.columns[col].dtype)
+                                  else parse_text(values) for col, values in chunk.items()})
+            report.update(typed, keys=chunk)
+        else:
+            report.update(chunk)
+    return report
+
+
+def profile_csv(path, chunksize=CHUNK_SIZE, transform=None, **read_csv_kwargs):
+    # Without a transform or explicit dtype, chunks are read as text so every chunk
+    # keys its values the same way; a transform gets typed chunks as before
+    text = transform is None and 'dtype' not in read_csv_kwargs
+    if text:
+        read_csv_kwargs['dtype'] = str
+    return profile_chunks(pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs), transform, text)
+
+
+def profile_frame(df, chunksize=CHUNK_SIZE):
+    return profile_chunks((df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize)))
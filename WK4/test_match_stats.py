@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+
+import match_stats
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def matches():
+    df = pd.read_csv(os.path.join(HERE, 'ODI_Match_info.csv'))
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def same_counts(got, expected):
+    # Same counts per key; ties may come out in either order
+    assert got.sort_index().astype('int64').to_dict() == expected.sort_index().astype('int64').to_dict()
+    assert got.is_monotonic_decreasing
+
+
+def test_matches_the_value_counts_and_crosstab_it_replaced():
+    df = matches()
+    agg = match_stats.MatchAggregates()
+    assert agg.toss_wins is None and agg.season_venue is None
+    # Two ingest batches, as MatchIngestor feeds them
+    half = len(df) // 2
+    agg.add(df.iloc[:half])
+    agg.add(df.iloc[half:])
+    assert (agg.rows, agg.version) == (len(df), 2)
+
+    same_counts(agg.toss_wins, df['toss_winner'].value_counts())
+    same_counts(agg.toss_decisions, df['toss_decision'].value_counts())
+    same_counts(agg.season_matches, df['season'].value_counts())
+    expected = pd.crosstab(df['venue'], df['season'])
+    pd.testing.assert_frame_equal(agg.season_venue, expected, check_names=False, check_dtype=False)
+
+
+def test_long_tables_match_groupby():
+    df = matches()
+    stats = match_stats.MatchStats()
+    stats.add(df)
+    for name, (a, b) in match_stats.PAIR_TABLES.items():
+        expected = df.groupby([a, b]).size().reset_index(name='Matches')
+        got = stats.long_table(name, a, b)
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False, check_index_type=False)
@@ -0,0 +1,81 @@
+import os
+import shutil
+
+import pytest
+
+from odi_ingest import MatchIngestor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROW = ('9999001,2024,Indore,2024/01/05,India,Australia,Australia,field,normal,0,India,'
+       '12,0,SS Iyer,"Holkar Cricket Stadium, Indore",J Madanagopal,HDPK Dharmasena,\n')
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / 'ODI_Match_info.csv')
+    shutil.copy(os.path.join(HERE, 'ODI_Match_info.csv'), path)
+    return path
+
+
+def test_appended_rows_only(csv_path):
+    ingestor = MatchIngestor(csv_path)
+    total = len(ingestor.refresh())
+    assert len(ingestor.refresh()) == 0
+    with open(csv_path, 'a') as f:
+        f.write(ROW)
+    new = ingestor.refresh()
+    assert new['id'].tolist() == [9999001]
+    assert len(ingestor.frame) == total + 1
+    assert ingestor.aggregates.rows == total + 1
+
+
+def test_numeric_looking_season_stays_text(csv_path):
+    ingestor = MatchIngestor(csv_path)
+    ingestor.refresh()
+    with open(csv_path, 'a') as f:
+        f.write(ROW)
+    new = ingestor.refresh()
+    assert new['season'].tolist() == ['2024']
+    assert {type(v) for v in ingestor.frame['season'].dropna()} == {str}
+    seasons = ingestor.aggregates.season_matches
+    assert 2024 not in seasons.index and seasons['2024'] >= 1
+
+
+def test_append_reads_only_the_tail(csv_path, monkeypatch):
+    ingestor = MatchIngestor(csv_path)
+    ingestor.refresh()
+    with open(csv_path, 'a') as f:
+        f.write(ROW)
+    # Nothing before the boundary window is hashed again
+    monkeypatch.setattr('odi_ingest.hashlib.sha1', None)
+    assert len(ingestor.refresh()) == 1
+
+
+def test_edit_before_the_offset_rereads_the_file(csv_path):
+    ingestor = MatchIngestor(csv_path)
+    total = len(ingestor.refresh())
+    with open(csv_path, 'rb') as f:
+        data = f.read()
+    # Same length edit in the middle of the file, far from the last 256 bytes
+    middle = data.index(b'Australia', len(data) // 2)
+    with open(csv_path, 'wb') as f:
+        f.write(data[:middle] + b'Austrelia' + data[middle + len(b'Australia'):])
+    os.utime(csv_path, ns=(os.stat(csv_path).st_atime_ns, os.stat(csv_path).st_mtime_ns + 1_000_000))
+    key = ingestor.snapshot()[0]
+    rows = ingestor.refresh()
+    assert len(rows) == total
+    # Same path and offset, new content key
+    assert ingestor.snapshot()[0] != key
+    assert ingestor.frame.isin(['Austrelia']).any().any()
+    assert ingestor.aggregates.rows == total
+
+
+def test_truncated_file_is_reread(csv_path):
+    ingestor = MatchIngestor(csv_path)
+    ingestor.refresh()
+    with open(csv_path, 'rb') as f:
+        lines = f.readlines()
+    with open(csv_path, 'wb') as f:
+        f.writelines(lines[:11])
+    assert len(ingestor.refresh()) == 10
+    assert len(ingestor.frame) == 10
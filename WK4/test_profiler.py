@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import profiler
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PLAYSTORE = os.path.join(HERE, 'googleplaystore.csv')
+
+
+def assert_same_profile(chunked, whole):
+    assert chunked.rows == whole.rows
+    assert chunked.dtypes().astype(str).equals(whole.dtypes().astype(str))
+    assert chunked.missing().equals(whole.missing())
+    assert chunked.nunique().equals(whole.nunique())
+    assert chunked.duplicates() == whole.duplicates()
+    for col in whole.columns:
+        if chunked.value_counts_is_exact(col):
+            assert chunked.value_counts(col).to_dict() == whole.value_counts(col).to_dict(), col
+    a, b = chunked.describe(), whole.describe()
+    assert list(a.index) == list(b.index) and list(a.columns) == list(b.columns)
+    for col in b.columns:
+        for stat in b.index:
+            x, y = a.at[stat, col], b.at[stat, col]
+            if isinstance(y, (float, np.floating)) and not pd.isna(y):
+                assert x == pytest.approx(y, rel=1e-9), (col, stat)
+            elif stat not in ('25%', '50%', '75%'):
+                assert (pd.isna(x) and pd.isna(y)) or x == y, (col, stat)
+
+
+@pytest.mark.parametrize('chunksize', [500, 3333])
+def test_chunked_csv_matches_whole_file(chunksize):
+    df = pd.read_csv(PLAYSTORE)
+    chunked = profiler.profile_csv(PLAYSTORE, chunksize=chunksize)
+    assert_same_profile(chunked, profiler.profile_frame(df))
+    assert chunked.duplicates() == df.duplicated().sum()
+    assert chunked.nunique().equals(df.nunique())
+    # Reviews is text in the whole file (one '3.0M'): no int keys from numeric chunks
+    assert all(isinstance(k, str) for k in chunked.value_counts('Reviews').index)
+
+
+def test_mixed_chunks_take_the_whole_file_dtype(tmp_path):
+    path = tmp_path / 'mixed.csv'
+    pd.DataFrame({
+        'n': ['1', '2', '2', '4.0', '4', '', '7', '8'],
+        'mixed': ['1', '2', '2', '3', '3', 'x', '1', '1'],
+        'flag': ['True', 'False', 'True', 'True', 'False', 'True', 'True', 'True'],
+    }).to_csv(path, index=False)
+    whole = pd.read_csv(path)
+    report = profiler.profile_csv(path, chunksize=3)
+    assert report.dtypes().astype(str).to_dict() == whole.dtypes.astype(str).to_dict()
+    assert report.nunique().to_dict() == whole.nunique().to_dict()
+    for col in whole.columns:
+        assert report.value_counts(col).to_dict() == whole[col].value_counts().to_dict(), col
+    assert report.duplicates() == whole.duplicated().sum()
+
+
+def test_duplicates_switch_to_an_estimate_past_exact_rows(monkeypatch):
+    monkeypatch.setattr(profiler, 'EXACT_ROWS', 1_000)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': rng.integers(0, 20_000, 60_000), 'b': rng.integers(0, 3, 60_000)})
+    report = profiler.profile_frame(df, chunksize=5_000)
+    assert not report.duplicates_is_exact()
+    assert report._seen is None  # no per-row state kept
+    expected = df.duplicated().sum()
+    assert report.duplicates() == pytest.approx(expected, rel=0.05)
+
+
+def test_duplicates_exact_below_exact_rows():
+    df = pd.DataFrame({'a': [1, 1, 2, 2, 2, 3], 'when': pd.to_datetime(['2020-01-01'] * 3 + ['2021-01-01'] * 3)})
+    report = profiler.profile_frame(df, chunksize=2)
+    assert report.duplicates_is_exact()
+    assert report.duplicates() == df.duplicated().sum() == 2
+
+
+def test_dataset_profiles_untransformed_csv_from_the_file(monkeypatch):
+    pytest.importorskip('streamlit')
+    import eda_core
+
+    source = eda_core.DataSource(PLAYSTORE, name='Google Play Store')
+    ds = eda_core.Dataset('test:' + source.fingerprint(), source.load(), source.name, source)
+    whole = profiler.profile_frame(ds.df)
+    monkeypatch.setattr(eda_core, 'profile_frame', None)
+    assert_same_profile(ds.profile, whole)
+    # A transformed frame has no source and is profiled from memory
+    monkeypatch.undo()
+    cleaned = eda_core.Dataset('test:cleaned', ds.df.drop_duplicates(), ds.name)
+    assert cleaned.profile.rows == len(cleaned.df)
@@ -1,13 +1,15 @@
 # app.py
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from io import BytesIO
-from datetime import datetime
-from fpdf import FPDF
-from utils import load_data, filter_data, make_matches_per_year_fig, make_total_runs_hist_fig, fig_to_bytes
+from utils import (load_data, filter_data, create_summary, matches_per_year, win_by_runs_hist,
+                   make_matches_per_year_fig, make_total_runs_hist_fig, fig_to_bytes)
+from loader import dataset_key
+from figure_cache import get_cache, filter_signature
+from pdf_report import build_pdf
+from report_jobs import get_queue, DONE, FAILED
 import os
-from groq import Groq
+from llm_gateway import get_gateway
+from qa_context import get_context_index
 
 # --------------------------- #
 # Streamlit page setup
@@ -15,79 +17,20 @@ from groq import Groq
 st.set_page_config(page_title="ODI Matches PDF Report", layout="wide")
 
 # --------------------------- #
-# Helper Functions
+# Cached KPIs & Charts
 # --------------------------- #
-def create_summary(df):
-    total_matches = len(df)
-    winners = df['winner'].dropna()
-    top_team = winners.value_counts().idxmax() if len(winners) > 0 else "N/A"
-    most_player_of_match = df['player_of_match'].dropna()
-    top_player = most_player_of_match.value_counts().idxmax() if len(most_player_of_match) > 0 else "N/A"
-    avg_win_by_runs = int(df['win_by_runs'].dropna().mean()) if df['win_by_runs'].dropna().shape[0] > 0 else 0
-    avg_win_by_wickets = float(df['win_by_wickets'].dropna().mean()) if df['win_by_wickets'].dropna().shape[0] > 0 else 0.0
-
-    return {
-        "Total matches": total_matches,
-        "Top winning team": top_team,
-        "Top player (Player of match)": top_player,
-        "Average win by runs": avg_win_by_runs,
-        "Average win by wickets": round(avg_win_by_wickets, 2)
-    }
-
-# --------------------------- #
-# PDF Report Class
-# --------------------------- #
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 14)
-        self.cell(0, 10, 'ODI Matches Report', ln=True, align='C')
-        self.ln(2)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-
-# --------------------------- #
-# PDF Builder
-# --------------------------- #
-def build_pdf(title, filters_text, summary_dict_or_text, fig_bytes_list=[]):
-    pdf = PDFReport()
-    pdf.add_page()
-    pdf.set_font('Arial', 'B', 20)
-    pdf.cell(0, 20, title, ln=True, align='C')
-    pdf.set_font('Arial', '', 12)
-    pdf.ln(4)
-    pdf.cell(0, 8, f'Report Date: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', ln=True)
-    pdf.ln(4)
-    pdf.multi_cell(0, 8, f'Filters applied: {filters_text}')
-    pdf.ln(6)
-
-    pdf.set_font('Arial', 'B', 14)
-    pdf.cell(0, 8, 'Summary', ln=True)
-    pdf.ln(2)
-    pdf.set_font('Arial', '', 12)
-    if isinstance(summary_dict_or_text, dict):
-        for k, v in summary_dict_or_text.items():
-            pdf.cell(0, 8, f'{k}: {v}', ln=True)
-    else:
-        pdf.multi_cell(0, 8, summary_dict_or_text)
-    pdf.ln(4)
-
-    for b in fig_bytes_list:
-        pdf.add_page()
-        try:
-            pdf.image(b, x=15, y=30, w=180)
-        except Exception:
-            import tempfile
-            tmp = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-            tmp.write(b.getbuffer() if hasattr(b, "getbuffer") else b)
-            tmp.flush()
-            tmp.close()
-            pdf.image(tmp.name, x=15, y=30, w=180)
-
-    pdf_bytes = pdf.output(dest='S').encode('latin1')
-    return BytesIO(pdf_bytes)
+def cached_report_parts(filtered, signature):
+    # KPIs, aggregated series and PNG bytes for one filter combination.
+    # PNGs are rendered once at 150 dpi and reused for both the page and the PDF.
+    cache = get_cache(disk_dir=os.path.join('.cache', 'figures'))
+    summary = cache.get_or_compute('summary:' + signature, lambda: create_summary(filtered))
+    by_year = cache.get_or_compute('matches_per_year:' + signature, lambda: matches_per_year(filtered))
+    hist = cache.get_or_compute('win_by_runs_hist:' + signature, lambda: win_by_runs_hist(filtered))
+    png1 = cache.get_or_compute('matches_per_year_png:' + signature,
+                                lambda: fig_to_bytes(make_matches_per_year_fig(filtered, by_year)).getvalue())
+    png2 = cache.get_or_compute('win_by_runs_hist_png:' + signature,
+                                lambda: fig_to_bytes(make_total_runs_hist_fig(filtered, hist)).getvalue())
+    return summary, png1, png2
 
 # --------------------------- #
 # Main App
@@ -128,9 +71,18 @@ def main():
     st.dataframe(filtered[['date', 'team1', 'team2', 'winner', 'venue', 'player_of_match']]
                  .sort_values('date', ascending=False).reset_index(drop=True).head(200))
 
+    signature = filter_signature(
+        dataset=dataset_key('ODI_Match_info.csv'),
+        date_from=date_range[0],
+        date_to=date_range[1],
+        seasons=selected_seasons,
+        team=selected_team,
+        venue=selected_venue
+    )
+    summary, png1, png2 = cached_report_parts(filtered, signature)
+
     # KPIs
     st.subheader("Key metrics")
-    summary = create_summary(filtered)
     cols = st.columns(5)
     for i, (k, v) in enumerate(summary.items()):
         cols[i].metric(k, v)
@@ -138,10 +90,10 @@ def main():
     # Charts
     st.subheader("Charts")
     col1, col2 = st.columns(2)
-    fig1 = make_matches_per_year_fig(filtered)
-    col1.pyplot(fig1)
-    fig2 = make_total_runs_hist_fig(filtered)
-    col2.pyplot(fig2)
+    col1.image(png1, use_container_width=True)
+    col2.image(png2, use_container_width=True)
+    stats = get_cache().stats()
+    st.caption(f"Chart cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions")
 
     # --------------------------- #
     # Normal Filter PDF
@@ -151,10 +103,35 @@ def main():
     report_title = st.text_input("Report title", value="ODI Matches Report")
     filters_text = f"Date: {date_range[0]} to {date_range[1]}; Seasons: {', '.join(map(str, selected_seasons))}; Team: {selected_team}; Venue: {selected_venue}"
 
-    if st.button("Generate & Download PDF"):
-        figs_bytes = [fig_to_bytes(fig1), fig_to_bytes(fig2)]
-        pdf_file = build_pdf(report_title, filters_text, summary, figs_bytes)
-        st.download_button("📄 Download PDF", data=pdf_file, file_name="odi_matches_report.pdf", mime="application/pdf")
+    # Reports are built in a background process pool; identical requests reuse the stored PDF
+    if st.button("Generate PDF Report"):
+        spec = {
+            'csv_path': 'ODI_Match_info.csv',
+            'dataset': dataset_key('ODI_Match_info.csv'),
+            'filters': {
+                'date_from': pd.to_datetime(date_range[0]),
+                'date_to': pd.to_datetime(date_range[1]),
+                'seasons': sorted(selected_seasons),
+                'team': selected_team if selected_team != "All" else None,
+                'venue': selected_venue if selected_venue != "All" else None,
+            },
+            'filters_text': filters_text,
+            'title': report_title,
+            'figures': [png1, png2],
+        }
+        st.session_state['report_job'] = get_queue().submit(spec)
+
+    job_id = st.session_state.get('report_job')
+    job = get_queue().status(job_id) if job_id else None
+    if job:
+        if job['status'] == DONE:
+            with open(job['path'], 'rb') as f:
+                st.download_button("📄 Download PDF", data=f.read(), file_name="odi_matches_report.pdf", mime="application/pdf")
+        elif job['status'] == FAILED:
+            st.error(f"Report failed: {job['error']}")
+        else:
+            st.progress(job['progress'], text=f"Report {job['stage']}...")
+            st.button("Refresh report status")
 
     # --------------------------- #
     # AI Q&A Section with PDF
@@ -163,24 +140,18 @@ def main():
     st.subheader("🤖 Ask AI about ODI Matches")
     user_question = st.text_input("Ask any question about ODI matches or this dataset:", key="qna_input")
 
-    groq_api_key = os.getenv("GROQ_API_KEY")
-    client = Groq(api_key=groq_api_key) if groq_api_key else None
-    if not client:
+    # Pooled client + answer cache; repeated questions never reach the API
+    gateway = get_gateway()
+    if not gateway:
         st.warning("⚠️ Groq API key not found.")
 
-    if client and st.button("Ask AI Question"):
+    if gateway and st.button("Ask AI Question"):
         if user_question.strip():
             with st.spinner("Thinking..."):
-                response = client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    messages=[
-                        {"role": "system", "content": "You are a cricket data analyst. Answer based on ODI cricket facts."},
-                        {"role": "user", "content": user_question}
-                    ]
-                )
-                answer = response.choices[0].message.content
                 st.success("**AI Answer:**")
-                st.write(answer)
+                # Ground the answer in the loaded data: only the aggregates relevant to the question
+                context = get_context_index(df, dataset_key('ODI_Match_info.csv'))
+                answer = st.write_stream(gateway.stream_answer(user_question, context.system_prompt(user_question)))
 
                 # PDF download for AI answer
                 pdf_file_answer = build_pdf(
@@ -0,0 +1,127 @@
+# batch_reports.py
+# Batch PDF export: one report per team, season or venue, written into a single zip.
+# Reports are spread over a process pool; each worker loads the dataset once and
+# reuses the same two matplotlib figures for every report it renders.
+#
+# Usage:
+#   python batch_reports.py --by team
+#   python batch_reports.py --by season --out season_reports.zip --workers 4
+import os
+import re
+import time
+import hashlib
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+GROUPS = ('team', 'season', 'venue')
+
+# Per-worker state, filled by _init_worker
+_worker = {}
+
+
+def _init_worker(csv_path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from utils import load_data
+    _worker['df'] = load_data(csv_path)
+    _worker['figs'] = (plt.figure(), plt.figure())
+
+
+def group_values(df, by):
+    if by == 'team':
+        return sorted(set(df['team1'].dropna().astype(str)) | set(df['team2'].dropna().astype(str)))
+    return sorted(df[by].dropna().astype(str).unique().tolist())
+
+
+def report_filters(by, value):
+    if by == 'season':
+        return {'seasons': [value]}
+    return {by: value}
+
+
+def file_name(by, value, unique=True):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', value).strip('_') or 'unknown'
+    if not unique:
+        # Another value has the same slug ('R Premadasa' / 'R.Premadasa'): tell them apart
+        # by a short hash of the raw value, the same whatever else is exported
+        slug += '_' + hashlib.sha1(value.encode('utf-8')).hexdigest()[:6]
+    return f'{by}_{slug}.pdf'
+
+
+def file_names(by, values):
+    # value -> zip entry name, unique across values
+    plain = [file_name(by, v) for v in values]
+    counts = {}
+    for name in plain:
+        counts[name] = counts.get(name, 0) + 1
+    names = {v: name if counts[name] == 1 else file_name(by, v, unique=False) for v, name in zip(values, plain)}
+    if len(set(names.values())) != len(names):
+        raise ValueError(f'Duplicate report names for {by}')
+    return names
+
+
+def render_one(by, value, title, name=None):
+    from utils import (filter_data, create_summary, make_matches_per_year_fig,
+                       make_total_runs_hist_fig, fig_to_bytes)
+    from pdf_report import build_pdf
+
+    fig1, fig2 = _worker['figs']
+    filtered = filter_data(_worker['df'], **report_filters(by, value))
+    summary = create_summary(filtered)
+    figs = [fig_to_bytes(make_matches_per_year_fig(filtered, fig=fig1), close=False),
+            fig_to_bytes(make_total_runs_hist_fig(filtered, fig=fig2), close=False)]
+    pdf = build_pdf(f'{title} - {value}', f'{by.capitalize()}: {value}', summary, figs)
+    return name or file_name(by, value), pdf.getvalue()
+
+
+def _render_task(args):
+    return render_one(*args)
+
+
+def export_reports(csv_path, by, out_path, title='ODI Matches Report', workers=None):
+    from utils import load_data
+
+    values = group_values(load_data(csv_path), by)
+    names = file_names(by, values)
+    tasks = [(by, value, title, names[value]) for value in values]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+
+    tmp_path = out_path + '.tmp'
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(csv_path,)) as pool, \
+                zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            # Results are written as they arrive, so only a few PDFs are held in memory
+            for name, data in pool.map(_render_task, tasks, chunksize=chunksize):
+                zf.writestr(name, data)
+        with zipfile.ZipFile(tmp_path) as zf:
+            entries = zf.namelist()
+        if len(set(entries)) != len(entries):
+            raise RuntimeError(f'{tmp_path} has duplicate entries')
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return len(tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export one ODI PDF report per team, season or venue.')
+    parser.add_argument('--by', choices=GROUPS, default='team')
+    parser.add_argument('--csv', default='ODI_Match_info.csv')
+    parser.add_argument('--out', default=None, help='zip file to write (default: <by>_reports.zip)')
+    parser.add_argument('--title', default='ODI Matches Report')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: all cores)')
+    args = parser.parse_args()
+
+    out_path = args.out or f'{args.by}_reports.zip'
+    start = time.perf_counter()
+    count = export_reports(args.csv, args.by, out_path, title=args.title, workers=args.workers)
+    print(f'Wrote {count} reports to {out_path} in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
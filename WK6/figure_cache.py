@@ -0,0 +1,157 @@
+# figure_cache.py
+# Bounded LRU cache for KPIs, aggregated series and rendered chart PNGs.
+# Entries are keyed by a canonical hash of the filter parameters, so switching back
+# to a filter combination that was already shown skips both pandas and matplotlib.
+# An optional on-disk tier (pickle files) keeps entries across server restarts.
+import os
+import json
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+import pandas as pd
+
+_MISSING = object()
+
+
+def _canonical(value):
+    # Make filter values JSON-stable: dates as ISO strings, collections sorted
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=str)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return str(value)
+
+
+def filter_signature(**params):
+    # Seasons are a set as far as filtering goes, so their order must not change the key
+    if params.get('seasons') is not None:
+        params['seasons'] = set(params['seasons'])
+    payload = json.dumps(_canonical(params), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    def __init__(self, max_items=64, disk_dir=None, max_disk_items=512):
+        self.max_items = max_items
+        self.disk_dir = disk_dir
+        self.max_disk_items = max_disk_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pkl')
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return _MISSING
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except Exception:
+            # Truncated, or pickled by code that no longer matches: drop it and recompute
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return _MISSING
+
+    def _write_disk(self, key, value):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp = path + '.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            self._prune_disk()
+        except OSError:
+            pass
+
+    def _prune_disk(self):
+        files = [os.path.join(self.disk_dir, f) for f in os.listdir(self.disk_dir) if f.endswith('.pkl')]
+        if len(files) <= self.max_disk_items:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_items]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _store(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            found = self._read_disk(key)
+            if found is not _MISSING:
+                self.disk_hits += 1
+                self.hits += 1
+                self._store(key, found)
+                return found
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+            self._write_disk(key, value)
+
+    def get_or_compute(self, key, compute):
+        # None is a valid cached value (e.g. "no data for this filter")
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        return {
+            'items': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'evictions': self.evictions,
+        }
+
+
+# Shared by every session of the Streamlit process
+_default_cache = None
+
+
+def get_cache(max_items=64, disk_dir=None):
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LRUCache(max_items=max_items, disk_dir=disk_dir)
+    return _default_cache
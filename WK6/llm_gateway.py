@@ -0,0 +1,177 @@
+# llm_gateway.py
+# Gateway for the "Ask AI" section.
+# - one pooled Groq client per (api key, base url), reused across reruns and sessions
+# - persistent SQLite answer cache keyed by model + prompt + normalized question, with TTL
+# - identical questions already in flight wait for that call instead of making their own
+# - answers are streamed token by token to the UI
+# Set GROQ_BASE_URL to point the client at a local mock server for testing.
+import os
+import re
+import time
+import json
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+SYSTEM_PROMPT = "You are a cricket data analyst. Answer based on ODI cricket facts."
+CACHE_PATH = os.path.join('.cache', 'llm_cache.sqlite')
+CACHE_TTL = 7 * 24 * 3600
+
+
+def normalize_question(question):
+    # "  Who won   MOST matches?? " and "who won most matches" share a cache entry
+    question = re.sub(r'\s+', ' ', question.strip().lower())
+    return question.rstrip(' ?!.')
+
+
+def cache_key(question, model, system_prompt=SYSTEM_PROMPT):
+    payload = json.dumps([model, system_prompt, normalize_question(question)])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class AnswerCache:
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS answers ("
+                         "key TEXT PRIMARY KEY, model TEXT, question TEXT, answer TEXT, created REAL)")
+        self.purge()
+
+    def _conn(self):
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT answer, created FROM answers WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        answer, created = row
+        if time.time() - created > self.ttl:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+            return None
+        return answer
+
+    def put(self, key, model, question, answer):
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+                         (key, model, normalize_question(question), answer, time.time()))
+
+    def purge(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM answers WHERE created < ?", (time.time() - self.ttl,))
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.answer = None
+        self.error = None
+
+
+class LLMGateway:
+    def __init__(self, api_key=None, base_url=None, model=DEFAULT_MODEL, cache=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.cache = cache if cache is not None else AnswerCache()
+        self._client = None
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.upstream_calls = 0
+
+    @property
+    def client(self):
+        if self._client is None:
+            from groq import Groq
+            kwargs = {'api_key': self.api_key}
+            if self.base_url:
+                kwargs['base_url'] = self.base_url
+            self._client = Groq(**kwargs)
+        return self._client
+
+    def _messages(self, question, system_prompt):
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": question}
+        ]
+
+    def _stream_upstream(self, question, system_prompt):
+        self.upstream_calls += 1
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._messages(question, system_prompt),
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def stream_answer(self, question, system_prompt=SYSTEM_PROMPT):
+        # Yields answer text chunks: the whole cached answer at once on a hit, the
+        # upstream tokens as they arrive for the first caller of a question, and the
+        # finished answer for callers that joined a call already in flight.
+        key = cache_key(question, self.model, system_prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        with self._lock:
+            pending = self._in_flight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._in_flight[key] = _InFlight()
+
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            yield pending.answer
+            return
+
+        parts = []
+        try:
+            for token in self._stream_upstream(question, system_prompt):
+                parts.append(token)
+                yield token
+            pending.answer = ''.join(parts)
+            self.cache.put(key, self.model, question, pending.answer)
+        except BaseException as e:
+            pending.error = e if isinstance(e, Exception) else RuntimeError('request cancelled')
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            pending.done.set()
+
+    def ask(self, question, system_prompt=SYSTEM_PROMPT):
+        return ''.join(self.stream_answer(question, system_prompt))
+
+
+# Pooled gateways, one per api key / base url, shared by every session
+_gateways = {}
+_gateways_lock = threading.Lock()
+
+
+def get_gateway(api_key=None, base_url=None, model=DEFAULT_MODEL):
+    api_key = api_key or os.getenv("GROQ_API_KEY")
+    base_url = base_url or os.getenv("GROQ_BASE_URL")
+    if not api_key:
+        return None
+    with _gateways_lock:
+        key = (api_key, base_url, model)
+        if key not in _gateways:
+            _gateways[key] = LLMGateway(api_key=api_key, base_url=base_url, model=model)
+        return _gateways[key]
@@ -0,0 +1,242 @@
+# loader.py
+# Typed, cached loading of ODI_Match_info.csv.
+# The CSV is parsed once into an Arrow IPC (Feather v2) sidecar stored next to it in
+# .cache/. The sidecar is keyed by the file's mtime/size and content hash, and later
+# loads read it back (already typed, no CSV parsing or date inference) instead of
+# parsing the CSV again. When rows were only appended to the CSV (its old bytes still
+# hash the same) just the new tail is parsed.
+import os
+import json
+import hashlib
+import pandas as pd
+from io import BytesIO
+from pandas.api.types import union_categoricals, is_object_dtype, is_string_dtype
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is optional, we just parse the CSV every time
+    pa = None
+
+CACHE_DIR = '.cache'
+DATE_FORMAT = '%Y/%m/%d'
+# Bump when parse_csv changes so old sidecars are rebuilt
+SCHEMA_VERSION = 2
+
+# Team-like columns share one set of categories so they can be compared with each other
+TEAM_COLUMNS = ['team1', 'team2', 'toss_winner', 'winner']
+CATEGORY_COLUMNS = ['season', 'city', 'toss_decision', 'result', 'player_of_match',
+                    'venue', 'umpire1', 'umpire2', 'umpire3']
+INT_COLUMNS = ['id', 'dl_applied']
+NUMERIC_COLUMNS = ['win_by_runs', 'win_by_wickets']
+
+# In-process memo: path -> (sha1, DataFrame). Callers must not modify the frame in place.
+_frames = {}
+
+
+def file_hash(path, chunk_size=1 << 20, prefix_size=None):
+    # SHA-1 of the file; with prefix_size, also the SHA-1 of its first prefix_size bytes
+    # (computed in the same pass) so appends to the file can be recognized
+    h = hashlib.sha1()
+    prefix = None
+    with open(path, 'rb') as f:
+        if prefix_size is not None:
+            remaining = prefix_size
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                h.update(chunk)
+                remaining -= len(chunk)
+            prefix = h.hexdigest()
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    if prefix_size is None:
+        return h.hexdigest()
+    return h.hexdigest(), prefix
+
+
+def _sidecar_paths(path):
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return folder, os.path.join(folder, stem + '.arrow'), os.path.join(folder, stem + '.meta.json')
+
+
+def source_key(path, meta=None):
+    # Cheap check on mtime/size first; only hash the file when they changed
+    st = os.stat(path)
+    if (meta and meta.get('version') == SCHEMA_VERSION
+            and meta.get('mtime_ns') == st.st_mtime_ns and meta.get('size') == st.st_size):
+        return meta
+    key = {'version': SCHEMA_VERSION, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+    if meta and meta.get('version') == SCHEMA_VERSION and meta.get('size', 0) < st.st_size:
+        key['sha1'], prefix = file_hash(path, prefix_size=meta['size'])
+        if prefix == meta.get('sha1'):
+            # Old content unchanged, rows were only appended after this offset
+            key['appended_at'] = meta['size']
+    else:
+        key['sha1'] = file_hash(path)
+    return key
+
+
+def parse_csv(path):
+    return apply_types(pd.read_csv(path))
+
+
+def apply_types(df):
+    # Normalize column names
+    df.columns = [c.strip() for c in df.columns]
+    # Parse date with a fixed format, falling back to guessing for other layouts
+    if 'date' in df.columns:
+        dates = pd.to_datetime(df['date'], format=DATE_FORMAT, errors='coerce')
+        if dates.isna().sum() > df['date'].isna().sum():
+            dates = pd.to_datetime(df['date'], dayfirst=True, errors='coerce', format='mixed')
+        df['date'] = dates.astype('datetime64[ns]')
+        # Store matches in date order so date ranges are contiguous slices (see match_index.py)
+        df = df.sort_values('date', kind='stable', na_position='last').reset_index(drop=True)
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in INT_COLUMNS:
+        if col in df.columns and df[col].notna().all():
+            df[col] = df[col].astype('int64')
+    teams = [c for c in TEAM_COLUMNS if c in df.columns]
+    if teams:
+        categories = sorted(pd.unique(df[teams].stack().dropna().astype(str)))
+        for col in teams:
+            df[col] = pd.Categorical(df[col], categories=categories)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_appended(path, offset, like=None):
+    # Parse only the rows after byte offset, reusing the header line. With `like` (the
+    # frame being extended), columns it holds as text categories are read as text, so
+    # a tail of numeric-looking seasons is not inferred as numbers.
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(offset)
+        data = f.read()
+    dtype = None
+    if like is not None:
+        dtype = {col: str for col in like.columns
+                 if isinstance(like[col].dtype, pd.CategoricalDtype) and _is_text(like[col].cat.categories.dtype)}
+    return apply_types(pd.read_csv(BytesIO(header + data), dtype=dtype))
+
+
+def _is_text(dtype):
+    return is_object_dtype(dtype) or is_string_dtype(dtype)
+
+
+def _extend_categorical(old, values):
+    # old (categorical) followed by values, keeping old's category dtype. The new rows
+    # may have been inferred differently (an all-blank umpire3 reads as float), so only
+    # their non-null values are converted to that dtype and added as categories.
+    categories = old.cat.categories
+    present = values.dropna()
+    present = present.astype(str) if _is_text(categories.dtype) else present.astype(categories.dtype)
+    added = [v for v in pd.unique(present) if v not in categories]
+    old = old.cat.add_categories(added) if added else old
+    new = pd.Categorical(present.reindex(values.index), categories=old.cat.categories)
+    return union_categoricals([old, new])
+
+
+def append_rows(df, new):
+    # Old frame + typed new rows, skipping ids already present, kept in date order
+    if 'id' in df.columns and 'id' in new.columns:
+        new = new[~new['id'].isin(df['id'])]
+    if not len(new):
+        return df
+    columns = {}
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and col in new.columns:
+            columns[col] = _extend_categorical(df[col], new[col])
+        else:
+            columns[col] = pd.concat([df[col], new[col]], ignore_index=True)
+    out = pd.DataFrame(columns)
+    teams = [c for c in TEAM_COLUMNS if c in out.columns]
+    if teams:
+        # Team columns share one category list again
+        categories = sorted(set().union(*(out[c].cat.categories for c in teams)))
+        for col in teams:
+            out[col] = out[col].cat.set_categories(categories)
+    if 'date' in out.columns and not (new['date'].min() >= df['date'].max()):
+        out = out.sort_values('date', kind='stable', na_position='last').reset_index(drop=True)
+    return out
+
+
+def _write_sidecar(folder, arrow_path, meta_path, df, key):
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tmp = arrow_path + '.tmp'
+        # Uncompressed, so loading it back needs no decompression
+        feather.write_feather(df, tmp, compression='uncompressed')
+        os.replace(tmp, arrow_path)
+        _write_meta(meta_path, key)
+    except OSError:
+        # Read-only location: keep working from the parsed frame
+        pass
+
+
+def load_frame(path, use_cache=True):
+    if pa is None or not use_cache:
+        return parse_csv(path)
+
+    folder, arrow_path, meta_path = _sidecar_paths(path)
+    meta = _read_meta(meta_path)
+    key = source_key(path, meta)
+    sha1 = key['sha1']
+
+    cached = _frames.get(path)
+    if cached and cached[0] == sha1:
+        return cached[1]
+
+    usable = meta and meta.get('version') == SCHEMA_VERSION and os.path.exists(arrow_path)
+    if usable and meta.get('sha1') == sha1:
+        # Same content: read the sidecar back
+        df = feather.read_feather(arrow_path)
+        if key is not meta:
+            # Touched but unchanged, refresh the stored mtime so the next check is cheap
+            try:
+                _write_meta(meta_path, key)
+            except OSError:
+                # Read-only location: the content hash is simply checked again next time
+                pass
+    elif usable and 'appended_at' in key:
+        # Rows appended to the CSV: parse only the tail and extend the sidecar
+        old = feather.read_feather(arrow_path)
+        df = append_rows(old, read_appended(path, key.pop('appended_at'), like=old))
+        _write_sidecar(folder, arrow_path, meta_path, df, key)
+    else:
+        key.pop('appended_at', None)
+        df = parse_csv(path)
+        _write_sidecar(folder, arrow_path, meta_path, df, key)
+
+    _frames[path] = (sha1, df)
+    return df
+
+
+def dataset_key(path):
+    # Content hash of the CSV, used to key anything derived from it
+    cached = _frames.get(path)
+    if cached:
+        return cached[0]
+    folder, arrow_path, meta_path = _sidecar_paths(path)
+    return source_key(path, _read_meta(meta_path))['sha1']
+
+
+def _write_meta(meta_path, key):
+    tmp = meta_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(key, f)
+    os.replace(tmp, meta_path)
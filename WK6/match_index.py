@@ -0,0 +1,142 @@
+# match_index.py
+# Precomputed filter index for the ODI matches frame.
+# The frame is sorted by date once so a date range is a searchsorted slice, and
+# every season, team (team1 or team2) and venue gets a packed row bitset. A filter
+# ANDs the bitsets over the date slice and takes the rows once at the end.
+import numpy as np
+import pandas as pd
+
+# id(frame) -> MatchIndex, for frames returned by load_data
+_indexes = {}
+MAX_INDEXES = 4
+
+
+def _codes_and_labels(series):
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    return series.cat.codes.to_numpy(), list(series.cat.categories)
+
+
+def _bitsets(codes, labels):
+    # One packed bitset (n_rows / 8 bytes) per label
+    out = {}
+    for code, label in enumerate(labels):
+        out[label] = np.packbits(codes == code)
+    return out
+
+
+def _is_date_sorted(dates):
+    n_dated = int(dates.notna().sum())
+    return dates.iloc[:n_dated].is_monotonic_increasing and dates.iloc[n_dated:].isna().all()
+
+
+class MatchIndex:
+    def __init__(self, df):
+        # The frame the index was built from; self.df is the date-sorted frame it serves
+        self.source = df
+        if 'date' in df.columns and not _is_date_sorted(df['date']):
+            # Stable sort so equal dates keep file order; NaT goes last
+            df = df.sort_values('date', kind='stable', na_position='last').reset_index(drop=True)
+        if 'date' in df.columns:
+            self.dates = df['date'].to_numpy(dtype='datetime64[ns]')
+            self.n_dated = int(len(df) - np.isnat(self.dates).sum())
+        else:
+            self.dates = None
+            self.n_dated = 0
+        self.df = df
+        self.n_rows = len(df)
+
+        self.seasons = {}
+        if 'season' in df.columns:
+            codes, labels = _codes_and_labels(df['season'])
+            self.seasons = _bitsets(codes, labels)
+
+        self.teams = {}
+        team_cols = [c for c in ('team1', 'team2') if c in df.columns]
+        if team_cols:
+            labels = sorted(set().union(*(df[c].dropna().astype(str).unique() for c in team_cols)))
+            for label in labels:
+                mask = np.zeros(self.n_rows, dtype=bool)
+                for c in team_cols:
+                    mask |= (df[c] == label).to_numpy(dtype=bool, na_value=False)
+                self.teams[label] = np.packbits(mask)
+
+        self.venues = {}
+        if 'venue' in df.columns:
+            codes, labels = _codes_and_labels(df['venue'])
+            self.venues = _bitsets(codes, labels)
+
+    def date_slice(self, date_from=None, date_to=None):
+        if self.dates is None or (date_from is None and date_to is None):
+            return 0, self.n_rows
+        dated = self.dates[:self.n_dated]
+        lo, hi = 0, self.n_dated
+        if date_from is not None:
+            lo = int(np.searchsorted(dated, np.datetime64(pd.to_datetime(date_from), 'ns'), side='left'))
+        if date_to is not None:
+            hi = int(np.searchsorted(dated, np.datetime64(pd.to_datetime(date_to), 'ns'), side='right'))
+        return lo, max(lo, hi)
+
+    def _any_of(self, table, keys, b0, b1):
+        # OR of the bitsets for keys over bytes [b0, b1). Selecting every key is not
+        # a no-op: rows with a missing value are in none of the bitsets (as with isin)
+        keys = [k for k in keys if k in table]
+        if not keys:
+            return np.zeros(b1 - b0, dtype=np.uint8)
+        out = table[keys[0]][b0:b1].copy()
+        for k in keys[1:]:
+            np.bitwise_or(out, table[k][b0:b1], out=out)
+        return out
+
+    def positions(self, date_from=None, date_to=None, seasons=None, team=None, venue=None):
+        # Returns either a (lo, hi) slice or an array of row positions
+        lo, hi = self.date_slice(date_from, date_to)
+        if lo >= hi:
+            return np.empty(0, dtype=np.intp)
+
+        b0, b1 = lo // 8, (hi + 7) // 8
+        bits = None
+        parts = []
+        if seasons:
+            parts.append(self._any_of(self.seasons, list(seasons), b0, b1))
+        if team:
+            parts.append(self._any_of(self.teams, [team], b0, b1))
+        if venue:
+            parts.append(self._any_of(self.venues, [venue], b0, b1))
+        for part in parts:
+            if bits is None:
+                bits = part
+            else:
+                np.bitwise_and(bits, part, out=bits)
+
+        if bits is None:
+            return lo, hi
+        mask = np.unpackbits(bits, count=(b1 - b0) * 8).view(bool)
+        mask = mask[lo - b0 * 8:hi - b0 * 8]
+        return np.flatnonzero(mask) + lo
+
+    def filter(self, date_from=None, date_to=None, seasons=None, team=None, venue=None):
+        pos = self.positions(date_from, date_to, seasons, team, venue)
+        if isinstance(pos, tuple):
+            # Only a date range: a plain slice of the sorted frame
+            return self.df.iloc[pos[0]:pos[1]]
+        return self.df.take(pos)
+
+
+def build_index(df):
+    index = MatchIndex(df)
+    if len(_indexes) >= MAX_INDEXES:
+        _indexes.pop(next(iter(_indexes)))
+    _indexes[id(index.source)] = index
+    return index
+
+
+def get_index(df):
+    # Works for both the frame passed to build_index and the sorted frame it serves
+    index = _indexes.get(id(df))
+    if index is None or index.source is not df:
+        for candidate in _indexes.values():
+            if candidate.df is df:
+                return candidate
+        index = build_index(df)
+    return index
@@ -0,0 +1,104 @@
+# pdf_report.py
+# PDF building for the ODI report. Lives outside app.py so background workers
+# (report_jobs.py, batch_reports.py) can build reports without importing Streamlit.
+import os
+import tempfile
+from io import BytesIO
+from datetime import datetime
+from fpdf import FPDF
+from PIL import Image
+
+# Characters of the (latin-1) PDF buffer encoded per write
+WRITE_CHUNK = 1 << 20
+
+# --------------------------- #
+# PDF Report Class
+# --------------------------- #
+class PDFReport(FPDF):
+    def header(self):
+        self.set_font('Arial', 'B', 14)
+        self.cell(0, 10, 'ODI Matches Report', ln=True, align='C')
+        self.ln(2)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
+
+# --------------------------- #
+# PDF Builder
+# --------------------------- #
+def _figure_bytes(b):
+    if hasattr(b, 'getbuffer'):
+        return b.getbuffer()
+    if hasattr(b, 'read'):
+        return b.read()
+    return b
+
+def _write_rgb_png(b, path):
+    # matplotlib writes RGBA PNGs, and FPDF 1.7 splits the alpha channel with a
+    # per-pixel regex (seconds per chart). Flatten to RGB first.
+    image = Image.open(BytesIO(_figure_bytes(b)))
+    if image.mode != 'RGB':
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+        image = background
+    image.save(path, format='PNG', compress_level=1)
+
+def render_pdf(title, filters_text, summary_dict_or_text, fig_bytes_list=None):
+    pdf = PDFReport()
+    pdf.add_page()
+    pdf.set_font('Arial', 'B', 20)
+    pdf.cell(0, 20, title, ln=True, align='C')
+    pdf.set_font('Arial', '', 12)
+    pdf.ln(4)
+    pdf.cell(0, 8, f'Report Date: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', ln=True)
+    pdf.ln(4)
+    pdf.multi_cell(0, 8, f'Filters applied: {filters_text}')
+    pdf.ln(6)
+
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 8, 'Summary', ln=True)
+    pdf.ln(2)
+    pdf.set_font('Arial', '', 12)
+    if isinstance(summary_dict_or_text, dict):
+        for k, v in summary_dict_or_text.items():
+            pdf.cell(0, 8, f'{k}: {v}', ln=True)
+    else:
+        pdf.multi_cell(0, 8, summary_dict_or_text)
+    pdf.ln(4)
+
+    if fig_bytes_list:
+        # FPDF 1.7 only reads images from paths. The PNG is parsed inside
+        # pdf.image, so each temp file can go as soon as that call returns.
+        with tempfile.TemporaryDirectory(prefix='odi_report_') as tmp_dir:
+            for i, b in enumerate(fig_bytes_list):
+                pdf.add_page()
+                if isinstance(b, str):
+                    pdf.image(b, x=15, y=30, w=180)
+                    continue
+                tmp_path = os.path.join(tmp_dir, f'figure_{i}.png')
+                _write_rgb_png(b, tmp_path)
+                pdf.image(tmp_path, x=15, y=30, w=180)
+                os.remove(tmp_path)
+    pdf.close()
+    return pdf
+
+def write_pdf(pdf, fh):
+    # Stream the latin-1 buffer in chunks instead of encoding the whole document at once
+    buffer = pdf.buffer
+    for start in range(0, len(buffer), WRITE_CHUNK):
+        fh.write(buffer[start:start + WRITE_CHUNK].encode('latin1'))
+
+def build_pdf(title, filters_text, summary_dict_or_text, fig_bytes_list=None):
+    pdf = render_pdf(title, filters_text, summary_dict_or_text, fig_bytes_list)
+    out = BytesIO()
+    write_pdf(pdf, out)
+    out.seek(0)
+    return out
+
+def build_pdf_file(path, title, filters_text, summary_dict_or_text, fig_bytes_list=None):
+    pdf = render_pdf(title, filters_text, summary_dict_or_text, fig_bytes_list)
+    with open(path, 'wb') as f:
+        write_pdf(pdf, f)
+    return path
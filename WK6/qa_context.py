@@ -0,0 +1,226 @@
+# qa_context.py
+# Precomputed aggregate index used to ground the "Ask AI" answers in the loaded data.
+# Per-team, per-season, per-venue and per-player aggregates are kept as counters and
+# rendered to short text snippets. For each question only the snippets whose names
+# match the question's keywords go into the prompt, instead of a full-table dump.
+# The index is persisted in .cache/ and updated incrementally. Each indexed match is
+# remembered by id with a hash of its row: when the CSV changes and every indexed
+# match is still there unchanged (a pure append), only the new ids are added;
+# if a match was edited in place or removed, the index is rebuilt.
+import os
+import re
+import pickle
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from llm_gateway import SYSTEM_PROMPT
+
+INDEX_PATH = os.path.join('.cache', 'qa_context.pkl')
+MAX_SNIPPETS = 8
+MAX_CONTEXT_CHARS = 2000
+STOP_WORDS = {'the', 'and', 'for', 'who', 'what', 'which', 'how', 'many', 'most', 'much', 'did',
+              'does', 'has', 'have', 'was', 'were', 'are', 'with', 'from', 'that', 'this', 'odi',
+              'odis', 'match', 'matches', 'team', 'teams', 'won', 'win', 'wins', 'player', 'venue',
+              'season', 'when', 'where', 'against', 'between', 'cricket', 'best', 'top', 'all',
+              'at', 'in', 'on', 'of', 'to', 'is', 'do', 'vs', 'by', 'it', 'as', 'an', 'be', 'me',
+              'my', 'we', 'us', 'or', 'if', 'so', 'no', 'up', 'about', 'there', 'their', 'they'}
+
+
+def tokenize(text):
+    return [t for t in re.findall(r'[a-z0-9]+', str(text).lower()) if len(t) > 1]
+
+
+def _entity(kind):
+    if kind == 'team':
+        return {'matches': 0, 'wins': 0, 'toss_wins': 0, 'venues': Counter(), 'players': Counter()}
+    if kind == 'season':
+        return {'matches': 0, 'winners': Counter(), 'players': Counter()}
+    if kind == 'venue':
+        return {'matches': 0, 'winners': Counter(), 'city': None}
+    return {'awards': 0, 'seasons': Counter()}
+
+
+def _row_hashes(df):
+    # id -> hash of the whole row (column order independent)
+    hashes = pd.util.hash_pandas_object(df[sorted(df.columns)], index=False)
+    return dict(zip(df['id'].tolist(), hashes.tolist()))
+
+
+def _top(counter, n=3):
+    return ', '.join(f'{k} ({v})' for k, v in counter.most_common(n)) or 'n/a'
+
+
+class ContextIndex:
+    def __init__(self):
+        self.dataset = None
+        self.row_hashes = {}  # indexed match id -> row hash
+        self.stats = {kind: defaultdict(lambda kind=kind: _entity(kind))
+                      for kind in ('team', 'season', 'venue', 'player')}
+        self.total = 0
+        self._postings = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_postings'] = None
+        state['stats'] = {kind: dict(table) for kind, table in self.stats.items()}
+        return state
+
+    def __setstate__(self, state):
+        stats = state.pop('stats')
+        if 'row_hashes' not in state:
+            # Saved before rows were hashed: rebuilt on the next update
+            state['row_hashes'] = None
+            state.pop('ids', None)
+        self.__dict__.update(state)
+        self.stats = {kind: defaultdict(lambda kind=kind: _entity(kind), table)
+                      for kind, table in stats.items()}
+
+    def update(self, df, dataset=None):
+        # Add matches not seen yet; rebuild if an indexed match was edited or removed
+        hashes = _row_hashes(df)
+        old = self.row_hashes
+        if old is None or any(hashes.get(i) != h for i, h in old.items()):
+            self.__init__()
+        new = df[~df['id'].isin(self.row_hashes.keys())]
+        if len(new):
+            self._add(new)
+            self.row_hashes.update((i, hashes[i]) for i in new['id'].tolist())
+            self._postings = None
+        self.dataset = dataset
+        return len(new)
+
+    def _add(self, rows):
+        teams, seasons = self.stats['team'], self.stats['season']
+        venues, players = self.stats['venue'], self.stats['player']
+        self.total += len(rows)
+        for col in ('team1', 'team2'):
+            for team, n in rows[col].dropna().astype(str).value_counts().items():
+                teams[team]['matches'] += n
+        for (team, venue), n in rows.groupby(['team1', 'venue'], observed=True).size().items():
+            teams[str(team)]['venues'][str(venue)] += n
+        for (team, venue), n in rows.groupby(['team2', 'venue'], observed=True).size().items():
+            teams[str(team)]['venues'][str(venue)] += n
+        for team, n in rows['winner'].dropna().astype(str).value_counts().items():
+            teams[team]['wins'] += n
+        for team, n in rows['toss_winner'].dropna().astype(str).value_counts().items():
+            teams[team]['toss_wins'] += n
+        for (team, player), n in rows.groupby(['winner', 'player_of_match'], observed=True).size().items():
+            teams[str(team)]['players'][str(player)] += n
+
+        for season, n in rows['season'].dropna().astype(str).value_counts().items():
+            seasons[season]['matches'] += n
+        for (season, team), n in rows.groupby(['season', 'winner'], observed=True).size().items():
+            seasons[str(season)]['winners'][str(team)] += n
+        for (season, player), n in rows.groupby(['season', 'player_of_match'], observed=True).size().items():
+            seasons[str(season)]['players'][str(player)] += n
+
+        for venue, n in rows['venue'].dropna().astype(str).value_counts().items():
+            venues[venue]['matches'] += n
+        for (venue, team), n in rows.groupby(['venue', 'winner'], observed=True).size().items():
+            venues[str(venue)]['winners'][str(team)] += n
+        for venue, city in rows[['venue', 'city']].dropna().drop_duplicates('venue').itertuples(index=False):
+            venues[str(venue)]['city'] = str(city)
+
+        for player, n in rows['player_of_match'].dropna().astype(str).value_counts().items():
+            players[player]['awards'] += n
+        for (player, season), n in rows.groupby(['player_of_match', 'season'], observed=True).size().items():
+            players[str(player)]['seasons'][str(season)] += n
+
+    def snippet(self, kind, name):
+        s = self.stats[kind][name]
+        if kind == 'team':
+            pct = 100.0 * s['wins'] / s['matches'] if s['matches'] else 0.0
+            return (f"Team {name}: {s['matches']} matches, {s['wins']} wins ({pct:.1f}%), "
+                    f"{s['toss_wins']} toss wins; most played at {_top(s['venues'])}; "
+                    f"top players of the match in wins: {_top(s['players'])}.")
+        if kind == 'season':
+            return (f"Season {name}: {s['matches']} matches; most wins: {_top(s['winners'])}; "
+                    f"most player-of-match awards: {_top(s['players'])}.")
+        if kind == 'venue':
+            city = f" ({s['city']})" if s['city'] else ''
+            return f"Venue {name}{city}: {s['matches']} matches; most wins: {_top(s['winners'])}."
+        return (f"Player {name}: {s['awards']} player-of-the-match awards; "
+                f"by season: {_top(s['seasons'], 5)}.")
+
+    def overview(self):
+        teams = Counter({k: v['wins'] for k, v in self.stats['team'].items()})
+        return (f"Dataset: {self.total} ODI matches, seasons {min(self.stats['season'], default='n/a')} "
+                f"to {max(self.stats['season'], default='n/a')}; most wins: {_top(teams, 5)}.")
+
+    def postings(self):
+        # Inverted index: name token -> entities whose name contains it
+        if self._postings is None:
+            self._postings = defaultdict(list)
+            for kind, table in self.stats.items():
+                for name in table:
+                    tokens = set(tokenize(name)) - STOP_WORDS
+                    for token in tokens:
+                        self._postings[token].append((kind, name, len(tokens)))
+        return self._postings
+
+    def search(self, question, limit=MAX_SNIPPETS):
+        # Score entities by the share of their name tokens found in the question
+        words = set(tokenize(question)) - STOP_WORDS
+        overlap = Counter()
+        sizes = {}
+        postings = self.postings()
+        for word in words:
+            for kind, name, size in postings.get(word, ()):
+                overlap[(kind, name)] += 1
+                sizes[(kind, name)] = size
+        hits = [(n / sizes[key], n, key[0], key[1]) for key, n in overlap.items()]
+        hits.sort(key=lambda h: (-h[0], -h[1], h[2], h[3]))
+        return [(kind, name) for score, _, kind, name in hits[:limit] if score >= 0.5]
+
+    def context_for(self, question, max_chars=MAX_CONTEXT_CHARS):
+        lines = [self.overview()]
+        size = len(lines[0])
+        for kind, name in self.search(question):
+            line = self.snippet(kind, name)
+            if size + len(line) > max_chars:
+                break
+            lines.append(line)
+            size += len(line)
+        return '\n'.join(lines)
+
+    def system_prompt(self, question):
+        return (SYSTEM_PROMPT + " Use these statistics from the loaded ODI dataset where relevant:\n"
+                + self.context_for(question))
+
+
+def load_index(path=INDEX_PATH):
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return ContextIndex()
+
+
+def save_index(index, path=INDEX_PATH):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+# In-process copy, refreshed when the dataset hash changes
+_index = None
+
+
+def get_context_index(df, dataset, path=INDEX_PATH):
+    global _index
+    if _index is not None and _index.dataset == dataset:
+        return _index
+    index = _index or load_index(path)
+    if index.dataset != dataset:
+        index.update(df, dataset)
+        try:
+            save_index(index, path)
+        except OSError:
+            pass
+    _index = index
+    return index
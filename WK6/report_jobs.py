@@ -0,0 +1,213 @@
+# report_jobs.py
+# Background PDF report generation.
+# Reports are rendered and assembled in a process pool so the Streamlit script
+# thread never blocks on matplotlib/FPDF. Every job gets an id and a progress
+# status, and finished PDFs are kept in a content-addressed store: a request that
+# matches one already built (same data, filters and title) returns that file.
+# Both are bounded: finished jobs are forgotten after JOB_TTL seconds or beyond
+# MAX_JOBS, and only the MAX_STORED_REPORTS most recently used PDFs are kept.
+import os
+import glob
+import time
+import uuid
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from figure_cache import filter_signature
+
+STORE_DIR = os.path.join('.cache', 'reports')
+MAX_JOBS = 256
+JOB_TTL = 3600
+MAX_STORED_REPORTS = 200
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def render_report(spec, out_path, progress=None, job_id=None):
+    # Runs in a worker process: load, filter, summarize, draw and write the PDF.
+    import matplotlib
+    matplotlib.use('Agg')
+    from utils import (load_data, filter_data, create_summary,
+                       make_matches_per_year_fig, make_total_runs_hist_fig, fig_to_bytes)
+    from pdf_report import build_pdf_file
+
+    def report(stage, fraction):
+        if progress is not None and job_id is not None:
+            progress[job_id] = (stage, fraction)
+
+    report('loading data', 0.1)
+    df = load_data(spec['csv_path'])
+    filtered = filter_data(df, **spec['filters'])
+
+    report('summarizing', 0.3)
+    summary = create_summary(filtered)
+
+    report('rendering charts', 0.5)
+    # PNGs already rendered by the page (figure_cache) are reused as-is
+    figs = spec.get('figures') or [fig_to_bytes(make_matches_per_year_fig(filtered)),
+                                   fig_to_bytes(make_total_runs_hist_fig(filtered))]
+
+    report('writing PDF', 0.8)
+    tmp_path = out_path + f'.{uuid.uuid4().hex}.tmp'
+    try:
+        build_pdf_file(tmp_path, spec['title'], spec['filters_text'], summary, figs)
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    report('done', 1.0)
+    return out_path
+
+
+class Job:
+    def __init__(self, job_id, key, path):
+        self.id = job_id
+        self.key = key
+        self.path = path
+        self.status = QUEUED
+        self.stage = 'queued'
+        self.progress = 0.0
+        self.error = None
+        self.future = None
+        self.finished_at = None
+
+
+class ReportQueue:
+    def __init__(self, store_dir=STORE_DIR, max_workers=None, max_jobs=MAX_JOBS, job_ttl=JOB_TTL,
+                 max_stored=MAX_STORED_REPORTS):
+        self.store_dir = store_dir
+        self.max_jobs = max_jobs
+        self.job_ttl = job_ttl
+        self.max_stored = max_stored
+        os.makedirs(store_dir, exist_ok=True)
+        # Temp files left behind by a crashed worker
+        for stale in glob.glob(os.path.join(store_dir, '*.tmp')):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        # spawn: forking a multi-threaded Streamlit server is not safe
+        ctx = multiprocessing.get_context('spawn')
+        self._manager = ctx.Manager()
+        self._progress = self._manager.dict()
+        self._pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx)
+        self._jobs = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def request_key(self, spec):
+        return filter_signature(dataset=spec['dataset'], title=spec['title'],
+                                filters_text=spec['filters_text'], **spec['filters'])
+
+    def submit(self, spec):
+        # spec: csv_path, dataset (content hash), filters, filters_text, title and
+        # optionally figures (PNG bytes)
+        key = self.request_key(spec)
+        path = os.path.join(self.store_dir, key + '.pdf')
+        with self._lock:
+            self._evict_jobs()
+            if key in self._in_flight:
+                # Identical request already being built: share its job
+                return self._in_flight[key]
+            job = Job(uuid.uuid4().hex, key, path)
+            self._jobs[job.id] = job
+            if os.path.exists(path):
+                job.status, job.stage, job.progress = DONE, 'cached', 1.0
+                job.finished_at = time.monotonic()
+                try:
+                    os.utime(path)  # most recently used, for _prune_store
+                except OSError:
+                    pass
+                return job.id
+            self._in_flight[key] = job.id
+            job.future = self._pool.submit(render_report, spec, path, self._progress, job.id)
+        # Outside the lock: a future that is already done runs the callback right here,
+        # and _finish takes the lock itself
+        job.future.add_done_callback(lambda f, job=job: self._finish(job, f))
+        return job.id
+
+    def _evict_jobs(self):
+        # Forget finished jobs past their TTL, then the oldest finished ones beyond
+        # max_jobs. Queued and running jobs are always kept. Caller holds the lock.
+        now = time.monotonic()
+        finished = [job for job in self._jobs.values() if job.finished_at is not None]
+        for job in finished:
+            if now - job.finished_at > self.job_ttl:
+                del self._jobs[job.id]
+        excess = len(self._jobs) - self.max_jobs
+        for job in sorted((j for j in self._jobs.values() if j.finished_at is not None),
+                          key=lambda j: j.finished_at)[:max(excess, 0)]:
+            del self._jobs[job.id]
+
+    def _prune_store(self):
+        # Keep the max_stored most recently used PDFs
+        with self._lock:
+            building = {os.path.join(self.store_dir, key + '.pdf') for key in self._in_flight}
+        files = []
+        for path in glob.glob(os.path.join(self.store_dir, '*.pdf')):
+            try:
+                files.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        files.sort(reverse=True)
+        for _, path in files[self.max_stored:]:
+            if path not in building:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _finish(self, job, future):
+        with self._lock:
+            self._in_flight.pop(job.key, None)
+            error = future.exception()
+            if error is not None:
+                job.status, job.stage, job.error = FAILED, 'failed', str(error)
+            else:
+                job.status, job.stage, job.progress = DONE, 'done', 1.0
+            job.finished_at = time.monotonic()
+            self._progress.pop(job.id, None)
+        self._prune_store()
+
+    def status(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return self._status(job)
+
+    def _status(self, job):
+        if job.status == QUEUED and job.future is not None and job.future.running():
+            job.status = RUNNING
+        if job.status in (QUEUED, RUNNING):
+            stage = self._progress.get(job.id)
+            if stage is not None:
+                job.status = RUNNING
+                job.stage, job.progress = stage
+        if job.status == DONE and not os.path.exists(job.path):
+            # Pruned from the store since it finished
+            job.status, job.stage, job.error = FAILED, 'expired', 'Report expired, please generate it again'
+        return {'id': job.id, 'status': job.status, 'stage': job.stage,
+                'progress': job.progress, 'path': job.path if job.status == DONE else None,
+                'error': job.error}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+        self._manager.shutdown()
+
+
+# One queue per Streamlit server process
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue(max_workers=None):
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ReportQueue(max_workers=max_workers)
+    return _queue
@@ -0,0 +1,38 @@
+import os
+import zipfile
+
+import pandas as pd
+
+import batch_reports
+from utils import load_data
+
+CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ODI_Match_info.csv')
+
+
+def test_file_names_are_unique_for_every_group():
+    df = load_data(CSV)
+    for by in batch_reports.GROUPS:
+        values = batch_reports.group_values(df, by)
+        names = batch_reports.file_names(by, values)
+        assert len(set(names.values())) == len(values), by
+
+
+def test_colliding_slugs_get_a_stable_suffix():
+    names = batch_reports.file_names('venue', ['R Premadasa Stadium', 'R.Premadasa Stadium', 'Eden Gardens'])
+    assert names['Eden Gardens'] == 'venue_Eden_Gardens.pdf'
+    assert names['R Premadasa Stadium'] != names['R.Premadasa Stadium']
+    # Independent of the other values exported with it
+    again = batch_reports.file_names('venue', ['R.Premadasa Stadium', 'R Premadasa Stadium'])
+    assert again['R.Premadasa Stadium'] == names['R.Premadasa Stadium']
+
+
+def test_export_zip_has_no_duplicate_entries(tmp_path):
+    df = pd.read_csv(CSV)
+    venues = ['M Chinnaswamy Stadium', 'M.Chinnaswamy Stadium', 'R Premadasa Stadium', 'R.Premadasa Stadium']
+    csv_path = tmp_path / 'matches.csv'
+    df[df['venue'].isin(venues)].to_csv(csv_path, index=False)
+    out = tmp_path / 'venues.zip'
+    count = batch_reports.export_reports(str(csv_path), 'venue', str(out), workers=1)
+    with zipfile.ZipFile(out) as zf:
+        entries = zf.namelist()
+    assert count == len(entries) == len(set(entries)) == 4
@@ -0,0 +1,34 @@
+import os
+import pickle
+
+import pytest
+
+from figure_cache import LRUCache
+
+
+class Gone:
+    pass
+
+
+@pytest.mark.parametrize('payload', [
+    b'\x80\x05\x95',
+    pickle.dumps(Gone()).replace(b'Gone', b'Lost'),
+], ids=['truncated', 'class-removed'])
+def test_bad_disk_entry_is_dropped_and_recomputed(tmp_path, payload):
+    cache = LRUCache(disk_dir=str(tmp_path))
+    path = cache._disk_path('k')
+    with open(path, 'wb') as f:
+        f.write(payload)
+    assert cache.get_or_compute('k', lambda: 42) == 42
+    assert cache.stats()['misses'] == 1
+    # Rewritten with the recomputed value
+    with open(path, 'rb') as f:
+        assert pickle.load(f) == 42
+
+
+def test_disk_entry_survives_a_new_cache(tmp_path):
+    LRUCache(disk_dir=str(tmp_path)).put('k', [1, 2])
+    cache = LRUCache(disk_dir=str(tmp_path))
+    assert cache.get('k') == [1, 2]
+    assert cache.stats()['disk_hits'] == 1
+    assert os.listdir(tmp_path) == [os.path.basename(cache._disk_path('k'))]
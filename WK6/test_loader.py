@@ -0,0 +1,72 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import loader
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROW = ('9999001,{season},Indore,2024/01/05,India,Australia,Australia,field,normal,0,India,'
+       '12,0,SS Iyer,"Holkar Cricket Stadium, Indore",J Madanagopal,HDPK Dharmasena,{umpire3}\n')
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / 'ODI_Match_info.csv')
+    shutil.copy(os.path.join(HERE, 'ODI_Match_info.csv'), path)
+    return path
+
+
+def append(path, *rows):
+    with open(path, 'a') as f:
+        f.writelines(rows)
+
+
+@pytest.mark.skipif(loader.pa is None, reason='pyarrow not installed')
+@pytest.mark.parametrize('season, umpire3', [('2023/24', ''), ('2024', ''), ('2024', 'RJ Tucker')])
+def test_appended_rows_extend_the_sidecar(csv_path, season, umpire3):
+    before = loader.load_frame(csv_path)
+    append(csv_path, ROW.format(season=season, umpire3=umpire3))
+    loader._frames.clear()
+    key = loader.source_key(csv_path, loader._read_meta(loader._sidecar_paths(csv_path)[2]))
+    assert key['appended_at'] > 0
+
+    after = loader.load_frame(csv_path)
+    assert len(after) == len(before) + 1
+    row = after[after['id'] == 9999001].iloc[0]
+    assert row['season'] == season
+    assert (pd.isna(row['umpire3']) if not umpire3 else row['umpire3'] == umpire3)
+    for col in loader.CATEGORY_COLUMNS:
+        assert after[col].cat.categories.dtype == before[col].cat.categories.dtype, col
+
+    # Same frame as parsing the whole file again
+    reparsed = loader.parse_csv(csv_path).sort_values('id').reset_index(drop=True)
+    merged = after.sort_values('id').reset_index(drop=True)
+    for col in reparsed.columns:
+        assert reparsed[col].astype(object).equals(merged[col].astype(object)), col
+
+
+def test_append_rows_skips_known_ids():
+    df = loader.apply_types(pd.DataFrame({'id': [1, 2], 'umpire3': ['A', 'B'],
+                                          'date': ['2020/01/01', '2020/01/02']}))
+    new = loader.apply_types(pd.DataFrame({'id': [2, 3], 'umpire3': [None, None],
+                                           'date': ['2020/01/02', '2020/01/03']}))
+    out = loader.append_rows(df, new)
+    assert out['id'].tolist() == [1, 2, 3]
+    assert out['umpire3'].tolist()[:2] == ['A', 'B'] and pd.isna(out['umpire3'].iloc[2])
+    assert list(out['umpire3'].cat.categories) == ['A', 'B']
+
+
+@pytest.mark.skipif(loader.pa is None, reason='pyarrow not installed')
+def test_touched_file_loads_when_meta_is_read_only(csv_path, monkeypatch):
+    before = loader.load_frame(csv_path)
+    loader._frames.clear()
+    st = os.stat(csv_path)
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    def read_only(meta_path, key):
+        raise PermissionError(meta_path)
+
+    monkeypatch.setattr(loader, '_write_meta', read_only)
+    pd.testing.assert_frame_equal(loader.load_frame(csv_path), before)
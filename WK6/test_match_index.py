@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from match_index import MatchIndex
+from utils import load_data
+
+CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ODI_Match_info.csv')
+
+
+def baseline_filter(df, date_from=None, date_to=None, seasons=None, team=None, venue=None):
+    # filter_data before the bitset index
+    out = df.copy()
+    if date_from is not None:
+        out = out[out['date'] >= pd.to_datetime(date_from)]
+    if date_to is not None:
+        out = out[out['date'] <= pd.to_datetime(date_to)]
+    if seasons:
+        out = out[out['season'].isin(seasons)]
+    if team:
+        out = out[(out.get('team1') == team) | (out.get('team2') == team)]
+    if venue:
+        out = out[out['venue'] == venue]
+    return out
+
+
+@pytest.fixture(scope='module')
+def frame():
+    df = load_data(CSV).copy()
+    # Some rows without a season, team or venue
+    for col, rows in (('season', slice(5, 12)), ('team2', slice(20, 24)), ('venue', slice(30, 33))):
+        df[col] = df[col].astype(object)
+        df.loc[df.index[rows], col] = np.nan
+        df[col] = df[col].astype('category')
+    return df
+
+
+def same_rows(a, b):
+    return sorted(a['id']) == sorted(b['id'])
+
+
+def test_every_season_selected_still_excludes_missing_seasons(frame):
+    seasons = list(frame['season'].cat.categories)
+    got = MatchIndex(frame).filter(seasons=seasons)
+    assert same_rows(got, baseline_filter(frame, seasons=seasons))
+    assert got['season'].notna().all()
+
+
+def test_random_filters_match_isin(frame):
+    index = MatchIndex(frame)
+    rng = np.random.default_rng(0)
+    seasons = list(frame['season'].cat.categories)
+    teams = sorted(set(frame['team1'].dropna().astype(str)) | set(frame['team2'].dropna().astype(str)))
+    venues = list(frame['venue'].cat.categories)
+    dates = frame['date'].dropna().sort_values()
+    for _ in range(300):
+        kwargs = {}
+        if rng.random() < 0.5:
+            lo, hi = sorted(rng.integers(0, len(dates), 2))
+            kwargs['date_from'], kwargs['date_to'] = dates.iloc[lo], dates.iloc[hi]
+        if rng.random() < 0.5:
+            kwargs['seasons'] = list(rng.choice(seasons, rng.integers(1, len(seasons) + 1), replace=False))
+        if rng.random() < 0.4:
+            kwargs['team'] = teams[rng.integers(len(teams))]
+        if rng.random() < 0.3:
+            kwargs['venue'] = venues[rng.integers(len(venues))]
+        assert same_rows(index.filter(**kwargs), baseline_filter(frame, **kwargs)), kwargs
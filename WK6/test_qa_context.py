@@ -0,0 +1,61 @@
+import os
+import pickle
+
+import pandas as pd
+
+import qa_context
+from utils import load_data
+
+CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ODI_Match_info.csv')
+
+
+def fresh(df):
+    index = qa_context.ContextIndex()
+    index.update(df)
+    return index
+
+
+def assert_same(a, b):
+    assert a.total == b.total
+    assert {k: dict(t) for k, t in a.stats.items()} == {k: dict(t) for k, t in b.stats.items()}
+
+
+def test_append_adds_only_new_matches():
+    df = load_data(CSV)
+    index = fresh(df.iloc[:-5])
+    assert index.update(df, 'v2') == 5
+    assert index.update(df, 'v2') == 0
+    assert_same(index, fresh(df))
+
+
+def test_edited_match_is_reindexed(tmp_path):
+    df = load_data(CSV)
+    index = fresh(df)
+    edited = df.copy()
+    row = edited.index[len(edited) // 2]
+    old, new = edited.at[row, 'winner'], edited.at[row, 'team1']
+    if old == new:
+        new = edited.at[row, 'team2']
+    edited['winner'] = edited['winner'].astype(object)
+    edited.at[row, 'winner'] = new
+    index.update(edited, 'v2')
+    assert_same(index, fresh(edited))
+
+    # Survives a save/load round trip, then notices a removed match
+    path = str(tmp_path / 'qa.pkl')
+    qa_context.save_index(index, path)
+    loaded = qa_context.load_index(path)
+    assert loaded.row_hashes == index.row_hashes
+    loaded.update(edited.drop(index=row), 'v3')
+    assert_same(loaded, fresh(edited.drop(index=row)))
+
+
+def test_index_saved_without_row_hashes_is_rebuilt():
+    df = load_data(CSV)
+    index = fresh(df)
+    state = index.__getstate__()
+    state['ids'] = set(state.pop('row_hashes'))
+    old = qa_context.ContextIndex.__new__(qa_context.ContextIndex)
+    old.__setstate__(pickle.loads(pickle.dumps(state)))
+    old.update(df, 'v2')
+    assert_same(old, fresh(df))
@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+import report_jobs
+
+
+class InlinePool:
+    # Runs the render on submit, so the future is already done when the callback is added
+    def submit(self, fn, spec, path, progress, job_id):
+        with open(path, 'wb') as f:
+            f.write(spec['title'].encode())
+        future = Future()
+        future.set_result(path)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def spec(title):
+    return {'csv_path': 'ODI_Match_info.csv', 'dataset': 'd', 'filters': {}, 'filters_text': '', 'title': title}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = report_jobs.ReportQueue(str(tmp_path / 'reports'), max_workers=1, max_jobs=3, max_stored=2)
+    q._pool.shutdown()
+    q._pool = InlinePool()
+    yield q
+    q.shutdown()
+
+
+def submit(queue, title):
+    # Fails instead of hanging if submit deadlocks
+    result = []
+    thread = threading.Thread(target=lambda: result.append(queue.submit(spec(title))), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert result, 'submit did not return'
+    return result[0]
+
+
+def test_already_done_future_does_not_deadlock(queue):
+    job_id = submit(queue, 'a')
+    status = queue.status(job_id)
+    assert status['status'] == report_jobs.DONE and os.path.exists(status['path'])
+    # Same request again: served from the store
+    assert queue.status(submit(queue, 'a'))['stage'] == 'cached'
+
+
+def test_jobs_and_store_are_bounded(queue):
+    ids = []
+    for title in 'abcdef':
+        ids.append(submit(queue, title))
+        time.sleep(0.01)
+    assert len(queue._jobs) <= queue.max_jobs + 1
+    assert queue.status(ids[0]) is None
+    assert len(os.listdir(queue.store_dir)) == queue.max_stored
+    # Newest reports survive; a job whose PDF was pruned reports that it expired
+    assert queue.status(ids[-1])['status'] == report_jobs.DONE
+    assert queue.status(ids[-3])['stage'] == 'expired'
+
+
+def test_finished_jobs_expire(queue):
+    queue.job_ttl = 0
+    first = submit(queue, 'a')
+    time.sleep(0.01)
+    submit(queue, 'b')
+    assert queue.status(first) is None
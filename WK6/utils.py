@@ -1,44 +1,63 @@
 # utils.py
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 from io import BytesIO
+from loader import load_frame
+from match_index import get_index
 
-def load_data(path):
-    df = pd.read_csv(path)
-    # Normalize column names
-    df.columns = [c.strip() for c in df.columns]
-    # Parse date
-    if 'date' in df.columns:
-        try:
-            df['date'] = pd.to_datetime(df['date'])
-        except Exception:
-            # try dayfirst
-            df['date'] = pd.to_datetime(df['date'], dayfirst=True, errors='coerce')
-    # Ensure numeric columns exist
-    if 'win_by_runs' in df.columns:
-        df['win_by_runs'] = pd.to_numeric(df['win_by_runs'], errors='coerce')
-    if 'win_by_wickets' in df.columns:
-        df['win_by_wickets'] = pd.to_numeric(df['win_by_wickets'], errors='coerce')
-    return df
+def load_data(path, use_cache=True):
+    # Typed frame (categorical teams/venues/umpires, datetime64 dates), read from
+    # an Arrow sidecar after the first parse. See loader.py.
+    df = load_frame(path, use_cache=use_cache)
+    # Build the filter index up front so the first filter_data call is fast
+    return get_index(df).df
 
 def filter_data(df, date_from=None, date_to=None, seasons=None, team=None, venue=None):
-    out = df.copy()
-    if date_from is not None:
-        out = out[out['date'] >= pd.to_datetime(date_from)]
-    if date_to is not None:
-        out = out[out['date'] <= pd.to_datetime(date_to)]
-    if seasons:
-        out = out[out['season'].isin(seasons)]
-    if team:
-        out = out[(out.get('team1') == team) | (out.get('team2') == team)]
-    if venue:
-        out = out[out['venue'] == venue]
-    return out
+    # Date range is a searchsorted slice and season/team/venue are precomputed bitsets,
+    # so only the final result is materialized. See match_index.py.
+    return get_index(df).filter(date_from=date_from, date_to=date_to, seasons=seasons,
+                                team=team, venue=venue)
 
-def make_matches_per_year_fig(df):
-    fig, ax = plt.subplots()
+def create_summary(df):
+    total_matches = len(df)
+    winners = df['winner'].dropna()
+    top_team = winners.value_counts().idxmax() if len(winners) > 0 else "N/A"
+    most_player_of_match = df['player_of_match'].dropna()
+    top_player = most_player_of_match.value_counts().idxmax() if len(most_player_of_match) > 0 else "N/A"
+    avg_win_by_runs = int(df['win_by_runs'].dropna().mean()) if df['win_by_runs'].dropna().shape[0] > 0 else 0
+    avg_win_by_wickets = float(df['win_by_wickets'].dropna().mean()) if df['win_by_wickets'].dropna().shape[0] > 0 else 0.0
+
+    return {
+        "Total matches": total_matches,
+        "Top winning team": top_team,
+        "Top player (Player of match)": top_player,
+        "Average win by runs": avg_win_by_runs,
+        "Average win by wickets": round(avg_win_by_wickets, 2)
+    }
+
+def matches_per_year(df):
     if 'date' in df.columns and df['date'].notna().any():
-        by_year = df.groupby(df['date'].dt.year).size()
+        return df.groupby(df['date'].dt.year).size()
+    return None
+
+def win_by_runs_hist(df, bins=20):
+    # Histogram counts and bin edges, so the chart can be redrawn from a small table
+    if 'win_by_runs' in df.columns and df['win_by_runs'].dropna().shape[0] > 0:
+        return np.histogram(df['win_by_runs'].dropna(), bins=bins)
+    return None
+
+def _figure(fig=None):
+    # Reuse an existing figure (batch rendering) or create a new one
+    if fig is None:
+        return plt.subplots()
+    fig.clf()
+    return fig, fig.add_subplot()
+
+def make_matches_per_year_fig(df, by_year=None, fig=None):
+    fig, ax = _figure(fig)
+    if by_year is None:
+        by_year = matches_per_year(df)
+    if by_year is not None:
         ax.plot(by_year.index, by_year.values, marker='o')
         ax.set_title('Matches per Year')
         ax.set_xlabel('Year')
@@ -49,11 +68,14 @@ def make_matches_per_year_fig(df):
     fig.tight_layout()
     return fig
 
-def make_total_runs_hist_fig(df):
+def make_total_runs_hist_fig(df, hist=None, fig=None):
     # Dataset may not contain innings totals; we use win_by_runs as a proxy for runs differences.
-    fig, ax = plt.subplots()
-    if 'win_by_runs' in df.columns and df['win_by_runs'].dropna().shape[0] > 0:
-        ax.hist(df['win_by_runs'].dropna(), bins=20)
+    fig, ax = _figure(fig)
+    if hist is None:
+        hist = win_by_runs_hist(df)
+    if hist is not None:
+        counts, edges = hist
+        ax.hist(edges[:-1], bins=edges, weights=counts)
         ax.set_title('Distribution of Win-by-Runs (proxy for runs)')
         ax.set_xlabel('Runs')
         ax.set_ylabel('Count')
@@ -63,9 +85,10 @@ def make_total_runs_hist_fig(df):
     fig.tight_layout()
     return fig
 
-def fig_to_bytes(fig):
+def fig_to_bytes(fig, close=True):
     buf = BytesIO()
     fig.savefig(buf, bbox_inches='tight', dpi=150)
-    plt.close(fig)
+    if close:
+        plt.close(fig)
     buf.seek(0)
     return buf
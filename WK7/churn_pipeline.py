@@ -0,0 +1,221 @@
+# churn_pipeline.py
+# Streaming training input for the churn ANN in ANN.ipynb.
+# The CSV is never loaded whole. scan() reads it once in chunks: it fixes the
+# category vocabulary (Geography, Gender) and accumulates the scaler statistics
+# with StandardScaler.partial_fit (running mean and variance), giving the same
+# encoders and scaler as the notebook's fit_transform. ChurnBatches then streams
+# the file once per epoch: chunks are encoded against the vocabulary, scaled, mixed
+# in a shuffle buffer and cut into mini-batches, which a background thread prepares
+# ahead of the training loop (prefetch). Memory is bounded by the chunk size and
+# the shuffle buffer, not by the file size.
+import math
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from churn_scoring import FEATURES
+
+TARGET = 'Exited'
+CATEGORICAL = ['Geography', 'Gender']
+CHUNK_SIZE = 100_000
+BATCH_SIZE = 32
+SHUFFLE_BUFFER = 200_000
+PREFETCH = 64
+# Same fraction as model.fit(validation_split=0.2) in the notebook
+VALIDATION_SPLIT = 0.2
+
+_DTYPES = {col: 'float64' for col in FEATURES if col not in CATEGORICAL}
+_DTYPES.update({col: 'string' for col in CATEGORICAL})
+_DTYPES[TARGET] = 'float32'
+
+
+def read_chunks(path, chunksize=CHUNK_SIZE, columns=None):
+    # Only the model's columns are parsed (RowNumber, CustomerId, Surname are skipped)
+    columns = columns or FEATURES + [TARGET]
+    return pd.read_csv(path, usecols=columns, dtype={c: _DTYPES[c] for c in columns}, chunksize=chunksize)
+
+
+def _validation_mask(n, index, validation_split, seed):
+    # Reproducible per-chunk split, the same on every pass over the file
+    return np.random.default_rng([seed, index]).random(n) < validation_split
+
+
+def collect_vocab(path, chunksize=CHUNK_SIZE):
+    # Sorted categories per column, as LabelEncoder.fit would order them
+    vocab = {col: set() for col in CATEGORICAL}
+    for chunk in read_chunks(path, chunksize, CATEGORICAL):
+        for col in CATEGORICAL:
+            vocab[col].update(chunk[col].dropna().unique().tolist())
+    return {col: sorted(values) for col, values in vocab.items()}
+
+
+def encode(chunk, vocab):
+    # Feature matrix (float64, FEATURES order) with categories replaced by their codes
+    X = np.empty((len(chunk), len(FEATURES)), dtype='float64')
+    for j, col in enumerate(FEATURES):
+        if col in vocab:
+            codes = pd.Categorical(chunk[col], categories=vocab[col]).codes
+            if (codes < 0).any():
+                unseen = sorted(set(chunk[col][codes < 0].astype(str)))
+                raise ValueError(f'{col} contains labels outside the vocabulary: {unseen}')
+            X[:, j] = codes
+        else:
+            X[:, j] = chunk[col].to_numpy()
+    return X
+
+
+def scan(path, vocab=None, chunksize=CHUNK_SIZE, validation_split=VALIDATION_SPLIT, seed=42):
+    # One streaming pass for the scaler statistics and the split sizes. Without a
+    # vocab, an extra pass over the two category columns collects it first.
+    vocab = vocab or collect_vocab(path, chunksize)
+    scaler = StandardScaler()
+    rows = validation_rows = positives = 0
+    for i, chunk in enumerate(read_chunks(path, chunksize)):
+        X = encode(chunk, vocab)
+        scaler.partial_fit(pd.DataFrame(X, columns=FEATURES))
+        rows += len(X)
+        validation_rows += int(_validation_mask(len(X), i, validation_split, seed).sum())
+        positives += int(chunk[TARGET].sum())
+    return {
+        'path': path,
+        'vocab': vocab,
+        'scaler': scaler,
+        'rows': rows,
+        'train_rows': rows - validation_rows,
+        'validation_rows': validation_rows,
+        'positive_rate': positives / rows if rows else float('nan'),
+        'chunksize': chunksize,
+        'validation_split': validation_split,
+        'seed': seed,
+    }
+
+
+def encoders(stats):
+    # LabelEncoders equivalent to the notebook's, for churn_scoring.export_model
+    return {col: LabelEncoder().fit(values) for col, values in stats['vocab'].items()}
+
+
+class _Prefetcher:
+    # Runs a generator in a background thread, keeping up to `size` items ready
+    _END = object()
+
+    def __init__(self, source, size):
+        self._queue = queue.Queue(maxsize=size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, args=(source,), name='churn-prefetch', daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _fill(self, source):
+        try:
+            for item in source:
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._put(e)
+            return
+        self._put(self._END)
+
+    def __iter__(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is self._END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self._stop.set()
+            self._thread.join()
+
+
+class ChurnBatches:
+    # Mini-batches (X float32, y float32) for one side of the split ('train' or
+    # 'validation'). Iterating runs one epoch; every epoch reshuffles with a new seed.
+    # The shuffle is windowed like tf.data's shuffle(buffer_size): rows are mixed
+    # within a buffer of shuffle_buffer rows that slides down the file.
+    def __init__(self, stats, subset='train', batch_size=BATCH_SIZE, shuffle_buffer=SHUFFLE_BUFFER,
+                 prefetch=PREFETCH, shuffle=None):
+        if subset not in ('train', 'validation'):
+            raise ValueError("subset must be 'train' or 'validation'")
+        self.stats = stats
+        self.subset = subset
+        self.batch_size = batch_size
+        self.shuffle_buffer = max(shuffle_buffer, batch_size)
+        self.prefetch = prefetch
+        self.shuffle = subset == 'train' if shuffle is None else shuffle
+        self.rows = stats['train_rows' if subset == 'train' else 'validation_rows']
+        self.epoch = 0
+
+    @property
+    def steps_per_epoch(self):
+        return math.ceil(self.rows / self.batch_size)
+
+    def _chunks(self):
+        # Scaled (X, y) of this subset, chunk by chunk
+        stats = self.stats
+        scaler = stats['scaler']
+        mean, inv_scale = scaler.mean_, 1.0 / scaler.scale_
+        for i, chunk in enumerate(read_chunks(stats['path'], stats['chunksize'])):
+            keep = _validation_mask(len(chunk), i, stats['validation_split'], stats['seed'])
+            if self.subset == 'train':
+                keep = ~keep
+            chunk = chunk[keep]
+            if len(chunk):
+                X = (encode(chunk, stats['vocab']) - mean) * inv_scale
+                yield X.astype('float32'), chunk[TARGET].to_numpy(dtype='float32')
+
+    def _batches(self, epoch):
+        rng = np.random.default_rng([self.stats['seed'], epoch])
+        X_buf = np.empty((0, len(FEATURES)), dtype='float32')
+        y_buf = np.empty(0, dtype='float32')
+        for X, y in self._chunks():
+            X_buf, y_buf = np.concatenate([X_buf, X]), np.concatenate([y_buf, y])
+            if len(y_buf) < self.shuffle_buffer:
+                continue
+            if self.shuffle:
+                order = rng.permutation(len(y_buf))
+                X_buf, y_buf = X_buf[order], y_buf[order]
+            # Emit everything beyond half a buffer; the rest mixes with the next chunk
+            cut = (len(y_buf) - self.shuffle_buffer // 2) // self.batch_size * self.batch_size
+            for start in range(0, cut, self.batch_size):
+                yield X_buf[start:start + self.batch_size], y_buf[start:start + self.batch_size]
+            X_buf, y_buf = X_buf[cut:], y_buf[cut:]
+        if self.shuffle:
+            order = rng.permutation(len(y_buf))
+            X_buf, y_buf = X_buf[order], y_buf[order]
+        for start in range(0, len(y_buf), self.batch_size):
+            yield X_buf[start:start + self.batch_size], y_buf[start:start + self.batch_size]
+
+    def __iter__(self):
+        epoch, self.epoch = self.epoch, self.epoch + 1
+        source = self._batches(epoch)
+        return iter(_Prefetcher(source, self.prefetch)) if self.prefetch else source
+
+    def __len__(self):
+        return self.steps_per_epoch
+
+    def repeat(self):
+        # Endless stream of epochs, for model.fit(..., steps_per_epoch=len(batches))
+        while True:
+            yield from self
+
+
+def train_and_validation(path, vocab=None, batch_size=BATCH_SIZE, chunksize=CHUNK_SIZE,
+                         validation_split=VALIDATION_SPLIT, seed=42, **kwargs):
+    stats = scan(path, vocab, chunksize, validation_split, seed)
+    return (stats,
+            ChurnBatches(stats, 'train', batch_size, **kwargs),
+            ChurnBatches(stats, 'validation', batch_size, **kwargs))
@@ -0,0 +1,254 @@
+# churn_scoring.py
+# Scoring service for the churn ANN trained in ANN.ipynb.
+# export_model() packs the fitted LabelEncoders (Geography, Gender), the
+# StandardScaler and the Dense weights into one .npz artifact. ChurnScorer loads it
+# and runs the forward pass in NumPy, so scoring never imports TensorFlow. score()
+# takes a whole batch (DataFrame, list of dicts or one dict) and encodes, scales and
+# multiplies it as matrices. MicroBatcher groups single-record requests arriving
+# from many threads into one score() call.
+import os
+import sys
+import json
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'churn_model.npz')
+# Feature order of the notebook: Churn_Modelling.csv without RowNumber,
+# CustomerId, Surname and Exited
+FEATURES = ['CreditScore', 'Geography', 'Gender', 'Age', 'Tenure', 'Balance',
+            'NumOfProducts', 'HasCrCard', 'IsActiveMember', 'EstimatedSalary']
+ARTIFACT_VERSION = 1
+
+
+def _sigmoid(z):
+    # exp() of a non-positive number only, so it never overflows
+    e = np.exp(-np.abs(z))
+    return np.where(z >= 0, 1 / (1 + e), e / (1 + e))
+
+
+def _softmax(z):
+    e = np.exp(z - z.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
+ACTIVATIONS = {
+    'linear': lambda z: z,
+    'relu': lambda z: np.maximum(z, 0, out=z),
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'softmax': _softmax,
+}
+
+
+def export_model(model, encoders, scaler, path=ARTIFACT_PATH):
+    # model: fitted Keras model made of Dense layers; encoders: {column: LabelEncoder};
+    # scaler: the StandardScaler fitted on the feature frame.
+    features = [str(c) for c in getattr(scaler, 'feature_names_in_', FEATURES)]
+    arrays, activations = {}, []
+    for layer in model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue  # Dropout, Flatten, ...
+        kernel, bias = weights
+        arrays[f'kernel_{len(activations)}'] = np.asarray(kernel, dtype='float32')
+        arrays[f'bias_{len(activations)}'] = np.asarray(bias, dtype='float32')
+        activation = layer.get_config().get('activation', 'linear')
+        if activation not in ACTIVATIONS:
+            raise ValueError(f'Unsupported activation {activation!r} in layer {layer.name}')
+        activations.append(activation)
+    meta = {
+        'version': ARTIFACT_VERSION,
+        'features': features,
+        'vocab': {col: [str(v) for v in enc.classes_] for col, enc in encoders.items()},
+        'activations': activations,
+    }
+    arrays['mean'] = np.asarray(scaler.mean_, dtype='float64')
+    arrays['scale'] = np.asarray(scaler.scale_, dtype='float64')
+    tmp = path + '.tmp.npz'
+    np.savez(tmp, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+class ChurnScorer:
+    def __init__(self, meta, arrays):
+        if meta.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported artifact version {meta.get('version')!r}")
+        self.features = meta['features']
+        # Categories per column; a label's code is its position, as LabelEncoder.transform gives
+        self.vocab = {col: pd.Index(values, dtype=object) for col, values in meta['vocab'].items()}
+        self.activations = meta['activations']
+        self.layers = [(arrays[f'kernel_{i}'], arrays[f'bias_{i}'], ACTIVATIONS[name])
+                       for i, name in enumerate(self.activations)]
+        # Scaling folded into one multiply-add
+        self.mean = arrays['mean']
+        self.inv_scale = 1.0 / arrays['scale']
+
+    @classmethod
+    def load(cls, path=ARTIFACT_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            arrays = {name: data[name] for name in data.files if name != 'meta'}
+        return cls(meta, arrays)
+
+    def _encode(self, col, values):
+        # Factorize the column (hashing in C), then look up only its distinct labels
+        if not isinstance(values, (pd.Series, np.ndarray)):
+            values = np.asarray(values, dtype=object)
+        positions, uniques = pd.factorize(values)
+        labels = pd.Index(uniques, dtype=object).astype(str)
+        # Missing values (position -1) pick the trailing -1: unseen
+        lookup = np.append(self.vocab[col].get_indexer(labels), -1)
+        codes = lookup[positions]
+        if (codes < 0).any():
+            unseen = sorted(set(labels[lookup[:-1] < 0]) | ({'nan'} if (positions < 0).any() else set()))
+            raise ValueError(f'{col} contains previously unseen labels: {unseen}')
+        return codes.astype('float64')
+
+    def transform(self, records):
+        # records: DataFrame, list of dicts or a single dict -> scaled float32 matrix.
+        # Extra fields (RowNumber, Surname, Exited, ...) are ignored.
+        if isinstance(records, dict):
+            records = [records]
+        if isinstance(records, pd.DataFrame):
+            missing = [f for f in self.features if f not in records.columns]
+            if missing:
+                raise KeyError(f'Missing feature columns: {missing}')
+            columns = {f: records[f] for f in self.features}
+        else:
+            columns = {f: [r[f] for r in records] for f in self.features}
+        X = np.empty((len(next(iter(columns.values()))), len(self.features)), dtype='float64')
+        for j, f in enumerate(self.features):
+            X[:, j] = self._encode(f, columns[f]) if f in self.vocab else np.asarray(columns[f], dtype='float64')
+        X -= self.mean
+        X *= self.inv_scale
+        return X.astype('float32')
+
+    def forward(self, X):
+        for kernel, bias, activation in self.layers:
+            X = activation(X @ kernel + bias)
+        return X
+
+    def score(self, records):
+        # Churn probability per record (sigmoid output of the last layer)
+        X = self.transform(records)
+        if not len(X):
+            return np.empty(0, dtype='float32')
+        return self.forward(X)[:, -1]
+
+    def predict(self, records, threshold=0.5):
+        return (self.score(records) > threshold).astype(int)
+
+
+# Process-wide scorers, one per artifact version (path, mtime, size)
+_scorers = {}
+_scorers_lock = threading.Lock()
+
+
+def get_scorer(path=ARTIFACT_PATH):
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _scorers_lock:
+        if key not in _scorers:
+            for old in [k for k in _scorers if k[0] == key[0]]:
+                del _scorers[old]
+            _scorers[key] = ChurnScorer.load(path)
+        return _scorers[key]
+
+
+class MicroBatcher:
+    # Collects single records from concurrent callers and scores them together: a
+    # batch is sent when max_batch records are waiting or max_wait seconds after the
+    # first one arrived, whichever comes first.
+    def __init__(self, scorer, max_batch=256, max_wait=0.002):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name='churn-microbatcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, record):
+        # Returns a Future resolving to the record's churn probability
+        if self._closed:
+            raise RuntimeError('MicroBatcher is closed')
+        future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def score(self, record, timeout=None):
+        return self.submit(record).result(timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        end = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                # Take whatever is already queued without waiting, then wait out max_wait
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            batch = [(record, future) for record, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                scores = self.scorer.score([record for record, _ in batch])
+            except Exception:
+                # One bad record must not fail its neighbours: score them one by one
+                for record, future in batch:
+                    try:
+                        future.set_result(float(self.scorer.score([record])[0]))
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+            for (_, future), value in zip(batch, scores):
+                future.set_result(float(value))
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join()
+
+
+def score_csv(path, out_path, artifact=ARTIFACT_PATH, chunksize=100_000):
+    # Adds a churn_probability column to every row of a CSV, chunk by chunk
+    scorer = get_scorer(artifact)
+    header = True
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk['churn_probability'] = scorer.score(chunk)
+        chunk.to_csv(out_path, mode='w' if header else 'a', header=header, index=False)
+        header = False
+    return out_path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        sys.exit('usage: python churn_scoring.py input.csv output.csv [artifact.npz]')
+    score_csv(sys.argv[1], sys.argv[2], *sys.argv[3:4])
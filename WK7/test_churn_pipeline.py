@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+import churn_pipeline
+from churn_scoring import FEATURES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CHUNK = 700
+BATCH = 32
+
+
+@pytest.fixture(scope='module')
+def csv_path(tmp_path_factory):
+    # 6000 rows, streamed in chunks that don't divide it
+    df = pd.read_csv(os.path.join(HERE, 'Churn_Modelling.csv'), nrows=2000)
+    df = pd.concat([df] * 3, ignore_index=True)
+    df['RowNumber'] = np.arange(1, len(df) + 1)
+    path = str(tmp_path_factory.mktemp('churn') / 'churn.csv')
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope='module')
+def stats(csv_path):
+    return churn_pipeline.scan(csv_path, chunksize=CHUNK)
+
+
+def in_memory(path):
+    # The notebook's preprocessing on the whole file
+    df = pd.read_csv(path)
+    X = df[FEATURES].copy()
+    for col in churn_pipeline.CATEGORICAL:
+        X[col] = LabelEncoder().fit_transform(X[col])
+    return X.astype('float64'), df[churn_pipeline.TARGET].to_numpy(dtype='float32')
+
+
+def split(stats, n):
+    # Validation mask for the whole file, chunk by chunk as the pipeline draws it
+    sizes = [min(CHUNK, n - start) for start in range(0, n, CHUNK)]
+    return np.concatenate([churn_pipeline._validation_mask(size, i, stats['validation_split'], stats['seed'])
+                           for i, size in enumerate(sizes)])
+
+
+def epoch(batches):
+    X, y = zip(*batches)
+    return np.concatenate(X), np.concatenate(y)
+
+
+def sorted_rows(X, y):
+    rows = np.column_stack([X, y])
+    return rows[np.lexsort(rows.T[::-1])]
+
+
+def test_scaler_matches_full_fit(csv_path, stats):
+    X, y = in_memory(csv_path)
+    full = StandardScaler().fit(X)
+    np.testing.assert_allclose(stats['scaler'].mean_, full.mean_, rtol=1e-10)
+    np.testing.assert_allclose(stats['scaler'].scale_, full.scale_, rtol=1e-10)
+    assert stats['rows'] == len(X)
+    assert stats['train_rows'] + stats['validation_rows'] == len(X)
+    assert stats['positive_rate'] == pytest.approx(y.mean())
+    assert stats['vocab'] == {col: sorted(X_col.unique()) for col, X_col in
+                              pd.read_csv(csv_path, usecols=churn_pipeline.CATEGORICAL).items()}
+
+
+@pytest.mark.parametrize('subset', ['train', 'validation'])
+def test_each_epoch_covers_the_subset_once(csv_path, stats, subset):
+    X, y = in_memory(csv_path)
+    mask = split(stats, len(X))
+    keep = ~mask if subset == 'train' else mask
+    expected = sorted_rows(stats['scaler'].transform(X[keep]).astype('float32'), y[keep])
+
+    batches = churn_pipeline.ChurnBatches(stats, subset, BATCH, shuffle_buffer=1000, prefetch=4, shuffle=True)
+    assert batches.rows == keep.sum()
+    orders = []
+    for _ in range(2):
+        sizes = []
+        collected = []
+        for Xb, yb in batches:
+            assert Xb.dtype == np.float32 and yb.dtype == np.float32
+            sizes.append(len(yb))
+            collected.append((Xb, yb))
+        assert len(sizes) == len(batches)
+        assert all(size == BATCH for size in sizes[:-1]) and 0 < sizes[-1] <= BATCH
+        Xe, ye = epoch(collected)
+        np.testing.assert_allclose(sorted_rows(Xe, ye), expected, rtol=1e-5, atol=1e-5)
+        orders.append(Xe)
+    # A new shuffle every epoch
+    assert not np.array_equal(orders[0], orders[1])
+
+
+def test_unshuffled_keeps_file_order(csv_path, stats):
+    X, y = in_memory(csv_path)
+    mask = split(stats, len(X))
+    batches = churn_pipeline.ChurnBatches(stats, 'validation', BATCH, prefetch=0)
+    assert not batches.shuffle
+    Xe, ye = epoch(batches)
+    np.testing.assert_allclose(Xe, stats['scaler'].transform(X[mask]), rtol=1e-5, atol=1e-5)
+    np.testing.assert_array_equal(ye, y[mask])
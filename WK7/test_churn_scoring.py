@@ -0,0 +1,110 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+import churn_scoring
+from churn_scoring import FEATURES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Layer:
+    # The parts of a Keras layer export_model reads
+    def __init__(self, name, weights, activation=None):
+        self.name = name
+        self._weights = weights
+        self._activation = activation
+
+    def get_weights(self):
+        return self._weights
+
+    def get_config(self):
+        return {'name': self.name} if self._activation is None else {'name': self.name, 'activation': self._activation}
+
+
+class Model:
+    def __init__(self, layers):
+        self.layers = layers
+
+
+def dense(name, n_in, n_out, activation, rng):
+    return Layer(name, [rng.normal(0, 0.5, (n_in, n_out)).astype('float32'),
+                        rng.normal(0, 0.1, n_out).astype('float32')], activation)
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    df = pd.read_csv(os.path.join(HERE, 'Churn_Modelling.csv'), nrows=3000)
+    X = df[FEATURES].copy()
+    encoders = {}
+    for col in ('Geography', 'Gender'):
+        encoders[col] = LabelEncoder().fit(X[col])
+        X[col] = encoders[col].transform(X[col])
+    scaler = StandardScaler().fit(X)
+    rng = np.random.default_rng(0)
+    model = Model([dense('dense', 10, 6, 'relu', rng), Layer('dropout', []),
+                   dense('dense_1', 6, 6, 'relu', rng), dense('dense_2', 6, 1, 'sigmoid', rng)])
+    return df, encoders, scaler, model
+
+
+@pytest.fixture(scope='module')
+def scorer(fitted, tmp_path_factory):
+    _, encoders, scaler, model = fitted
+    path = str(tmp_path_factory.mktemp('model') / 'churn_model.npz')
+    churn_scoring.export_model(model, encoders, scaler, path)
+    return churn_scoring.get_scorer(path)
+
+
+def reference(fitted, df):
+    # float64 forward pass straight from the original encoders, scaler and weights
+    _, encoders, scaler, model = fitted
+    X = df[FEATURES].copy()
+    for col, enc in encoders.items():
+        X[col] = enc.transform(X[col])
+    a = scaler.transform(X)
+    for layer in model.layers:
+        weights = layer.get_weights()
+        if not weights:
+            continue
+        z = a @ weights[0].astype('float64') + weights[1].astype('float64')
+        a = np.maximum(z, 0) if layer.get_config()['activation'] == 'relu' else 1 / (1 + np.exp(-z))
+    return a[:, -1]
+
+
+def test_scores_match_reference(fitted, scorer):
+    df = fitted[0]
+    expected = reference(fitted, df)
+    np.testing.assert_allclose(scorer.score(df), expected, rtol=1e-4, atol=1e-5)
+    # Same result from dicts, one record or many
+    records = df.head(50).to_dict('records')
+    np.testing.assert_allclose(scorer.score(records), expected[:50], rtol=1e-4, atol=1e-5)
+    assert scorer.score(records[0])[0] == pytest.approx(expected[0], rel=1e-4, abs=1e-5)
+    np.testing.assert_array_equal(scorer.predict(df), (scorer.score(df) > 0.5).astype(int))
+
+
+def test_unseen_label_raises(scorer, fitted):
+    record = dict(fitted[0].iloc[0], Geography='Italy')
+    with pytest.raises(ValueError, match='Italy'):
+        scorer.score(record)
+
+
+def test_microbatcher_matches_direct_scoring(fitted, scorer):
+    records = fitted[0].head(500).to_dict('records')
+    direct = scorer.score(records)
+    batcher = churn_scoring.MicroBatcher(scorer, max_batch=64)
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            got = list(pool.map(batcher.score, records))
+        bad = batcher.submit(dict(records[0], Gender='Unknown'))
+        with pytest.raises(ValueError):
+            bad.result(5)
+        assert batcher.score(records[1]) == pytest.approx(float(direct[1]))
+    finally:
+        batcher.close()
+    np.testing.assert_allclose(got, direct, rtol=1e-6)
+    with pytest.raises(RuntimeError):
+        batcher.submit(records[0])
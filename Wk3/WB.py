@@ -1,7 +1,7 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
+from titanic_features import load_features, fingerprint
+from titanic_plots import get_summaries, chart_png
 
 # ✅ Clean Streamlit Page Setup
 st.set_page_config(page_title="Titanic EDA", page_icon="🚢", layout="wide")
@@ -13,8 +13,10 @@ sns.set_theme(style="whitegrid", palette="pastel")
 st.title("🚢 Titanic Dataset Analysis")
 st.markdown("---")
 
-# 📂 Load Dataset
-readfile = pd.read_csv("titanic_data.csv")
+# 📂 Load Dataset (shared feature pipeline, built once per file version)
+data_path = "titanic_data.csv"
+data_key = fingerprint(data_path)
+readfile = load_features(data_path)
 
 # 🔎 Dataset Preview
 st.subheader("📋 Dataset Preview")
@@ -24,43 +26,30 @@ st.markdown("---")
 
 # 👥 Count Men vs Women
 st.subheader("👨‍🦱👩 Men vs Women Count")
-
-fig, ax = plt.subplots(figsize=(6, 4))
-sns.countplot(x="Sex", data=readfile, ax=ax)
-ax.set_title("Number of Men and Women", fontsize=14, weight="bold")
-ax.set_xlabel("Gender")
-ax.set_ylabel("Count")
-st.pyplot(fig)
+# Every chart and number below comes from one groupby pass (titanic_plots.py); the
+# rendered images are reused across reruns until the CSV changes
+tables = get_summaries(data_key, readfile)
+st.image(chart_png(data_key, readfile, "sex_counts"))
 
 # 🧮 Display numbers below graph
-men_count = (readfile["Sex"] == "male").sum()
-women_count = (readfile["Sex"] == "female").sum()
+men_count = tables["sex_counts"].get("male", 0)
+women_count = tables["sex_counts"].get("female", 0)
 st.info(f"**Total Men:** {men_count} | **Total Women:** {women_count}")
 
 st.markdown("---")
 
 # 💰 Average Fare Comparison
 st.subheader("💰 Average Fare: Men vs Women")
-
-fig1, ax1 = plt.subplots(figsize=(6, 4))
-sns.barplot(x="Sex", y="Fare", data=readfile, ax=ax1, ci=None)
-ax1.set_title("Average Fare by Gender", fontsize=14, weight="bold")
-ax1.set_xlabel("Gender")
-ax1.set_ylabel("Average Fare")
-st.pyplot(fig1)
+st.image(chart_png(data_key, readfile, "fare_by_sex"))
 
 # 🧮 Show numeric values
-avg_men_fare = readfile[readfile["Sex"] == "male"]["Fare"].mean()
-avg_women_fare = readfile[readfile["Sex"] == "female"]["Fare"].mean()
+avg_men_fare = tables["fare_by_sex"].get("male", float("nan"))
+avg_women_fare = tables["fare_by_sex"].get("female", float("nan"))
 st.success(f"**Average Fare (Men):** ${avg_men_fare:.2f} | **Average Fare (Women):** ${avg_women_fare:.2f}")
 
 # Show Survived Peoples Count
 st.subheader("Survided Peoples")
-
-fig2, ax2=plt.subplots()
-sns.countplot(x="Survived",hue="Sex",data=readfile,ax=ax2)
-ax2.set_title("Survived By Gender")
-st.pyplot(fig2)
+st.image(chart_png(data_key, readfile, "survived_by_sex"))
 
 
 st.markdown("---")
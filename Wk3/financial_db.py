@@ -0,0 +1,229 @@
+# financial_db.py
+# Typed storage and SQL pushdown for the financial sample tables
+# (First.db: FianacialData, second.db: F_Data).
+# The tables were created with every column declared Text, so every query had to
+# pull the whole table into pandas and cast it. FinancialDB builds parameterized
+# WHERE/GROUP BY queries so only aggregated rows reach pandas; on a Text table it
+# casts the numeric and date columns inside those queries.
+# ensure_typed() is the one-off migration, run explicitly (CLI below or
+# FinancialDB.migrate()), never on open: it rebuilds the table in place with
+# REAL/INTEGER/DATE affinities (casting inside SQLite), indexes the usual filter
+# columns, then runs ANALYZE and VACUUM. In the numeric and date columns a blank or
+# whitespace-only cell becomes NULL (not 0); Text columns are copied unchanged.
+#
+#   python Wk3/financial_db.py Wk3/First.db FianacialData
+import sys
+import sqlite3
+
+import pandas as pd
+
+TABLES = {'First.db': 'FianacialData', 'second.db': 'F_Data'}
+
+# column -> declared type
+SCHEMA = {
+    'Segment': 'TEXT',
+    'Country': 'TEXT',
+    'Product': 'TEXT',
+    'Discount_Band': 'TEXT',
+    'Units_Sold': 'REAL',
+    'Manufacturing_Price': 'REAL',
+    'Sale_Price': 'REAL',
+    'Gross_Sales': 'REAL',
+    'Discounts': 'REAL',
+    'Sales': 'REAL',
+    'COGS': 'REAL',
+    'Profit': 'REAL',
+    'Date': 'DATE',
+    'Month_Number': 'INTEGER',
+    'Month_Name': 'TEXT',
+    'Year': 'INTEGER',
+    'Discount_Rate': 'REAL',
+    'Sales_Base_Case': 'REAL',
+    'Sales_Optimistic': 'REAL',
+    'Sales_Pessimistic': 'REAL',
+    'Profit_Base_Case': 'REAL',
+    'Profit_Optimistic': 'REAL',
+    'Profit_Pessimistic': 'REAL',
+    'Sales_Growth_Rate': 'REAL',
+    'Profit_Growth_Rate': 'REAL',
+}
+
+INDEXED = ['Country', 'Segment', 'Product', 'Year']
+AGGREGATES = {'sum': 'SUM', 'mean': 'AVG', 'avg': 'AVG', 'min': 'MIN', 'max': 'MAX', 'count': 'COUNT'}
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _cast(col, kind):
+    if kind == 'TEXT':
+        return _quote(col)
+    # Blank numbers/dates become NULL instead of 0
+    value = f"NULLIF(TRIM({_quote(col)}), '')"
+    if kind == 'REAL':
+        return f"CAST({value} AS REAL)"
+    if kind == 'INTEGER':
+        return f"CAST(CAST({value} AS REAL) AS INTEGER)"
+    if kind == 'DATE':
+        # '2016-03-31 00:00:00' -> '2016-03-31'
+        return f"date({value})"
+    raise ValueError(f"Unknown column type: {kind}")
+
+
+def column_types(conn, table):
+    return {row[1]: row[2].upper() for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+
+
+def is_typed(conn, table):
+    types = column_types(conn, table)
+    return all(types.get(col) == kind for col, kind in SCHEMA.items() if col in types)
+
+
+def create_indexes(conn, table):
+    for col in INDEXED:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{table}_{col}')} "
+                     f"ON {_quote(table)}({_quote(col)})")
+
+
+def ensure_typed(conn, table):
+    # Rebuild the table with typed columns if it still has the all-Text layout.
+    # Returns True when a migration ran.
+    types = column_types(conn, table)
+    if not types:
+        raise ValueError(f"Table {table} does not exist")
+    migrated = False
+    if not is_typed(conn, table):
+        tmp = f"{table}__typed"
+        columns = list(types)
+        decl = ", ".join(f"{_quote(c)} {SCHEMA.get(c, 'TEXT')}" for c in columns)
+        select = ", ".join(_cast(c, SCHEMA.get(c, 'TEXT')) for c in columns)
+        with conn:
+            conn.execute(f"DROP TABLE IF EXISTS {_quote(tmp)}")
+            conn.execute(f"CREATE TABLE {_quote(tmp)} ({decl})")
+            conn.execute(f"INSERT INTO {_quote(tmp)} SELECT {select} FROM {_quote(table)}")
+            conn.execute(f"DROP TABLE {_quote(table)}")
+            conn.execute(f"ALTER TABLE {_quote(tmp)} RENAME TO {_quote(table)}")
+        migrated = True
+    with conn:
+        create_indexes(conn, table)
+    if migrated:
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+    return migrated
+
+
+class FinancialDB:
+    def __init__(self, path, table=None, migrate=False):
+        # migrate=True rewrites the database file (see ensure_typed); by default it is
+        # only read, and an untyped table is cast inside each query instead
+        self.path = path
+        self.table = table or TABLES.get(path.replace('\\', '/').rsplit('/', 1)[-1])
+        if self.table is None:
+            raise ValueError(f"No table name given for {path}")
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        if migrate:
+            ensure_typed(self.conn, self.table)
+        self._load_columns()
+
+    def _load_columns(self):
+        self.columns = list(column_types(self.conn, self.table))
+        self.typed = is_typed(self.conn, self.table)
+
+    def migrate(self):
+        # Explicit, one-off: rebuild the table with typed columns. Returns True if it ran.
+        done = ensure_typed(self.conn, self.table)
+        self._load_columns()
+        return done
+
+    def close(self):
+        self.conn.close()
+
+    def _column(self, col):
+        # SQL for a column's values: the column itself, or its cast while untyped
+        if col not in self.columns:
+            raise ValueError(f"Unknown column: {col}")
+        if self.typed:
+            return _quote(col)
+        return _cast(col, SCHEMA.get(col, 'TEXT'))
+
+    def _where(self, filters):
+        # filters: {col: value | [values] | (low, high)}; None on either end of a range is open
+        clauses, params = [], []
+        for col, value in (filters or {}).items():
+            name = self._column(col)
+            if isinstance(value, tuple):
+                low, high = value
+                if low is not None:
+                    clauses.append(f"{name} >= ?")
+                    params.append(low)
+                if high is not None:
+                    clauses.append(f"{name} <= ?")
+                    params.append(high)
+            elif isinstance(value, (list, set, frozenset)):
+                values = list(value)
+                if not values:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{name} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def aggregate(self, group_by=None, metrics=None, filters=None, order_by=None, limit=None):
+        # metrics: {output name: (function, column)}, functions from AGGREGATES.
+        # Runs one GROUP BY in SQLite; only the grouped rows are transferred.
+        group_by = [group_by] if isinstance(group_by, str) else list(group_by or [])
+        metrics = metrics or {'Sales': ('sum', 'Sales'), 'Profit': ('sum', 'Profit')}
+        select = [f"{self._column(c)} AS {_quote(c)}" for c in group_by]
+        for alias, (func, col) in metrics.items():
+            if func not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate: {func}")
+            target = '*' if col == '*' else self._column(col)
+            select.append(f"{AGGREGATES[func]}({target}) AS {_quote(alias)}")
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(select)} FROM {_quote(self.table)}{where}"
+        if group_by:
+            sql += " GROUP BY " + ", ".join(self._column(c) for c in group_by)
+        if order_by:
+            desc = order_by.startswith('-')
+            name = order_by.lstrip('-')
+            key = _quote(name) if name in metrics or name in group_by else self._column(name)
+            sql += f" ORDER BY {key}{' DESC' if desc else ''}"
+        elif group_by:
+            sql += " ORDER BY " + ", ".join(_quote(c) for c in group_by)
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def select(self, columns=None, filters=None, limit=None):
+        # Filtered rows, for the cases that really need them
+        cols = ", ".join(f"{self._column(c)} AS {_quote(c)}" for c in (columns or self.columns))
+        where, params = self._where(filters)
+        sql = f"SELECT {cols} FROM {_quote(self.table)}{where}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return pd.read_sql_query(sql, self.conn, params=params, parse_dates=['Date'] if not columns or 'Date' in columns else None)
+
+    def distinct(self, col):
+        # Filter widget options; served from the index on indexed columns
+        name = self._column(col)
+        rows = self.conn.execute(f"SELECT DISTINCT {name} FROM {_quote(self.table)} "
+                                 f"WHERE {name} IS NOT NULL ORDER BY {name}").fetchall()
+        return [r[0] for r in rows]
+
+    def count(self, filters=None):
+        where, params = self._where(filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM {_quote(self.table)}{where}", params).fetchone()[0]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python financial_db.py <database> [table]")
+    db_path = sys.argv[1]
+    name = sys.argv[2] if len(sys.argv) == 3 else TABLES.get(db_path.replace('\\', '/').rsplit('/', 1)[-1])
+    with sqlite3.connect(db_path) as connection:
+        done = ensure_typed(connection, name)
+    print(f"{db_path}:{name} {'migrated to typed columns' if done else 'already typed'}; indexes on {', '.join(INDEXED)}")
@@ -0,0 +1,57 @@
+import os
+import shutil
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import financial_db
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(params=['First.db', 'second.db'])
+def db_path(request, tmp_path):
+    path = str(tmp_path / request.param)
+    shutil.copy(os.path.join(HERE, request.param), path)
+    return path
+
+
+def by_country_year(path, table):
+    # What the notebooks do: whole table into pandas, cast there
+    with sqlite3.connect(path) as conn:
+        df = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+    df['Sales'] = pd.to_numeric(df['Sales'])
+    df['Year'] = pd.to_numeric(df['Year']).astype('int64')
+    df = df[df['Segment'].isin(['Government', 'Midmarket'])]
+    return df.groupby(['Country', 'Year'], as_index=False)['Sales'].sum()
+
+
+def test_opening_does_not_change_the_file(db_path):
+    before = open(db_path, 'rb').read()
+    db = financial_db.FinancialDB(db_path)
+    assert not db.typed
+    db.aggregate('Country')
+    db.close()
+    assert open(db_path, 'rb').read() == before
+
+
+def test_aggregates_match_pandas_before_and_after_migration(db_path):
+    db = financial_db.FinancialDB(db_path)
+    expected = by_country_year(db_path, db.table)
+    text_before = db.select(['Discount_Band', 'Month_Name'])
+
+    def query():
+        return db.aggregate(['Country', 'Year'], {'Sales': ('sum', 'Sales')},
+                            filters={'Segment': ['Government', 'Midmarket']})
+
+    untyped = query()
+    assert db.migrate()
+    assert db.typed and not db.migrate()
+    typed = query()
+    for got in (untyped, typed):
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+    # Text columns are copied as they were, NULLs included
+    pd.testing.assert_frame_equal(db.select(['Discount_Band', 'Month_Name']), text_before)
+    assert db.distinct('Year') == sorted(expected['Year'].unique().tolist())
+    db.close()
@@ -0,0 +1,73 @@
+# titanic_features.py
+# Feature pipeline shared by the Titanic apps (wbb.py, WB.py).
+# Titles come from one vectorized Series.str.extract with a precompiled pattern;
+# names without a title become 'Rare Title' instead of raising. Low-cardinality
+# outputs are categoricals. Features are built once per file fingerprint
+# (path, mtime, size) and the result is shared by every caller in the process.
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+TITLE_PATTERN = re.compile(r'([A-Z][a-z]+)\.')
+COMMON_TITLES = ['Mr', 'Mrs', 'Miss', 'Master']
+RARE_TITLE = 'Rare Title'
+TITLES = COMMON_TITLES + [RARE_TITLE]
+
+# In-process memo: fingerprint -> features. Callers must not modify the frame in place.
+_features = {}
+_lock = threading.Lock()
+
+
+def extract_title(names):
+    # Categorical of titles. The regex runs once per distinct name and the result is
+    # mapped back to the rows by code; missing names and names without a title are NaN.
+    codes, uniques = pd.factorize(names)
+    titles = pd.Series(uniques, dtype='string').str.extract(TITLE_PATTERN, expand=False)
+    title_codes, categories = pd.factorize(titles)
+    row_codes = np.where(codes >= 0, title_codes[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(row_codes, categories=categories), index=names.index)
+
+
+def group_titles(titles):
+    # Everything outside COMMON_TITLES (including no title at all) is RARE_TITLE
+    grouped = titles.astype(object).where(titles.isin(COMMON_TITLES), RARE_TITLE)
+    return pd.Categorical(grouped, categories=TITLES)
+
+
+def build_features(df):
+    out = df.copy()
+    out['raw_title'] = extract_title(out['Name'])
+    out['title'] = group_titles(out['raw_title'])
+    out['Fsize'] = (out['SibSp'] + out['Parch'] + 1).astype('int16')
+    out['Sex'] = out['Sex'].astype('category')
+    return out
+
+
+def fingerprint(path):
+    st = os.stat(path)
+    return f'{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}'
+
+
+def load_features(path='titanic_data.csv'):
+    key = fingerprint(path)
+    with _lock:
+        if key in _features:
+            return _features[key]
+    features = build_features(pd.read_csv(path))
+    with _lock:
+        # Only the current version of each file is kept
+        for old in [k for k in _features if k.rsplit(':', 2)[0] == key.rsplit(':', 2)[0]]:
+            del _features[old]
+        _features[key] = features
+    return features
+
+
+def survival_share(df, by):
+    # Share of each Survived value within every `by` group
+    # (groupby(by)['Survived'].value_counts(normalize=True))
+    return (df.groupby(by, observed=True)['Survived']
+            .value_counts(normalize=True)
+            .reset_index(name='Percentage'))
@@ -0,0 +1,105 @@
+# titanic_plots.py
+# Plotting backend for WB.py.
+# One groupby over (Sex, Survived) yields every summary the page shows: passengers by
+# Sex, by Survived x Sex, and mean Fare by Sex. Bars are drawn from those small
+# tables, not from the raw rows. Each chart is rendered once per dataset fingerprint
+# to PNG bytes and the matplotlib figure is closed right away, so reruns reuse the
+# image and no figures accumulate in the server process.
+import io
+import threading
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# (fingerprint, name) -> summaries / PNG bytes
+_summaries = {}
+_images = {}
+_lock = threading.Lock()
+
+
+def summaries(df):
+    grouped = df.groupby(['Sex', 'Survived'], observed=True).agg(
+        count=('Survived', 'size'),
+        fare_sum=('Fare', 'sum'),
+        fare_n=('Fare', 'count'),
+    ).reset_index()
+    by_sex = grouped.groupby('Sex', observed=True)[['count', 'fare_sum', 'fare_n']].sum()
+    return {
+        'sex_counts': by_sex['count'],
+        'survived_sex': grouped[['Survived', 'Sex', 'count']],
+        'fare_by_sex': by_sex['fare_sum'] / by_sex['fare_n'],
+    }
+
+
+def _forget_older(key):
+    # Drop summaries and images of older versions of the same file (key = path:mtime:size)
+    path = key.rsplit(':', 2)[0]
+    for old in [k for k in _summaries if k != key and k.rsplit(':', 2)[0] == path]:
+        del _summaries[old]
+    for old in [k for k in _images if k[0] != key and k[0].rsplit(':', 2)[0] == path]:
+        del _images[old]
+
+
+def get_summaries(key, df):
+    with _lock:
+        if key in _summaries:
+            return _summaries[key]
+    tables = summaries(df)
+    with _lock:
+        _forget_older(key)
+        _summaries[key] = tables
+    return tables
+
+
+def _sex_counts(tables):
+    counts = tables['sex_counts'].rename_axis('Sex').reset_index(name='Count')
+    fig, ax = plt.subplots(figsize=(6, 4))
+    sns.barplot(x='Sex', y='Count', data=counts, ax=ax)
+    ax.set_title("Number of Men and Women", fontsize=14, weight="bold")
+    ax.set_xlabel("Gender")
+    ax.set_ylabel("Count")
+    return fig
+
+
+def _fare_by_sex(tables):
+    fares = tables['fare_by_sex'].rename_axis('Sex').reset_index(name='Fare')
+    fig, ax = plt.subplots(figsize=(6, 4))
+    sns.barplot(x='Sex', y='Fare', data=fares, ax=ax)
+    ax.set_title("Average Fare by Gender", fontsize=14, weight="bold")
+    ax.set_xlabel("Gender")
+    ax.set_ylabel("Average Fare")
+    return fig
+
+
+def _survived_by_sex(tables):
+    fig, ax = plt.subplots()
+    sns.barplot(x='Survived', y='count', hue='Sex', data=tables['survived_sex'], ax=ax)
+    ax.set_title("Survived By Gender")
+    ax.set_ylabel("count")
+    return fig
+
+
+CHARTS = {
+    'sex_counts': _sex_counts,
+    'fare_by_sex': _fare_by_sex,
+    'survived_by_sex': _survived_by_sex,
+}
+
+
+def chart_png(key, df, name):
+    # PNG bytes of chart `name`, rendered once per dataset fingerprint
+    with _lock:
+        if (key, name) in _images:
+            return _images[(key, name)]
+    fig = CHARTS[name](get_summaries(key, df))
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    png = buf.getvalue()
+    with _lock:
+        _images[(key, name)] = png
+    return png
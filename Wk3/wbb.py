@@ -1,31 +1,30 @@
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import re
+from titanic_features import load_features, survival_share
 
 st.title("Wk 3 Test")
-readfile=pd.read_csv("titanic_data.csv")
-
-readfile['title']=readfile['Name'].apply(lambda y:re.search(r'([A-Z][a-z]+)\.', y).group(1)) ##.apply function()
-readfile['title'].value_counts()
+# title (rare titles grouped) and Fsize are built once per file version; see titanic_features.py
+readfile=load_features("titanic_data.csv")
 
 
 st.title("Graph 1")
-readfile.loc[(~readfile['title'].isin(['Mr','Mrs','Miss','Master'])),'title'] = 'Rare Title'
 fig1, ax1 = plt.subplots(figsize=(6, 4))
 sns.countplot(x='title',hue="Survived",data=readfile)
 st.pyplot(fig1)
+plt.close(fig1)
 
 st.title("Graph 2")
-readfile['Fsize']=readfile['SibSp']+ readfile['Parch']+1
 fig2, ax2 = plt.subplots(figsize=(6, 4))
 sns.countplot(x='Fsize',hue="Survived",data=readfile)
 
 st.pyplot(fig2)
+plt.close(fig2)
 
 st.title("graph 3")
-temp = readfile.groupby('Fsize')['Survived'].value_counts(normalize=True).reset_index(name='Percentage')
+temp = survival_share(readfile, 'Fsize')
 fig3, ax3 = plt.subplots(figsize=(6, 4))
 sns.barplot(x='Fsize',y='Percentage',data=temp)
 st.pyplot(fig3)
+plt.close(fig3)
+
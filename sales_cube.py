@@ -0,0 +1,307 @@
+# sales_cube.py
+# Day/week/month rollups of sales_data.db with a planner that reads the coarsest ones.
+# ensure_schema() is an explicit, one-off migration (SalesCube.migrate() or
+# SalesCube(migrate=True)); opening a cube never writes to the database. It rebuilds
+# `sales` with a real DATE column (ISO text, CHECKed), adds an index on
+# (date, region, product), and creates the three rollup tables:
+#   sales_rollup_day / _week / _month (period, region, product, total, orders)
+# Triggers on `sales` keep all three up to date on every insert, delete and update.
+# Rows whose date does not parse are moved to sales_quarantine instead of failing
+# the migration. A NULL region stays NULL in the rollups (matched with IS).
+#
+# SalesCube.query() splits the requested date range into whole months, then whole
+# weeks, then single days at the edges, and sums each piece from its rollup table.
+# A multi-year report reads about one row per month per region/product. Before the
+# migration it runs the same GROUP BY directly on `sales`.
+#
+#   from sales_cube import SalesCube
+#   cube = SalesCube()
+#   cube.migrate()
+#   cube.query('2023-01-01', '2024-12-31', by=['region'], granularity='month')
+from datetime import date, timedelta
+
+from sqlite_pool import get_pool
+
+LEVELS = ['month', 'week', 'day']
+
+# SQL expression for each level's period (start date) from an ISO date `x`
+PERIOD_SQL = {
+    'day': "{x}",
+    'week': "date({x}, '-6 days', 'weekday 1')",   # Monday on or before x
+    'month': "strftime('%Y-%m-01', {x})",
+}
+
+# Which rollups can feed each output granularity (their periods must nest in it)
+SOURCES = {
+    None: ['month', 'week', 'day'],
+    'month': ['month', 'day'],
+    'week': ['week', 'day'],
+    'day': ['day'],
+}
+
+DIMENSIONS = ['region', 'product']
+
+TYPED_SALES_SQL = """
+CREATE TABLE sales__typed (
+    id INTEGER PRIMARY KEY,
+    date DATE NOT NULL CHECK (date = date(date)),
+    product TEXT NOT NULL,
+    sales INTEGER,
+    region TEXT
+)"""
+
+QUARANTINE_SQL = """
+CREATE TABLE IF NOT EXISTS sales_quarantine (
+    id INTEGER PRIMARY KEY,
+    date TEXT,
+    product TEXT,
+    sales INTEGER,
+    region TEXT,
+    reason TEXT NOT NULL
+)"""
+
+
+def _rollup_sql(level):
+    # region may be NULL, so the key is an index looked up with IS rather than a
+    # primary key (whose columns can't hold NULL in a WITHOUT ROWID table)
+    table = f"sales_rollup_{level}"
+    return [f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    period DATE NOT NULL,
+    region TEXT,
+    product TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    orders INTEGER NOT NULL
+)""", f"CREATE INDEX IF NOT EXISTS idx_{table}_key ON {table}(period, region, product)"]
+
+
+def _apply_sql(level, row, sign):
+    # Add (sign=+1) or remove (sign=-1) one sales row from a rollup
+    table = f"sales_rollup_{level}"
+    period = PERIOD_SQL[level].format(x=f"{row}.date")
+    match = f"period = {period} AND region IS {row}.region AND product = {row}.product"
+    if sign > 0:
+        return (f"INSERT INTO {table} (period, region, product, total, orders) "
+                f"SELECT {period}, {row}.region, {row}.product, 0, 0 "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {match});\n"
+                f"    UPDATE {table} SET total = total + COALESCE({row}.sales, 0), orders = orders + 1 "
+                f"WHERE {match};")
+    return (f"UPDATE {table} SET total = total - COALESCE({row}.sales, 0), orders = orders - 1 "
+            f"WHERE {match};\n"
+            f"    DELETE FROM {table} WHERE {match} AND orders <= 0;")
+
+
+def _trigger_sql():
+    body = {
+        'insert': [_apply_sql(level, 'NEW', +1) for level in LEVELS],
+        'delete': [_apply_sql(level, 'OLD', -1) for level in LEVELS],
+        'update': ([_apply_sql(level, 'OLD', -1) for level in LEVELS]
+                   + [_apply_sql(level, 'NEW', +1) for level in LEVELS]),
+    }
+    events = {'insert': 'AFTER INSERT ON sales', 'delete': 'AFTER DELETE ON sales',
+              'update': 'AFTER UPDATE OF date, product, sales, region ON sales'}
+    return [f"CREATE TRIGGER IF NOT EXISTS trg_sales_rollup_{name} {events[name]}\nBEGIN\n    "
+            + "\n    ".join(body[name]) + "\nEND" for name in events]
+
+
+def _rebuild_sql(level):
+    table = f"sales_rollup_{level}"
+    period = PERIOD_SQL[level].format(x='date')
+    return [f"DELETE FROM {table}",
+            f"INSERT INTO {table} (period, region, product, total, orders) "
+            f"SELECT {period}, region, product, COALESCE(SUM(sales), 0), COUNT(*) "
+            f"FROM sales GROUP BY 1, 2, 3"]
+
+
+def _date_type(conn):
+    for row in conn.execute("PRAGMA table_info(sales)"):
+        if row[1] == 'date':
+            return row[2].upper()
+    raise ValueError("sales table has no date column")
+
+
+def has_rollups(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sales_rollup_day'").fetchone() is not None
+
+
+def ensure_schema(pool):
+    # Idempotent: type the date column, add the index, rollups and triggers.
+    # Returns the number of rows moved to sales_quarantine by this call.
+    quarantined = 0
+    with pool.transaction() as conn:
+        created = not has_rollups(conn)
+        if _date_type(conn) != 'DATE':
+            # Rows without a parseable date can't satisfy the new CHECK; set them aside
+            conn.execute(QUARANTINE_SQL)
+            quarantined = conn.execute(
+                "INSERT INTO sales_quarantine (id, date, product, sales, region, reason) "
+                "SELECT id, date, product, sales, region, 'unparsed date' FROM sales "
+                "WHERE date(date) IS NULL").rowcount
+            conn.execute("DROP TABLE IF EXISTS sales__typed")
+            conn.execute(TYPED_SALES_SQL)
+            conn.execute("INSERT INTO sales__typed (id, date, product, sales, region) "
+                         "SELECT id, date(date), product, CAST(sales AS INTEGER), region FROM sales "
+                         "WHERE date(date) IS NOT NULL")
+            conn.execute("DROP TABLE sales")
+            conn.execute("ALTER TABLE sales__typed RENAME TO sales")
+            created = True
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_date_region_product ON sales(date, region, product)")
+        for level in LEVELS:
+            for sql in _rollup_sql(level):
+                conn.execute(sql)
+        for sql in _trigger_sql():
+            conn.execute(sql)
+        if created:
+            for level in LEVELS:
+                for sql in _rebuild_sql(level):
+                    conn.execute(sql)
+    if created:
+        pool.connection().execute("ANALYZE")
+    return quarantined
+
+
+def rebuild_rollups(pool):
+    with pool.transaction() as conn:
+        for level in LEVELS:
+            for sql in _rebuild_sql(level):
+                conn.execute(sql)
+
+
+# --- Planner ---
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _period_start(level, d):
+    if level == 'month':
+        return d.replace(day=1)
+    if level == 'week':
+        return d - timedelta(days=d.weekday())
+    return d
+
+
+def _next_period(level, d):
+    if level == 'month':
+        return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+    if level == 'week':
+        return d + timedelta(days=7)
+    return d + timedelta(days=1)
+
+
+def plan(start, end, levels):
+    # Cover [start, end] (inclusive) with whole periods, coarsest level first.
+    # Returns [(level, first period start, last period start), ...]
+    start, end = _as_date(start), _as_date(end)
+    if start > end or not levels:
+        return []
+    level, rest = levels[0], levels[1:]
+    first = _period_start(level, start)
+    if first < start:
+        first = _next_period(level, first)
+    last = None
+    p = first
+    while _next_period(level, p) - timedelta(days=1) <= end:
+        last = p
+        p = _next_period(level, p)
+    if last is None:
+        return plan(start, end, rest)
+    return (plan(start, first - timedelta(days=1), rest)
+            + [(level, first, last)]
+            + plan(_next_period(level, last), end, rest))
+
+
+class SalesCube:
+    def __init__(self, db='sales', pool=None, migrate=False):
+        # migrate=True runs ensure_schema (it rewrites the database); by default the
+        # cube only reads, from the rollups once they exist and from `sales` before
+        self.pool = pool or get_pool(db)
+        self.quarantined = self.migrate() if migrate else 0
+
+    def migrate(self):
+        # Explicit, one-off; returns the number of rows quarantined for bad dates
+        return ensure_schema(self.pool)
+
+    @property
+    def has_rollups(self):
+        return has_rollups(self.pool.connection())
+
+    def _date(self):
+        # The sales date as an ISO date: the column once typed, date() of the text before
+        return 'date' if self.has_rollups else 'date(date)'
+
+    def bounds(self):
+        d = self._date()
+        return self.pool.query_one(f"SELECT MIN({d}), MAX({d}) FROM sales")
+
+    def plan(self, start=None, end=None, granularity=None):
+        if granularity not in SOURCES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        low, high = self.bounds()
+        if low is None:
+            return []
+        return plan(start or low, end or high, SOURCES[granularity])
+
+    def _range(self, start, end):
+        # [start, end] as ISO dates, open ends filled from the data
+        low, high = self.bounds()
+        start, end = start or low, end or high
+        return [_as_date(start).isoformat() if start else None, _as_date(end).isoformat() if end else None]
+
+    @staticmethod
+    def _filters(regions, products):
+        where, params = [], []
+        for dim, values in (('region', regions), ('product', products)):
+            if values:
+                values = [values] if isinstance(values, str) else list(values)
+                where.append(f"{dim} IN ({', '.join('?' * len(values))})")
+                params += values
+        return where, params
+
+    def query(self, start=None, end=None, by=None, granularity=None, regions=None, products=None):
+        # Total sales and order counts per (period bucket, *by) over [start, end]
+        by = [by] if isinstance(by, str) else list(by or [])
+        for dim in by:
+            if dim not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {dim}")
+        if granularity not in SOURCES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        outer = (["period"] if granularity else []) + by
+        group = f" GROUP BY {', '.join(outer)} ORDER BY {', '.join(outer)}" if outer else ""
+        filters, filter_params = self._filters(regions, products)
+        if not self.has_rollups:
+            return self._query_sales(start, end, by, granularity, filters, filter_params, group)
+        segments = self.plan(start, end, granularity)
+        keys = ([f"{PERIOD_SQL[granularity].format(x='period')} AS period"] if granularity else []) + by
+        parts, params = [], []
+        for level, first, last in segments:
+            where = ["period BETWEEN ? AND ?"] + filters
+            params += [first.isoformat(), last.isoformat()] + filter_params
+            select = ", ".join(keys + ["total", "orders"])
+            parts.append(f"SELECT {select} FROM sales_rollup_{level} WHERE {' AND '.join(where)}")
+        if not parts:
+            import pandas as pd
+            return pd.DataFrame(columns=outer + ['sales', 'orders'])
+        select = ", ".join(outer + ["SUM(total) AS sales", "SUM(orders) AS orders"])
+        sql = f"SELECT {select} FROM ({' UNION ALL '.join(parts)}){group}"
+        return self.pool.read_frame(sql, params)
+
+    def _query_sales(self, start, end, by, granularity, filters, filter_params, group):
+        # Same result straight from the (unmigrated) sales rows; undated rows are skipped
+        d = self._date()
+        keys = ([f"{PERIOD_SQL[granularity].format(x=d)} AS period"] if granularity else []) + by
+        where = [f"{d} BETWEEN ? AND ?"] + filters
+        params = self._range(start, end) + filter_params
+        select = ", ".join(keys + ["COALESCE(SUM(sales), 0) AS sales", "COUNT(*) AS orders"])
+        sql = f"SELECT {select} FROM sales WHERE {' AND '.join(where)}{group}"
+        return self.pool.read_frame(sql, params)
+
+    def rows_scanned(self, start=None, end=None, granularity=None):
+        # Rollup rows the planner would read (sales rows before the migration), for checking plans
+        if not self.has_rollups:
+            return self.pool.query_one(f"SELECT COUNT(*) FROM sales WHERE {self._date()} BETWEEN ? AND ?",
+                                       self._range(start, end))[0]
+        total = 0
+        for level, first, last in self.plan(start, end, granularity):
+            total += self.pool.query_one(f"SELECT COUNT(*) FROM sales_rollup_{level} WHERE period BETWEEN ? AND ?",
+                                         (first.isoformat(), last.isoformat()))[0]
+        return total
@@ -0,0 +1,225 @@
+# sqlite_pool.py
+# Shared, read-optimized access to the course SQLite files.
+# One ConnectionPool per database file keeps one connection per thread (Streamlit
+# runs each session in its own thread), so queries reuse an open connection and
+# its prepared statements instead of connecting and re-parsing SQL every time.
+#   - mmap_size + a larger page cache for the read-heavy course queries
+#   - wal=True (opt-in): WAL journal so readers don't block a writer. journal_mode
+#     is stored in the database file, so the pool switches it back on close(); the
+#     committed course DBs stay in their original rollback-journal mode by default
+#   - cached_statements: sqlite3's per-connection prepared-statement cache
+#   - bulk_insert: executemany in batched transactions
+#   - iter_blocks: fetchmany blocks returned as NumPy columns or Arrow record batches
+#
+#   from sqlite_pool import get_pool
+#   pool = get_pool('students')
+#   for block in pool.iter_blocks("SELECT * FROM Students", block_size=10_000):
+#       ...
+import os
+import inspect
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DATABASES = {
+    'aqib': 'Aqib.db',
+    'practise': 'practise.db',
+    'students': os.path.join('WK1&2asgs', 'wk2', 'students.db'),
+    'sales': os.path.join('WK1&2asgs', 'wk2', 'sales_data.db'),
+    'example': os.path.join('WK1&2asgs', 'wk2', 'example.db'),
+}
+
+STATEMENT_CACHE_SIZE = 256
+BATCH_SIZE = 10_000
+BLOCK_SIZE = 65_536
+
+PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # KiB
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,
+    'foreign_keys': 'ON',
+}
+
+
+def _to_numpy(values):
+    # One column of a fetched block -> ndarray; NULLs become NaN in numeric columns
+    if None not in values:
+        arr = np.asarray(values)
+        return arr.astype(object) if arr.dtype.kind == 'U' else arr
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return np.array([np.nan if v is None else v for v in values], dtype='float64')
+    return np.array(values, dtype=object)
+
+
+class ConnectionPool:
+    def __init__(self, path, readonly=False, wal=False, pragmas=None, statement_cache=STATEMENT_CACHE_SIZE):
+        self.path = path
+        self.readonly = readonly
+        self.statement_cache = statement_cache
+        self.pragmas = dict(PRAGMAS, **(pragmas or {}))
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        # Journal mode to put back on close(), when the pool switched the file to WAL
+        self._journal_mode = None
+        if wal and not readonly:
+            self._journal_mode = self._set_journal_mode('WAL')
+            if self._journal_mode.upper() == 'WAL':
+                self._journal_mode = None
+
+    def _set_journal_mode(self, mode):
+        # Returns the mode the file had before
+        conn = sqlite3.connect(self.path)
+        try:
+            old = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            conn.execute(f"PRAGMA journal_mode={mode}")
+        finally:
+            conn.close()
+        return old
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            uri = f"file:{self.path}?mode=ro" if self.readonly else f"file:{self.path}"
+            # isolation_level=None: transactions are opened explicitly in transaction()
+            conn = sqlite3.connect(uri, uri=True, isolation_level=None,
+                                   cached_statements=self.statement_cache, check_same_thread=False)
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name}={value}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def query(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        return self.connection().execute(sql, params).fetchone()
+
+    def execute(self, sql, params=()):
+        with self.transaction() as conn:
+            return conn.execute(sql, params).rowcount
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        if conn.in_transaction:
+            # Nested use joins the outer transaction
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def bulk_insert(self, table, columns, rows, batch_size=BATCH_SIZE):
+        # rows: any iterable of tuples; each batch is one executemany in one transaction
+        names = ", ".join(f'"{c}"' for c in columns)
+        sql = f'INSERT INTO "{table}" ({names}) VALUES ({", ".join("?" * len(columns))})'
+        rows = iter(rows)
+        total = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return total
+            with self.transaction() as conn:
+                conn.executemany(sql, batch)
+            total += len(batch)
+
+    def iter_blocks(self, sql, params=(), block_size=BLOCK_SIZE, arrow=False):
+        # Yields {column: ndarray} per block, or pyarrow.RecordBatch when arrow=True
+        if arrow and pa is None:
+            raise ImportError("pyarrow is required for arrow=True")
+        return self._blocks(self.connection().execute(sql, params), block_size, arrow)
+
+    @staticmethod
+    def _blocks(cursor, block_size, arrow=False):
+        names = [d[0] for d in cursor.description]
+        try:
+            while True:
+                rows = cursor.fetchmany(block_size)
+                if not rows:
+                    return
+                columns = list(zip(*rows))
+                if arrow:
+                    yield pa.RecordBatch.from_arrays([pa.array(col) for col in columns], names=names)
+                else:
+                    yield {name: _to_numpy(list(col)) for name, col in zip(names, columns)}
+        finally:
+            cursor.close()
+
+    def read_frame(self, sql, params=(), block_size=BLOCK_SIZE):
+        import pandas as pd
+        cursor = self.connection().execute(sql, params)
+        # Taken before the blocks are read: an empty result still has its column names
+        columns = [d[0] for d in cursor.description]
+        blocks = [pd.DataFrame(block) for block in self._blocks(cursor, block_size)]
+        if not blocks:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(blocks, ignore_index=True)
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            if self._journal_mode is not None:
+                # Checkpoints the WAL and removes the -wal/-shm files
+                self._set_journal_mode(self._journal_mode)
+                self._journal_mode = None
+        self._local = threading.local()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _settings(path, kwargs):
+    # Every ConnectionPool argument after the path, defaults filled in
+    bound = inspect.signature(ConnectionPool).bind(path, **kwargs)
+    bound.apply_defaults()
+    settings = dict(bound.arguments)
+    del settings['path']
+    return settings
+
+
+def get_pool(name_or_path, **kwargs):
+    # Process-wide pool per database file; names from DATABASES or any path.
+    # Asking for a file's pool with other settings than it was opened with is an error.
+    path = DATABASES.get(name_or_path, name_or_path)
+    if not os.path.isabs(path) and not os.path.exists(path):
+        path = os.path.join(BASE_DIR, path)
+    key = os.path.abspath(path)
+    settings = _settings(key, kwargs)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = (ConnectionPool(key, **kwargs), settings)
+        pool, opened_with = _pools[key]
+        if settings != opened_with:
+            changed = sorted(name for name in settings if settings[name] != opened_with[name])
+            raise ValueError(f"Pool for {key} is already open with different settings: {', '.join(changed)}")
+        return pool
+
+
+def close_all():
+    with _pools_lock:
+        for pool, _ in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,201 @@
+# students_report.py
+# Reporting queries for students.db (Students, Courses, Enrollments).
+# ensure_schema() adds two covering indexes on Enrollments, one per join direction,
+# so roster and course-load joins are index-only lookups instead of table scans. It
+# also adds two summary tables (enrollments per course, per student) that triggers
+# on Enrollments keep up to date on every insert, delete and update.
+# It is an explicit step (StudentsReport.migrate() or StudentsReport(migrate=True)),
+# never run on open: until then the reports read the original tables and count
+# enrollments with GROUP BY, with the same results.
+#
+#   from students_report import StudentsReport
+#   report = StudentsReport()            # students.db via sqlite_pool
+#   report.migrate()                     # once, to add the indexes and summaries
+#   report.roster(101)
+#   report.co_enrollment(101)
+import sqlite3
+
+from sqlite_pool import get_pool
+
+SCHEMA_SQL = """
+CREATE INDEX IF NOT EXISTS idx_enrollments_student_course ON Enrollments(StudentID, CourseID);
+CREATE INDEX IF NOT EXISTS idx_enrollments_course_student ON Enrollments(CourseID, StudentID);
+
+CREATE TABLE IF NOT EXISTS CourseEnrollmentSummary (
+    CourseID INTEGER PRIMARY KEY,
+    Enrollments INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS StudentEnrollmentSummary (
+    StudentID INTEGER PRIMARY KEY,
+    Enrollments INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_enrollments_insert AFTER INSERT ON Enrollments
+BEGIN
+    INSERT INTO CourseEnrollmentSummary (CourseID, Enrollments) SELECT NEW.CourseID, 1 WHERE NEW.CourseID IS NOT NULL
+        ON CONFLICT(CourseID) DO UPDATE SET Enrollments = Enrollments + 1;
+    INSERT INTO StudentEnrollmentSummary (StudentID, Enrollments) SELECT NEW.StudentID, 1 WHERE NEW.StudentID IS NOT NULL
+        ON CONFLICT(StudentID) DO UPDATE SET Enrollments = Enrollments + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_enrollments_delete AFTER DELETE ON Enrollments
+BEGIN
+    UPDATE CourseEnrollmentSummary SET Enrollments = Enrollments - 1 WHERE CourseID = OLD.CourseID;
+    DELETE FROM CourseEnrollmentSummary WHERE CourseID = OLD.CourseID AND Enrollments <= 0;
+    UPDATE StudentEnrollmentSummary SET Enrollments = Enrollments - 1 WHERE StudentID = OLD.StudentID;
+    DELETE FROM StudentEnrollmentSummary WHERE StudentID = OLD.StudentID AND Enrollments <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_enrollments_update AFTER UPDATE OF StudentID, CourseID ON Enrollments
+BEGIN
+    UPDATE CourseEnrollmentSummary SET Enrollments = Enrollments - 1 WHERE CourseID = OLD.CourseID;
+    DELETE FROM CourseEnrollmentSummary WHERE CourseID = OLD.CourseID AND Enrollments <= 0;
+    UPDATE StudentEnrollmentSummary SET Enrollments = Enrollments - 1 WHERE StudentID = OLD.StudentID;
+    DELETE FROM StudentEnrollmentSummary WHERE StudentID = OLD.StudentID AND Enrollments <= 0;
+    INSERT INTO CourseEnrollmentSummary (CourseID, Enrollments) SELECT NEW.CourseID, 1 WHERE NEW.CourseID IS NOT NULL
+        ON CONFLICT(CourseID) DO UPDATE SET Enrollments = Enrollments + 1;
+    INSERT INTO StudentEnrollmentSummary (StudentID, Enrollments) SELECT NEW.StudentID, 1 WHERE NEW.StudentID IS NOT NULL
+        ON CONFLICT(StudentID) DO UPDATE SET Enrollments = Enrollments + 1;
+END;
+"""
+
+REBUILD_SQL = """
+DELETE FROM CourseEnrollmentSummary;
+INSERT INTO CourseEnrollmentSummary (CourseID, Enrollments)
+    SELECT CourseID, COUNT(*) FROM Enrollments WHERE CourseID IS NOT NULL GROUP BY CourseID;
+DELETE FROM StudentEnrollmentSummary;
+INSERT INTO StudentEnrollmentSummary (StudentID, Enrollments)
+    SELECT StudentID, COUNT(*) FROM Enrollments WHERE StudentID IS NOT NULL GROUP BY StudentID;
+"""
+
+
+def _run_script(conn, script):
+    # executescript() would commit on its own; run statement by statement instead
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if line.rstrip().endswith(';') and sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ''
+
+
+def has_summaries(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                        "AND name = 'CourseEnrollmentSummary'").fetchone() is not None
+
+
+# Per-key enrollment counts straight from Enrollments, used before the migration
+_COUNTS_SQL = "(SELECT {key}, COUNT(*) AS Enrollments FROM Enrollments WHERE {key} IS NOT NULL GROUP BY {key})"
+
+
+def ensure_schema(pool):
+    # Idempotent; the summaries are rebuilt only when they are first created
+    with pool.transaction() as conn:
+        existed = has_summaries(conn)
+        _run_script(conn, SCHEMA_SQL)
+        if not existed:
+            _run_script(conn, REBUILD_SQL)
+    if not existed:
+        pool.connection().execute("ANALYZE")
+
+
+def rebuild_summaries(pool):
+    with pool.transaction() as conn:
+        _run_script(conn, REBUILD_SQL)
+
+
+class StudentsReport:
+    def __init__(self, db='students', pool=None, migrate=False):
+        # migrate=True runs ensure_schema, which writes indexes and tables into the file
+        self.pool = pool or get_pool(db)
+        if migrate:
+            self.migrate()
+
+    def migrate(self):
+        ensure_schema(self.pool)
+
+    def _summary(self, table, key):
+        # Summary table once migrated, the equivalent GROUP BY subquery before
+        if has_summaries(self.pool.connection()):
+            return table
+        return _COUNTS_SQL.format(key=key)
+
+    def _frame(self, sql, params=()):
+        return self.pool.read_frame(sql, params)
+
+    def enroll(self, pairs):
+        # pairs: iterable of (StudentID, CourseID); summaries follow through the triggers
+        return self.pool.bulk_insert('Enrollments', ['StudentID', 'CourseID'], pairs)
+
+    def roster(self, course_id):
+        # Students in a course: idx_enrollments_course_student, then Students by primary key
+        return self._frame("""
+            SELECT s.StudentID, s.Name, s.Age, s.City
+            FROM Enrollments e JOIN Students s ON s.StudentID = e.StudentID
+            WHERE e.CourseID = ?
+            ORDER BY s.Name""", (course_id,))
+
+    def course_load(self, student_id):
+        # Courses a student takes: idx_enrollments_student_course, then Courses by primary key
+        return self._frame("""
+            SELECT c.CourseID, c.CourseName, c.Teacher
+            FROM Enrollments e JOIN Courses c ON c.CourseID = e.CourseID
+            WHERE e.StudentID = ?
+            ORDER BY c.CourseName""", (student_id,))
+
+    def course_sizes(self, limit=None):
+        # Read from the summary table once migrated; no scan of Enrollments
+        sql = """
+            SELECT c.CourseID, c.CourseName, c.Teacher, COALESCE(ces.Enrollments, 0) AS Enrollments
+            FROM Courses c LEFT JOIN {summary} ces ON ces.CourseID = c.CourseID
+            ORDER BY Enrollments DESC, c.CourseID""".format(
+            summary=self._summary('CourseEnrollmentSummary', 'CourseID'))
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._frame(sql)
+
+    def student_loads(self, limit=None):
+        sql = """
+            SELECT s.StudentID, s.Name, COALESCE(ses.Enrollments, 0) AS Courses
+            FROM Students s LEFT JOIN {summary} ses ON ses.StudentID = s.StudentID
+            ORDER BY Courses DESC, s.StudentID""".format(
+            summary=self._summary('StudentEnrollmentSummary', 'StudentID'))
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._frame(sql)
+
+    def course_size(self, course_id):
+        summary = self._summary('CourseEnrollmentSummary', 'CourseID')
+        row = self.pool.query_one(f"SELECT Enrollments FROM {summary} WHERE CourseID = ?", (course_id,))
+        return row[0] if row else 0
+
+    def student_load(self, student_id):
+        summary = self._summary('StudentEnrollmentSummary', 'StudentID')
+        row = self.pool.query_one(f"SELECT Enrollments FROM {summary} WHERE StudentID = ?", (student_id,))
+        return row[0] if row else 0
+
+    def co_enrollment(self, course_id, limit=None):
+        # Other courses taken by this course's students, with the number of shared students.
+        # Both sides of the self-join are covered by one of the two indexes.
+        sql = """
+            SELECT c.CourseID, c.CourseName, COUNT(DISTINCT e2.StudentID) AS SharedStudents
+            FROM Enrollments e1
+            JOIN Enrollments e2 ON e2.StudentID = e1.StudentID AND e2.CourseID != e1.CourseID
+            JOIN Courses c ON c.CourseID = e2.CourseID
+            WHERE e1.CourseID = ?
+            GROUP BY c.CourseID, c.CourseName
+            ORDER BY SharedStudents DESC, c.CourseID"""
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._frame(sql, (course_id,))
+
+    def classmates(self, student_id):
+        # Students sharing at least one course with student_id
+        return self._frame("""
+            SELECT s.StudentID, s.Name, COUNT(DISTINCT e2.CourseID) AS SharedCourses
+            FROM Enrollments e1
+            JOIN Enrollments e2 ON e2.CourseID = e1.CourseID AND e2.StudentID != e1.StudentID
+            JOIN Students s ON s.StudentID = e2.StudentID
+            WHERE e1.StudentID = ?
+            GROUP BY s.StudentID, s.Name
+            ORDER BY SharedCourses DESC, s.StudentID""", (student_id,))
@@ -0,0 +1,117 @@
+import os
+import shutil
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sales_cube
+from sqlite_pool import ConnectionPool, DATABASES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RANGES = [(None, None), ('2023-01-01', '2024-12-31'), ('2023-02-15', '2024-03-09'),
+          ('2023-06-03', '2023-06-20'), ('2024-02-29', '2024-02-29')]
+
+
+REGIONS = ['North', 'South', 'East', 'West', None]
+# Not parseable by SQLite's date(): quarantined by the migration
+BAD_ROWS = [('not a date', 'Product1', 10, 'North'), ('2023-1-5', 'Product2', 20, None)]
+
+
+def generated_rows(n, seed):
+    rng = np.random.default_rng(seed)
+    return [((date(2023, 1, 1) + timedelta(days=int(d))).isoformat(), f'Product{rng.integers(1, 6)}',
+             int(rng.integers(1, 500)), REGIONS[rng.integers(0, len(REGIONS))])
+            for d in rng.integers(0, 731, n)]
+
+
+def copy_db(folder):
+    path = str(folder / 'sales_data.db')
+    shutil.copy(os.path.join(HERE, DATABASES['sales']), path)
+    return path
+
+
+@pytest.fixture(scope='module')
+def cube(tmp_path_factory):
+    pool = ConnectionPool(copy_db(tmp_path_factory.mktemp('cube')))
+    pool.bulk_insert('sales', ['date', 'product', 'sales', 'region'], BAD_ROWS + generated_rows(2000, 1))
+    cube = sales_cube.SalesCube(pool=pool, migrate=True)
+    assert cube.quarantined == len(BAD_ROWS)
+    # Two years of sales, inserted after the rollups exist so the triggers maintain them
+    pool.bulk_insert('sales', ['date', 'product', 'sales', 'region'], generated_rows(20_000, 0), batch_size=5000)
+    with pool.transaction() as conn:
+        conn.execute("DELETE FROM sales WHERE id % 97 = 0")
+        conn.execute("UPDATE sales SET sales = sales + 1, region = 'North' WHERE id % 89 = 0")
+        conn.execute("UPDATE sales SET region = NULL WHERE id % 79 = 0")
+        conn.execute("UPDATE sales SET date = date(date, '+40 days') WHERE id % 83 = 0")
+    yield cube
+    pool.close()
+
+
+def group_by(cube, start, end, by, granularity, regions=None, d='date'):
+    # Plain GROUP BY over the sales rows
+    low, high = cube.pool.query_one(f"SELECT MIN({d}), MAX({d}) FROM sales")
+    keys = ([f"{sales_cube.PERIOD_SQL[granularity].format(x=d)} AS period"] if granularity else []) + by
+    outer = (['period'] if granularity else []) + by
+    where, params = f"{d} BETWEEN ? AND ?", [start or low, end or high]
+    if regions:
+        where += f" AND region IN ({', '.join('?' * len(regions))})"
+        params += regions
+    select = ", ".join(keys + ["SUM(sales) AS sales", "COUNT(*) AS orders"])
+    sql = f"SELECT {select} FROM sales WHERE {where}"
+    if outer:
+        sql += f" GROUP BY {', '.join(outer)} ORDER BY {', '.join(outer)}"
+    return cube.pool.read_frame(sql, params)
+
+
+@pytest.mark.parametrize('granularity', [None, 'month', 'week', 'day'])
+@pytest.mark.parametrize('by', [[], ['region'], ['region', 'product']])
+@pytest.mark.parametrize('start, end', RANGES)
+def test_query_matches_group_by(cube, start, end, by, granularity):
+    got = cube.query(start, end, by=by, granularity=granularity)
+    expected = group_by(cube, start, end, by, granularity)
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+
+def test_null_regions_stay_null(cube):
+    got = cube.query(by='region')
+    assert got['region'].isna().sum() == 1
+    assert '' not in set(got['region'].dropna())
+    rollup = cube.pool.query_one("SELECT COUNT(*) FROM sales_rollup_month WHERE region IS NULL")[0]
+    assert rollup > 0
+
+
+def test_bad_dates_are_quarantined(cube):
+    rows = cube.pool.query("SELECT date, product, sales, region FROM sales_quarantine ORDER BY id")
+    assert [tuple(r) for r in rows] == BAD_ROWS
+    assert cube.pool.query_one("SELECT COUNT(*) FROM sales WHERE date(date) IS NULL")[0] == 0
+
+
+def test_unmigrated_cube_only_reads(tmp_path):
+    path = copy_db(tmp_path)
+    pool = ConnectionPool(path)
+    pool.bulk_insert('sales', ['date', 'product', 'sales', 'region'], BAD_ROWS + generated_rows(3000, 2))
+    pool.close()
+    before = open(path, 'rb').read()
+    pool = ConnectionPool(path)
+    cube = sales_cube.SalesCube(pool=pool)
+    assert not cube.has_rollups
+    for by, granularity in [([], None), (['region'], 'month'), (['region', 'product'], 'week')]:
+        got = cube.query('2023-02-15', '2024-03-09', by=by, granularity=granularity)
+        expected = group_by(cube, '2023-02-15', '2024-03-09', by, granularity, d='date(date)')
+        pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+    pool.close()
+    assert open(path, 'rb').read() == before
+
+
+def test_filters_match_group_by(cube):
+    got = cube.query('2023-03-10', '2024-08-20', by='product', granularity='month', regions=['North', 'East'])
+    expected = group_by(cube, '2023-03-10', '2024-08-20', ['product'], 'month', regions=['North', 'East'])
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+
+def test_planner_reads_coarse_rollups(cube):
+    rows = cube.pool.query_one("SELECT COUNT(*) FROM sales WHERE date BETWEEN '2023-01-01' AND '2024-12-31'")[0]
+    assert cube.plan('2023-01-01', '2024-12-31') == [('month', date(2023, 1, 1), date(2024, 12, 1))]
+    assert cube.rows_scanned('2023-01-01', '2024-12-31') < rows / 10
@@ -0,0 +1,62 @@
+import os
+import shutil
+
+import pytest
+
+import sqlite_pool
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'students.db')
+    shutil.copy(os.path.join(HERE, sqlite_pool.DATABASES['students']), path)
+    return path
+
+
+def journal_mode(path):
+    with open(path, 'rb') as f:
+        header = f.read(20)
+    # File format read/write versions: 1 = rollback journal, 2 = WAL
+    return 'wal' if header[18:20] == b'\x02\x02' else 'delete'
+
+
+def test_default_pool_leaves_journal_mode_alone(db_path):
+    before = open(db_path, 'rb').read()
+    pool = sqlite_pool.ConnectionPool(db_path)
+    assert pool.query_one("PRAGMA journal_mode")[0] == 'delete'
+    assert pool.query("SELECT name FROM sqlite_master WHERE type = 'table'")
+    pool.close()
+    assert open(db_path, 'rb').read() == before
+
+
+def test_wal_is_restored_on_close(db_path):
+    pool = sqlite_pool.ConnectionPool(db_path, wal=True)
+    assert pool.query_one("PRAGMA journal_mode")[0] == 'wal'
+    assert journal_mode(db_path) == 'wal'
+    pool.close()
+    assert journal_mode(db_path) == 'delete'
+    assert not os.path.exists(db_path + '-wal') and not os.path.exists(db_path + '-shm')
+
+
+def test_get_pool_rejects_other_settings(db_path):
+    try:
+        pool = sqlite_pool.get_pool(db_path, readonly=True)
+        assert sqlite_pool.get_pool(db_path, readonly=True) is pool
+        with pytest.raises(ValueError, match='readonly'):
+            sqlite_pool.get_pool(db_path)
+        with pytest.raises(ValueError, match='wal'):
+            sqlite_pool.get_pool(db_path, readonly=True, wal=True)
+    finally:
+        sqlite_pool.close_all()
+
+
+def test_empty_read_frame_runs_the_query_once(db_path):
+    pool = sqlite_pool.ConnectionPool(db_path)
+    statements = []
+    pool.connection().set_trace_callback(statements.append)
+    df = pool.read_frame("SELECT StudentID, Name FROM Students WHERE StudentID < 0")
+    assert list(df.columns) == ['StudentID', 'Name'] and df.empty
+    assert sum('FROM Students' in s for s in statements) == 1
+    pool.close()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import students_report
+from sqlite_pool import ConnectionPool, DATABASES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+METHODS = [('roster', 101), ('roster', 103), ('course_load', 1), ('course_sizes',), ('student_loads',),
+           ('co_enrollment', 101), ('classmates', 1), ('course_size', 102), ('student_load', 2)]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / 'students.db')
+    shutil.copy(os.path.join(HERE, DATABASES['students']), path)
+    return path
+
+
+def results(report):
+    return [getattr(report, name)(*args) for name, *args in METHODS]
+
+
+def assert_same(got, expected):
+    for a, b in zip(got, expected):
+        if isinstance(b, pd.DataFrame):
+            pd.testing.assert_frame_equal(a, b, check_dtype=False)
+        else:
+            assert a == b
+
+
+def original_course_sizes(path):
+    # The unindexed query the summaries replace
+    with sqlite3.connect(path) as conn:
+        return pd.read_sql_query("""
+            SELECT c.CourseID, c.CourseName, c.Teacher, COUNT(e.EnrollmentID) AS Enrollments
+            FROM Courses c LEFT JOIN Enrollments e ON e.CourseID = c.CourseID
+            GROUP BY c.CourseID ORDER BY Enrollments DESC, c.CourseID""", conn)
+
+
+def test_opening_a_report_does_not_write(db_path):
+    before = open(db_path, 'rb').read()
+    pool = ConnectionPool(db_path)
+    report = students_report.StudentsReport(pool=pool)
+    results(report)
+    pool.close()
+    assert open(db_path, 'rb').read() == before
+
+
+def test_migrated_reports_match_the_original_queries(db_path):
+    pool = ConnectionPool(db_path)
+    report = students_report.StudentsReport(pool=pool)
+    before = results(report)
+    pd.testing.assert_frame_equal(report.course_sizes(), original_course_sizes(db_path), check_dtype=False)
+
+    report.migrate()
+    names = {r[0] for r in pool.query("SELECT name FROM sqlite_master")}
+    assert {'idx_enrollments_student_course', 'CourseEnrollmentSummary'} <= names
+    assert_same(results(report), before)
+
+    # The triggers keep the summaries equal to a fresh count
+    rng = np.random.default_rng(0)
+    report.enroll([(int(s), int(c)) for s, c in zip(rng.integers(1, 5, 200), rng.integers(101, 104, 200))])
+    with pool.transaction() as conn:
+        conn.execute("DELETE FROM Enrollments WHERE EnrollmentID % 7 = 0")
+        conn.execute("UPDATE Enrollments SET CourseID = 102 WHERE EnrollmentID % 5 = 0")
+    pd.testing.assert_frame_equal(report.course_sizes(), original_course_sizes(db_path), check_dtype=False)
+    migrated = results(report)
+    students_report.rebuild_summaries(pool)
+    assert_same(results(report), migrated)
+    pool.close()